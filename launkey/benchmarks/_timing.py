@@ -0,0 +1,24 @@
+import os
+import sys
+import time
+
+from typing import Callable
+
+def timePerCall(func: Callable[[], object], /, number: int = 100_000, repeat: int = 5) -> float:
+    """Best of `repeat` runs, in nanoseconds per call"""
+    return min(timeRuns(func, number=number, repeat=repeat))
+
+def timeRuns(func: Callable[[], object], /, number: int = 100_000, repeat: int = 5) -> list[float]:
+    """Every one of `repeat` runs, in nanoseconds per call"""
+    runs: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            func()
+        runs.append((time.perf_counter_ns() - start) / number)
+    return runs
+
+def getQApplication():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication(sys.argv[:1])
@@ -0,0 +1,184 @@
+"""End-to-end Run latency: pad press on a virtual launchpad -> key reaching a capturing keyboard sink.
+
+Drives the main window's real buttonRun() / listenForButtonPress() flow on QtAsyncio, headless,
+with press/release storms at the given rates.
+
+Run from the launkey folder:
+    python -m benchmarks.e2e_latency --rates 500 2000 10000 --events 4000 [--json results.json]
+"""
+import argparse
+import asyncio
+import json
+import string
+import time
+
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import NamedTuple
+
+from ._timing import getQApplication
+
+GRID = [(x, y) for y in range(1, 9) for x in range(8)]
+KEY_COMBOS = [f"{modifier}+{key}" for modifier in ("ctrl", "alt", "shift") for key in string.ascii_lowercase][:len(GRID)]
+
+class TimedKeySink:
+    """Key output backend that keeps (time.monotonic_ns(), press, combo text) for every action"""
+    name = "timed capture"
+
+    def __init__(self):
+        from launkey.key_combos import formatKeyCombo
+        self.formatKeyCombo = formatKeyCombo
+        self.received: list[tuple[int, bool, str]] = []
+        self.expected = 0
+        self.done = asyncio.Event()
+        self.loop: asyncio.AbstractEventLoop | None = None
+
+    def sendBatch(self, keyActions):
+        now = time.monotonic_ns()
+        self.received += [(now, press, self.formatKeyCombo(keyCombo)) for press, keyCombo in keyActions]
+        if len(self.received) >= self.expected and self.loop is not None:
+            self.loop.call_soon_threadsafe(self.done.set)
+
+    def close(self):
+        pass
+
+    def reset(self, expected: int):
+        self.received = []
+        self.expected = expected
+        self.done = asyncio.Event()
+        self.loop = asyncio.get_running_loop()
+
+class StormResult(NamedTuple):
+    rate: float
+    events: int
+    received: int
+    dropped: int
+    unexpected: int
+    reordered: int
+    p50: int  # ns
+    p90: int
+    p99: int
+    maxLatency: int
+    meanLatency: float
+    cpuPerEvent: float  # ns of process CPU time
+    stages: dict[str, dict[str, int]]
+
+def buildMainWindow():
+    from launkey.app import Launkey
+    from launkey.launchpad_control import LaunchpadWrapper
+    from launkey.templates import Button, Template
+    from launkey.updateinfo import OS
+    from launkey.virtual_launchpad import VirtualLaunchpad
+
+    main_window = Launkey(True, OS.linux)
+    table = main_window.ui.tableLaunchpad
+    templateData: list = [Template("Storm grid", Template.Type.BUTTONS)]
+    templateData += [Button(f"Pad {i}", str(i), (y - 1, x), keyboardCombo=KEY_COMBOS[i]) for i, (x, y) in enumerate(GRID)]
+    table.loadDataFromTemplate((1, 0), templateData)
+    lpWrapper = LaunchpadWrapper(table, device=VirtualLaunchpad())
+    sink = TimedKeySink()
+    lpWrapper.keyOutputBackend = sink
+    return main_window, lpWrapper, sink
+
+def analyseStorm(rate: float, buttons: list, dueTimes: list[int], comboTexts: dict[tuple[int, int], str],
+                 received: list[tuple[int, bool, str]], cpuTime: int, stages: dict) -> StormResult:
+    from launkey.latency import LatencyHistogram
+
+    # Expected key actions per (combo, press), in input order
+    pending: dict[tuple[str, bool], deque[tuple[int, int]]] = defaultdict(deque)
+    for index, ((x, y, pressed), dueTime) in enumerate(zip(buttons, dueTimes)):
+        pending[(comboTexts[(x, y)], pressed)].append((index, dueTime))
+
+    histogram = LatencyHistogram()
+    unexpected = reordered = 0
+    lastIndex = -1
+    for receivedTime, press, comboText in received:
+        queue = pending.get((comboText, press))
+        if not queue:
+            unexpected += 1
+            continue
+        index, dueTime = queue.popleft()
+        histogram.record(receivedTime - dueTime)
+        if index < lastIndex:
+            reordered += 1
+        lastIndex = max(lastIndex, index)
+
+    return StormResult(
+        rate,
+        len(buttons),
+        len(received),
+        sum(len(queue) for queue in pending.values()),
+        unexpected,
+        reordered,
+        histogram.percentile(50),
+        histogram.percentile(90),
+        histogram.percentile(99),
+        histogram.maxValue,
+        histogram.total / histogram.count if histogram.count else 0.0,
+        cpuTime / len(buttons) if buttons else 0.0,
+        stages,
+    )
+
+async def runStorm(main_window, lpWrapper, sink: TimedKeySink, rate: float, events: int, seed: int) -> StormResult:
+    from launkey.key_combos import formatKeyCombo, parseKeyCombo
+    from launkey.mainwindow import buttonRun
+    from launkey.virtual_launchpad import randomButtons
+
+    buttons = list(randomButtons(events, seed=seed, positions=GRID))
+    comboTexts = {position: formatKeyCombo(parseKeyCombo(KEY_COMBOS[i])) for i, position in enumerate(GRID)}
+    sink.reset(len(buttons))
+
+    await buttonRun(main_window, lpWrapper)  # Run
+    cpuStart = time.process_time_ns()
+    dueTimes = lpWrapper.lp.feedButtons(buttons, rate)
+    timeout = (dueTimes[-1] - time.monotonic_ns()) / 1e9 + 5
+    try:
+        await asyncio.wait_for(sink.done.wait(), timeout)
+    except TimeoutError:
+        pass  # Missing key actions are reported as dropped
+    cpuTime = time.process_time_ns() - cpuStart
+    received = list(sink.received)
+    await buttonRun(main_window, lpWrapper)  # Stop
+
+    stages = {
+        stage: {"p50": histogram.percentile(50), "p99": histogram.percentile(99)}
+        for stage, histogram in lpWrapper.latency.stages.items()
+    }
+    return analyseStorm(rate, buttons, dueTimes, comboTexts, received, cpuTime, stages)
+
+def printResult(result: StormResult):
+    us = 1000
+    print(f"{result.rate:8.0f}/s {result.events:7} ev  "
+          f"p50 {result.p50 / us:7.0f} µs  p90 {result.p90 / us:7.0f} µs  p99 {result.p99 / us:7.0f} µs  max {result.maxLatency / us:7.0f} µs  "
+          f"dropped {result.dropped}  unexpected {result.unexpected}  reordered {result.reordered}  "
+          f"CPU {result.cpuPerEvent / us:6.1f} µs/ev")
+    print("          stage p50/p99 µs: " + ", ".join(
+        f"{stage} {values['p50'] / us:.0f}/{values['p99'] / us:.0f}" for stage, values in result.stages.items()
+    ))
+
+async def runAll(args) -> list[StormResult]:
+    main_window, lpWrapper, sink = buildMainWindow()
+    main_window.ui.buttonRun.setEnabled(True)
+    results: list[StormResult] = []
+    for rate in args.rates:
+        result = await runStorm(main_window, lpWrapper, sink, rate, args.events, args.seed)
+        printResult(result)
+        results.append(result)
+    return results
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rates", type=float, nargs="+", default=[500, 2000, 10000], help="button changes per second")
+    parser.add_argument("--events", type=int, default=4000, help="presses per storm, each also gets a release")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    getQApplication()
+    from PySide6 import QtAsyncio
+    results = QtAsyncio.run(runAll(args), keep_running=False)
+    if args.json:
+        args.json.write_text(json.dumps([result._asdict() for result in results], indent=4) + "\n")
+
+if __name__ == "__main__":
+    main()
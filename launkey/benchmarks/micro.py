@@ -0,0 +1,132 @@
+"""Micro-benchmarks for the engine hot paths, compared against benchmarks/baseline.json.
+
+Run from the launkey folder:
+    python -m benchmarks.micro                   compare with the baseline
+    python -m benchmarks.micro --save-baseline   store the current numbers as the new baseline
+Exits with 1 when a benchmark is slower than the baseline by more than the threshold plus the
+noise of this run (median over best of the repeats). A baseline saved on another kind of machine
+(OS, architecture or Python version) is only shown for comparison unless --strict is given.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from ._timing import getQApplication, timeRuns
+from .runtime_plan import buildTable
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 0.5  # Timings on a busy machine easily move by 30%, real regressions are bigger
+
+class BenchmarkResult(NamedTuple):
+    best: float  # ns per call, fastest of the repeats
+    median: float
+
+    @property
+    def noise(self) -> float:
+        # Spread of this run, 0.1 when the median is 10% slower than the best repeat
+        return self.median / self.best - 1
+
+def setupBenchmarks() -> dict[str, tuple[Callable[[], object], int]]:
+    """name -> (function to time, calls per run)"""
+    from launkey.launchpad_control import LaunchpadWrapper
+    from launkey.led_frame import LedFrame
+    from launkey.templates import LED, Button, Template, checkTemplate, ledsToColorCode, objectFromJson
+    from launkey.virtual_launchpad import VirtualLaunchpad, VirtualMidi
+
+    class NullMidi(VirtualMidi):
+        def RawWrite(self, status: int, data1: int, data2: int):
+            pass  # Only the cost of building the messages is measured
+
+    table = buildTable()
+    frame = table.returnFirstFrame()
+    otherFrame = LedFrame(frame.buffer)
+    otherFrame[10] ^= 0x03
+    lp = VirtualLaunchpad()
+    lp.midi = NullMidi()
+    lpWrapper = LaunchpadWrapper(table, device=lp)
+    buttonJson = Button("Copy", "0", (0, 0), normalColor=(LED.LOW, LED.OFF), pushedColor=(LED.FULL, LED.FULL), keyboardCombo="ctrl+c").toDict()
+    templateJson = Template("Grid", Template.Type.BUTTONS).toDict()
+    templateData = [objectFromJson(templateJson)] + [objectFromJson(buttonJson) for _ in range(64)]
+
+    return {
+        "LaunchpadTable.returnFirstFrame": (table.returnFirstFrame, 5_000),
+        "LaunchpadTable.isFrameChangeNeeded (same)": (lambda: table.isFrameChangeNeeded(frame), 200_000),
+        "LaunchpadTable.isFrameChangeNeeded (changed)": (lambda: table.isFrameChangeNeeded(otherFrame), 200_000),
+        "LaunchpadTable.getTemplateItemAtButton": (lambda: table.getTemplateItemAtButton((7, 8)), 200_000),
+        "LaunchpadWrapper.changeLedsRapid": (lambda: lpWrapper.changeLedsRapid(frame), 5_000),
+        "templates.objectFromJson (Button)": (lambda: objectFromJson(buttonJson), 50_000),
+        "templates.checkTemplate (65 items)": (lambda: checkTemplate(templateData), 20_000),
+        "templates.ledsToColorCode": (lambda: ledsToColorCode((LED.FULL, LED.LOW)), 200_000),
+    }
+
+def runBenchmarks(repeat: int = 7) -> dict[str, BenchmarkResult]:
+    results: dict[str, BenchmarkResult] = {}
+    for name, (func, number) in setupBenchmarks().items():
+        runs = timeRuns(func, number=number, repeat=repeat)
+        results[name] = BenchmarkResult(min(runs), statistics.median(runs))
+    return results
+
+def findRegressions(results: dict[str, BenchmarkResult], baseline: dict[str, float], threshold: float) -> list[str]:
+    regressions: list[str] = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected and result.best > expected * (1 + threshold + result.noise):
+            regressions.append(
+                f"{name}: {result.best:.1f} ns, baseline {expected:.1f} ns (+{(result.best / expected - 1) * 100:.0f}%, noise {result.noise * 100:.0f}%)"
+            )
+    return regressions
+
+def getMachine() -> str:
+    # Not the host name, CI runners get a new one for every job
+    return f"{platform.system()} {platform.machine()}, Python {'.'.join(platform.python_version_tuple()[:2])}"
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown, 0.5 is 50%%")
+    parser.add_argument("--repeat", type=int, default=7, help="runs per benchmark, the best one counts")
+    parser.add_argument("--strict", action="store_true", help="fail on regressions even when the baseline is from another kind of machine")
+    args = parser.parse_args(argv)
+
+    app = getQApplication()  # noqa: F841 - LaunchpadTable needs a QApplication
+    results = runBenchmarks(args.repeat)
+    baseline: dict[str, float] = {}
+    baselineMachine = None
+    if BASELINE_PATH.exists():
+        baselineJson = json.loads(BASELINE_PATH.read_text())
+        baseline = baselineJson["results"]
+        baselineMachine = baselineJson.get("machine")
+
+    for name, result in results.items():
+        expected = baseline.get(name)
+        change = f"{(result.best / expected - 1) * 100:+6.0f}%" if expected else "    new"
+        print(f"{name:48} {result.best:10.1f} ns  {change}  noise {result.noise * 100:3.0f}%")
+
+    if args.save_baseline:
+        BASELINE_PATH.write_text(json.dumps({
+            "machine": getMachine(),
+            "unit": "ns per call",
+            "results": {name: round(result.best, 1) for name, result in results.items()},
+        }, indent=4) + "\n")
+        print(f"Baseline saved to {BASELINE_PATH}")
+        return 0
+
+    regressions = findRegressions(results, baseline, args.threshold)
+    if regressions and baselineMachine != getMachine() and not args.strict:
+        print(f"\nSlower than the baseline, which was saved on {baselineMachine or 'an unknown machine'}, not checked:")
+        print("\n".join(regressions))
+        print("Run with --strict to fail anyway, or with --save-baseline on this machine before a change.")
+        return 0
+    if regressions:
+        print(f"\nRegressions over {args.threshold * 100:.0f}% plus noise:")
+        print("\n".join(regressions))
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
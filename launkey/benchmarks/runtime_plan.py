@@ -0,0 +1,40 @@
+"""Per-event lookup cost of Run mode, table lookup vs compiled runtime plan.
+
+Run from the launkey folder: python -m benchmarks.runtime_plan
+"""
+from ._timing import getQApplication, timePerCall
+
+def buildTable():
+    from launkey.launchpad_table import LaunchpadTable
+    from launkey.templates import Template, Button
+
+    templateData: list = [Template("Full grid", Template.Type.BUTTONS)]
+    templateData += [Button(f"Button {i}", str(i), (i // 8, i % 8), keyboardCombo="ctrl+a") for i in range(64)]
+    table = LaunchpadTable()
+    table.loadDataFromTemplate((1, 0), templateData)
+    return table
+
+def main():
+    app = getQApplication()  # noqa: F841 - LaunchpadTable needs a QApplication
+    from launkey.runtime_plan import compileRuntimePlan
+    from launkey.templates import Button
+
+    table = buildTable()
+    plan = compileRuntimePlan(table.loadedTemplates)
+    buttonPos = (7, 8)  # last pad in the grid
+
+    def tableLookup():
+        item = table.getTemplateItemAtButton(buttonPos)
+        if isinstance(item, Button):
+            return item.pushedColor[0].value, item.pushedColor[1].value, item.keyboardCombo
+
+    def planLookup():
+        return plan.actionAt(*buttonPos)
+
+    before = timePerCall(tableLookup)
+    after = timePerCall(planLookup)
+    print(f"table lookup: {before:8.1f} ns/event")
+    print(f"runtime plan: {after:8.1f} ns/event ({before / after:.1f}x faster)")
+
+if __name__ == "__main__":
+    main()
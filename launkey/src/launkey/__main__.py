@@ -1,4 +1,20 @@
-from launkey.app import main
+import sys
+import time
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["run"]:
+        startTime = time.perf_counter()
+        from launkey.headless import main as runHeadless
+        sys.exit(runHeadless(sys.argv[2:], startTime=startTime))
+    if sys.argv[1:2] == ["templates"]:
+        from launkey.template_store import main as manageTemplates
+        sys.exit(manageTemplates(sys.argv[2:]))
+    if sys.argv[1:2] == ["--profile-startup"]:
+        from launkey.startup_profile import main as profileStartup
+        sys.exit(profileStartup(sys.argv[2:]))
+    if sys.argv[1:2] == ["--startup-probe"]:
+        from launkey.startup_profile import probeFirstPaint
+        sys.exit(probeFirstPaint())
+
+    from launkey.app import main
     main()
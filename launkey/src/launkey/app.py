@@ -1,6 +1,8 @@
 """
 Control your game with Launchpad
 """
+from typing import TYPE_CHECKING
+
 import importlib.metadata
 import sys
 import os
@@ -9,13 +11,19 @@ from PySide6 import QtAsyncio
 from PySide6.QtCore import (QEvent)
 from PySide6.QtWidgets import (QApplication, QMainWindow, QMessageBox)
 from PySide6.QtGui import (QIcon, QPixmap)
-import launchpad_py as launchpad
 
+from .custom_widgets import FirstPaintWatcher
 from .icon import icon
 from .ui_mainwindow import Ui_MainWindow
 from .mainwindow import mainWindowScript
 from .updateinfo import OS
 
+if TYPE_CHECKING:
+    import launchpad_py as launchpad
+    from PySide6.QtWidgets import QProgressBar
+    from .template_loader import TemplateLoader
+    from .template_watcher import TemplateFolderWatcher
+
 def relaunchAsRoot() -> bool:
     if os.geteuid() != 0: # type: ignore
         msg = QMessageBox()
@@ -41,8 +49,13 @@ class Launkey(QMainWindow):
         self.currentOS = currentOS
         self.ui.setupUi(self)
         self.lpclose = None
+        self.firstPaint = FirstPaintWatcher(self)
+        self.templateWatcher: "TemplateFolderWatcher | None" = None
+        self.templateLoader: "TemplateLoader | None" = None
+        self.templateProgress: "QProgressBar | None" = None
+        self.templateErrorReport: QMessageBox | None = None
     
-    def set_close(self, close_flag: launchpad.Launchpad):
+    def set_close(self, close_flag: "launchpad.Launchpad"):
         self.lpclose = close_flag
 
     def closeEvent(self, event: QEvent):
@@ -54,6 +67,8 @@ class Launkey(QMainWindow):
                 print("Launchpad disconnected successfully.")
             except Exception as e:
                 print(f"ERR: {e}")
+        if self.templateLoader is not None:
+            self.templateLoader.shutdown()
         event.accept()
 
 
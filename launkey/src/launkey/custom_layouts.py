@@ -1,11 +1,13 @@
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
 from PySide6.QtWidgets import QGridLayout, QWidget
 from PySide6.QtCore import Qt, QTimer
 
 from .custom_widgets import PlusButton, ToggleButton
-from .template_options_widgets import TemplateOptionsList
 from .templates import Template, TemplateItem
 
+if TYPE_CHECKING:
+    from .template_options_widgets import TemplateOptionsList
+
 # From https://github.com/chinmaykrishnroy/PyQt5DynamicFlowLayout
 class DynamicGridLayout(QGridLayout):
     def __init__(self, parent=None, min_col_width=360, min_row_height=116):
@@ -31,11 +33,27 @@ class DynamicGridLayout(QGridLayout):
         super().addWidget(widget, 0, 0, rowSpan, colSpan)
         self.update_layout()
 
+    def addWidgets(self, widgets):
+        # Lays out once for the whole batch
+        if not widgets:
+            return
+        for widget in widgets:
+            self.items.append((widget, 1, 1, None))
+            super().addWidget(widget, 0, 0)
+        self.update_layout()
+
     def removeWidget(self, widget):
         self.items = [item for item in self.items if item[0] != widget]
         super().removeWidget(widget)
         self.update_layout()
 
+    def swapWidget(self, oldWidget, newWidget):
+        # Keeps the position of the old widget
+        self.items = [(newWidget, *item[1:]) if item[0] == oldWidget else item for item in self.items]
+        super().removeWidget(oldWidget)
+        super().addWidget(newWidget, 0, 0)
+        self.update_layout()
+
     def update_layout(self):
         if not self.parentWidget():
             return
@@ -60,7 +78,7 @@ class DynamicGridLayout(QGridLayout):
 
 # BUG This needs to be rewritten (bugs out with size changes)
 class TemplateGridLayout(QGridLayout):
-    def __init__(self, mainWidget: ToggleButton, optionsList: TemplateOptionsList, parent=None, rows: int = 8, cols: int = 8, template: list[Template | TemplateItem] | None = None):
+    def __init__(self, mainWidget: ToggleButton, optionsList: "TemplateOptionsList", parent=None, rows: int = 8, cols: int = 8, template: list[Template | TemplateItem] | None = None):
         super().__init__(parent)
         self.setContentsMargins(5, 5, 5, 5)
         self.setSpacing(0)
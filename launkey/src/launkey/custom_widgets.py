@@ -1,3 +1,4 @@
+import asyncio
 import time
 import struct
 
@@ -7,14 +8,15 @@ from PySide6.QtWidgets import (
     QDialog, QLabel, QFrame, QVBoxLayout,
     QMessageBox, QStatusBar, QSplitter
 )
-from PySide6.QtCore import Qt, QSize, QRect, QMimeData, QPoint
+from PySide6.QtCore import Qt, QSize, QRect, QMimeData, QPoint, QTimer, QObject, QEvent, Signal
 from PySide6.QtGui import (
     QCloseEvent, QKeySequence, QMouseEvent, 
     QPixmap, QPainter, QDrag, QResizeEvent, 
     QLinearGradient, QColor
 )
 
-from .templates import Template, TemplateItem, Button, sterilizeTemplateName, ledsToColorCode
+from .templates import Template, TemplateItem, Button, sterilizeTemplateName, ledsToQColor
+from .latency import RunLatency
 
 if TYPE_CHECKING:
     from .mainwindow import Launkey
@@ -98,6 +100,33 @@ class QAutoStatusBar(QStatusBar):
                 self.removeWidget(widget)
                 break
 
+class FirstPaintWatcher(QObject):
+    """Emits painted once, after the first paint event of the watched widget was handled"""
+    painted = Signal()
+
+    def __init__(self, widget: QWidget):
+        super().__init__(widget)
+        self.done = False
+        widget.installEventFilter(self)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.Type.Paint and not self.done:
+            self.done = True
+            self.parent().removeEventFilter(self)
+            QTimer.singleShot(0, self.painted.emit)
+        return False
+
+    async def wait(self, timeout: float = 1.0):
+        # A hidden window is never painted, so it gives up after the timeout
+        if self.done:
+            return
+        paintedEvent = asyncio.Event()
+        self.painted.connect(paintedEvent.set)
+        try:
+            await asyncio.wait_for(paintedEvent.wait(), timeout)
+        except TimeoutError:
+            pass
+
 class QLabelInfo(QLabel):
     def __init__(self, text: str = "", parent: QWidget | None = None, /, colour: str | None = None):
         super().__init__(text, parent)
@@ -107,6 +136,18 @@ class QLabelInfo(QLabel):
         if colour:
             self.setStyleSheet(f"color: {colour}; font-weight: bold;")
 
+class LatencyLabel(QLabelInfo):
+    """Status bar label with live press-to-keystroke latency of the current Run"""
+    def __init__(self, latency: RunLatency, parent: QWidget | None = None, /, interval: int = 500):
+        super().__init__(latency.statusText(), parent)
+        self.latency = latency
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.updateText)
+        self.timer.start(interval)
+
+    def updateText(self):
+        self.setText(self.latency.statusText())
+
 class ShortcutDisplay(QDialog):
     def __init__(self, parent: QWidget | None = None):
         super().__init__(parent)
@@ -181,7 +222,7 @@ class AreYouSureDialog(QMessageBox):
         self.setWindowFlag(Qt.WindowType.WindowStaysOnTopHint)
 
 class TemplateDisplay(QFrame):
-    def __init__(self, main_window: "Launkey", templateItems: list[Template | TemplateItem], parent: QWidget | None = None):
+    def __init__(self, main_window: "Launkey", templateItems: list[Template | TemplateItem], parent: QWidget | None = None, fileName: str | None = None):
         super().__init__(parent)
         self.main_window = main_window
         self.text = ""
@@ -192,6 +233,7 @@ class TemplateDisplay(QFrame):
         if not self.text:
             raise ValueError("TemplateDisplay requires at least one Template with a name.")
         self.templateFileName = sterilizeTemplateName(self.text)
+        self.sourceFileName = fileName or f"{self.templateFileName}.json"  # File the template was loaded from
         self.templateItems = templateItems
         self.setObjectName(f"templateDisplay-{self.templateFileName}")
         self.setSizePolicy(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Minimum)
@@ -240,15 +282,15 @@ class Preview(QFrame):
         self.setLineWidth(2)
 
         self.locationList: list[tuple[int, int]] = []
-        self.normalColorList: list[str] = []
-        self.pushedColorList: list[str] = []
+        self.normalColorList: list[QColor] = []
+        self.pushedColorList: list[QColor] = []
         for item in templateItems:
             if isinstance(item, TemplateItem):
                 self.locationList.append(item.location)
                 # TODO Add more types of TemplateItem when more are added
                 if isinstance(item, Button): # Only Button has colors for now
-                    self.normalColorList.append(ledsToColorCode(item.normalColor))
-                    self.pushedColorList.append(ledsToColorCode(item.pushedColor))
+                    self.normalColorList.append(ledsToQColor(item.normalColor))
+                    self.pushedColorList.append(ledsToQColor(item.pushedColor))
 
 
         layout = QVBoxLayout(self)
@@ -344,10 +386,10 @@ class Preview(QFrame):
 
             # One half is normal color and the other has pushed color
             gradient = QLinearGradient(rect.topLeft(), rect.bottomRight())
-            gradient.setColorAt(0, QColor(normal_color))
-            gradient.setColorAt(0.51, QColor(normal_color))
-            gradient.setColorAt(0.52, QColor(pushed_color))
-            gradient.setColorAt(1, QColor(pushed_color))
+            gradient.setColorAt(0, normal_color)
+            gradient.setColorAt(0.51, normal_color)
+            gradient.setColorAt(0.52, pushed_color)
+            gradient.setColorAt(1, pushed_color)
             painter.setBrush(gradient)
             painter.setPen(Qt.PenStyle.NoPen)
             painter.drawRoundedRect(rect, 5, 5)
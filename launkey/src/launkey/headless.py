@@ -0,0 +1,88 @@
+"""
+Runs a saved layout without the GUI: python -m launkey run [layout.json]
+"""
+import argparse
+import asyncio
+import os
+import signal
+import sys
+import time
+
+from pathlib import Path
+
+import launchpad_py as launchpad
+
+from .launchpad_control import LaunchpadWrapper
+from .layouts import LayoutState, getLastLayoutPath, loadLayout
+from .run_pipeline import RunPipeline
+from .virtual_launchpad import VirtualLaunchpad
+
+def peakResidentMemory() -> int | None:
+    # Bytes, None where the resource module is missing (Windows)
+    try:
+        import resource
+    except ImportError:
+        return None
+    maxRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxRss if sys.platform == "darwin" else maxRss * 1024
+
+async def runLayout(layout: LayoutState, lp: launchpad.Launchpad, /, duration: float | None = None, startTime: float | None = None) -> LaunchpadWrapper:
+    """Runs until cancelled, SIGTERM or `duration` seconds, returns the stopped wrapper"""
+    lpWrapper = LaunchpadWrapper(layout, device=lp)
+    if not lpWrapper.connect():
+        raise ConnectionError("Launchpad not found")
+    stopEvent = asyncio.Event()
+    if sys.platform != "win32":
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopEvent.set)
+
+    try:
+        lpWrapper.start()  # Compiles the plan, raises ValueError for bad combos or positions
+        lpWrapper.pipeline = RunPipeline(lpWrapper)
+        lpWrapper.pipeline.start()
+        if startTime is not None:
+            memory = peakResidentMemory()
+            memoryText = f", {memory / 2**20:.1f} MiB resident" if memory is not None else ""
+            print(f"Running {len(layout.loadedTemplates)} buttons, ready in {(time.perf_counter() - startTime) * 1000:.0f} ms{memoryText}")
+        try:
+            await asyncio.wait_for(stopEvent.wait(), duration)
+        except TimeoutError:
+            pass
+    finally:
+        if lpWrapper.pipeline is not None:
+            lpWrapper.pipeline.stop()
+            lpWrapper.pipeline = None
+        lpWrapper.stop()
+        lp.Close()
+    return lpWrapper
+
+def main(argv: list[str] | None = None, /, startTime: float | None = None) -> int:
+    if startTime is None:
+        startTime = time.perf_counter()
+    parser = argparse.ArgumentParser(prog="launkey run", description="Run a saved layout without the GUI")
+    parser.add_argument("layout", type=Path, nargs="?", help="layout file, the last one saved or loaded in the GUI by default")
+    parser.add_argument("--templates", type=Path, help="templates folder for version 1 layouts, the one used by the GUI by default")
+    parser.add_argument("--duration", type=float, help="stop after this many seconds")
+    parser.add_argument("--virtual", action="store_true", help="use a virtual launchpad instead of the device")
+    args = parser.parse_args(argv)
+
+    layoutPath = args.layout or getLastLayoutPath()
+    if layoutPath is None:
+        print("ERR: No layout given and no layout was saved or loaded in the GUI yet")
+        return 1
+    try:
+        layout = loadLayout(layoutPath, templateFolder=args.templates)
+    except ValueError as e:
+        print(f"ERR: {e}")
+        return 1
+    if sys.platform in ("linux", "linux2") and os.geteuid() != 0:  # type: ignore
+        print("WARN: Root access for shortcuts is required, keys may not be sent")
+
+    lp = VirtualLaunchpad() if args.virtual else launchpad.Launchpad()
+    try:
+        asyncio.run(runLayout(layout, lp, duration=args.duration, startTime=startTime))
+    except (ConnectionError, ValueError) as e:
+        print(f"ERR: {e}")
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -0,0 +1,76 @@
+from typing import Union
+
+import keyboard
+
+from .templates import Button, Template, TemplateItem
+
+# Steps of scan codes, e.g. "ctrl+c, v" -> ((29, 46), (47,)).
+# Stays a string when the platform cannot map key names (keyboard.press() will try again on its own).
+KeyCombo = Union[tuple[tuple[int, ...], ...], str]
+
+# Parsed combos, reused on every press and release
+parsedKeyCombos: dict[str, KeyCombo] = {}
+# Set once key names failed to map (no dumpkeys, not root on Linux), combos then stay strings
+keyNamesUnmapped = False
+
+def parseKeyCombo(keyboardCombo: str) -> KeyCombo:
+    keyCombo = parsedKeyCombos.get(keyboardCombo)
+    if keyCombo is not None:
+        return keyCombo
+    if not keyboardCombo.strip():
+        raise ValueError("Keyboard combo is empty")
+    if keyNamesUnmapped:
+        parsedKeyCombos[keyboardCombo] = keyboardCombo
+        return keyboardCombo
+    try:
+        parsed = keyboard.parse_hotkey(keyboardCombo)
+    except ValueError as e:
+        raise ValueError(f"Invalid keyboard combo '{keyboardCombo}': {e}") from e
+    except (OSError, ImportError) as e:  # keyboard raises ImportError for non-root users on Linux
+        markKeyNamesUnmapped(e)
+        parsedKeyCombos[keyboardCombo] = keyboardCombo
+        return keyboardCombo
+    # keyboard.send() only uses the first scan code of every key
+    keyCombo = tuple(tuple(scanCodes[0] for scanCodes in step) for step in parsed)
+    parsedKeyCombos[keyboardCombo] = keyCombo
+    return keyCombo
+
+def markKeyNamesUnmapped(error: Exception):
+    global keyNamesUnmapped
+    if not keyNamesUnmapped:
+        keyNamesUnmapped = True
+        print(f"Key names can't be mapped on this system: {error}")
+
+def validateKeyCombos(templateData: list[Template | TemplateItem]) -> list[str]:
+    errors: list[str] = []
+    for item in templateData:
+        if isinstance(item, Button):
+            try:
+                parseKeyCombo(item.keyboardCombo)
+            except ValueError as e:
+                errors.append(f"{item.name}: {e}")
+    return errors
+
+# Passing a parsed combo back to keyboard.press() is not safe, a single step combo gets
+# flattened into one key, so scan codes are sent one by one like keyboard.send() does.
+def pressKeyCombo(keyCombo: KeyCombo):
+    if isinstance(keyCombo, str):
+        keyboard.press(keyCombo)
+        return
+    for step in keyCombo:
+        for scanCode in step:
+            keyboard.press(scanCode)
+
+def releaseKeyCombo(keyCombo: KeyCombo):
+    if isinstance(keyCombo, str):
+        keyboard.release(keyCombo)
+        return
+    for step in keyCombo:
+        for scanCode in reversed(step):
+            keyboard.release(scanCode)
+
+def formatKeyCombo(keyCombo: KeyCombo) -> str:
+    """Stable text form of a combo, scan codes as "29+46, 47" """
+    if isinstance(keyCombo, str):
+        return keyCombo
+    return ", ".join("+".join(str(scanCode) for scanCode in step) for step in keyCombo)
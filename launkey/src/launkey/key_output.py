@@ -0,0 +1,151 @@
+import sys
+import threading
+import time
+
+from enum import Enum, auto, unique
+from queue import SimpleQueue
+from typing import NamedTuple, Protocol
+
+from PySide6.QtCore import QSettings
+
+from .key_combos import KeyCombo, pressKeyCombo, releaseKeyCombo
+from .latency import RunLatency
+
+KeyAction = tuple[bool, KeyCombo]  # (press, keyCombo), False is a release
+
+def sendKeyActions(keyActions: list[KeyAction]):
+    for press, keyCombo in keyActions:
+        if press:
+            pressKeyCombo(keyCombo)
+        else:
+            releaseKeyCombo(keyCombo)
+
+@unique
+class KeyOutput(Enum):
+    keyboard = 0
+    uinput = auto()  # Linux only
+
+def loadKeyOutput() -> KeyOutput:
+    settingLoader = QSettings("Ja-Tar", "Launkey")
+    return KeyOutput(settingLoader.value("Launchpad/Key output", KeyOutput.keyboard.value, int))
+
+class KeyOutputBackend(Protocol):
+    name: str
+    def sendBatch(self, keyActions: list[KeyAction]): ...
+    def close(self): ...
+
+class KeyboardModuleOutput:
+    """Key output through the keyboard package, works on every platform"""
+    name = "keyboard"
+
+    def sendBatch(self, keyActions: list[KeyAction]):
+        sendKeyActions(keyActions)
+
+    def close(self):
+        pass
+
+class CapturingKeyOutput:
+    """Keeps key batches instead of sending them, for replays and benchmarks"""
+    name = "capture"
+
+    def __init__(self):
+        self.batches: list[list[KeyAction]] = []
+
+    def sendBatch(self, keyActions: list[KeyAction]):
+        self.batches.append(keyActions)
+
+    def close(self):
+        pass
+
+def createKeyOutputBackend(keyOutput: KeyOutput) -> KeyOutputBackend:
+    if keyOutput == KeyOutput.uinput:
+        if sys.platform.startswith("linux"):
+            from .uinput_backend import UinputKeyboard
+            try:
+                return UinputKeyboard()
+            except OSError as e:
+                print(f"Can't open uinput keyboard, using the keyboard module: {e}")
+        else:
+            print("uinput key output is only available on Linux, using the keyboard module")
+    return KeyboardModuleOutput()
+
+class KeyInjectionStats(NamedTuple):
+    queueDepth: int
+    batches: int
+    lastInjectionTime: int  # ns
+    averageInjectionTime: float  # ns
+    maxInjectionTime: int  # ns
+
+class KeyInjectionWorker(threading.Thread):
+    """Sends keyboard actions on its own thread, so slow injection doesn't stall the event loop.
+
+    Batches are injected whole and in the order they were submitted, which keeps
+    press/release order for every pad."""
+    def __init__(self, backend: KeyOutputBackend | None = None, /, maxBatches: int = 256, latency: RunLatency | None = None):
+        super().__init__(name="KeyInjectionWorker", daemon=True)
+        self.backend = backend if backend is not None else KeyboardModuleOutput()
+        self.latency = latency
+        # (keyActions, time.monotonic_ns() of the oldest button event behind them or 0)
+        self._batches: SimpleQueue[tuple[list[KeyAction], int] | None] = SimpleQueue()
+        # Backpressure without locking the queue: a slot is taken per queued batch, the worker frees it
+        self._slots = threading.BoundedSemaphore(maxBatches)
+        self.batches = 0
+        self.lastInjectionTime = 0
+        self.totalInjectionTime = 0
+        self.maxInjectionTime = 0
+
+    def submit(self, keyActions: list[KeyAction], eventTime: int = 0):
+        if keyActions:
+            self._slots.acquire()
+            self._batches.put((keyActions, eventTime))
+
+    def trySubmit(self, keyActions: list[KeyAction], eventTime: int = 0) -> bool:
+        """Non-blocking submit, False when the queue is full"""
+        if keyActions:
+            if not self._slots.acquire(blocking=False):
+                return False
+            self._batches.put((keyActions, eventTime))
+        return True
+
+    @property
+    def queueDepth(self) -> int:
+        return self._batches.qsize()
+
+    def getStats(self) -> KeyInjectionStats:
+        average = self.totalInjectionTime / self.batches if self.batches else 0.0
+        return KeyInjectionStats(self.queueDepth, self.batches, self.lastInjectionTime, average, self.maxInjectionTime)
+
+    def run(self):
+        while True:
+            batch = self._batches.get()
+            if batch is None:
+                break
+            self._slots.release()
+            keyActions, eventTime = batch
+            start = time.monotonic_ns()
+            try:
+                self.backend.sendBatch(keyActions)
+            except Exception as e:
+                print(f"ERR: key injection failed: {e}")
+            end = time.monotonic_ns()
+            injectionTime = end - start
+            if self.latency is not None:
+                self.latency["keyboard"].record(injectionTime)
+                if eventTime:
+                    self.latency["total"].record(end - eventTime)
+            self.batches += 1
+            self.lastInjectionTime = injectionTime
+            self.totalInjectionTime += injectionTime
+            self.maxInjectionTime = max(self.maxInjectionTime, injectionTime)
+
+    def stop(self, timeout: float | None = 1.0):
+        # Everything submitted before stop() is still injected, the sentinel needs no slot so this never blocks
+        self._batches.put(None)
+        if self.is_alive():
+            self.join(timeout)
+        try:
+            self.backend.close()
+        except OSError as e:
+            print(f"ERR: closing {self.backend.name} key output failed: {e}")
+        stats = self.getStats()
+        print(f"Key injection ({self.backend.name}): {stats.batches} batches, avg {stats.averageInjectionTime / 1000:.1f} µs, max {stats.maxInjectionTime / 1000:.1f} µs")
@@ -0,0 +1,103 @@
+import csv
+import json
+
+from bisect import bisect_left
+from pathlib import Path
+
+# Upper bucket bounds in ns, from 1 µs to 10 s with 25% steps, plus one overflow bucket
+LATENCY_BUCKETS: tuple[int, ...] = tuple(round(1000 * 1.25 ** step) for step in range(73))
+
+# input: read from the device -> picked up by the mapping stage
+# lookup: runtime plan lookup, table and LED state for one batch
+# led: one LED write to the device
+# keyboard: injection of one key batch
+# total: read from the device -> keystroke injected
+LATENCY_STAGES = ("input", "lookup", "led", "keyboard", "total")
+
+class LatencyHistogram:
+    """Fixed-bucket histogram, recording is one bisect and a few additions"""
+    __slots__ = ("counts", "count", "total", "maxValue")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0
+        self.maxValue = 0
+
+    def record(self, value: int):
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.maxValue:
+            self.maxValue = value
+
+    def percentile(self, percent: float) -> int:
+        """Upper bound of the bucket holding the given percentile, 0 without data"""
+        if not self.count:
+            return 0
+        target = self.count * percent / 100
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= target:
+                return LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else self.maxValue
+        return self.maxValue
+
+    def clear(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0
+        self.maxValue = 0
+
+    def toDict(self) -> dict[str, object]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0,
+            "max": self.maxValue,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "counts": list(self.counts),
+        }
+
+class RunLatency:
+    """Latency histograms of one Run, every stage is only written from one thread"""
+    def __init__(self):
+        self.stages = {stage: LatencyHistogram() for stage in LATENCY_STAGES}
+
+    def __getitem__(self, stage: str) -> LatencyHistogram:
+        return self.stages[stage]
+
+    def clear(self):
+        for histogram in self.stages.values():
+            histogram.clear()
+
+    def statusText(self) -> str:
+        total = self.stages["total"]
+        if not total.count:
+            return "Latency: no presses yet"
+        return f"Latency p50 {formatLatency(total.percentile(50))}, p99 {formatLatency(total.percentile(99))}"
+
+    def toDict(self) -> dict[str, object]:
+        return {
+            "unit": "ns",
+            "buckets": list(LATENCY_BUCKETS),
+            "stages": {stage: histogram.toDict() for stage, histogram in self.stages.items()},
+        }
+
+    def exportJson(self, filePath: Path):
+        with open(filePath, "w") as f:
+            json.dump(self.toDict(), f, indent=4)
+
+    def exportCsv(self, filePath: Path):
+        with open(filePath, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["stage", "bucket_le_ns", "count"])
+            for stage, histogram in self.stages.items():
+                for index, count in enumerate(histogram.counts):
+                    writer.writerow([stage, LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else "inf", count])
+
+def formatLatency(value: int) -> str:
+    if value >= 1_000_000:
+        return f"{value / 1_000_000:.1f} ms"
+    return f"{value / 1000:.0f} µs"
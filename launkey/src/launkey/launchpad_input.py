@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+
+from concurrent.futures import Future
+
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    import launchpad_py as launchpad
+
+class ButtonEvent(NamedTuple):
+    x: int
+    y: int
+    pressed: bool
+    timestamp: int  # time.monotonic_ns() when the event was read from the device
+
+class LaunchpadInputReader(threading.Thread):
+    """Reads button events from the Launchpad MIDI input on its own thread
+    and forwards them into the asyncio loop through a queue.
+
+    When the queue is bounded and full the reader waits and retries instead of
+    dropping events, a lost release would leave a key held."""
+    def __init__(
+        self,
+        lp: "launchpad.Launchpad",
+        loop: asyncio.AbstractEventLoop,
+        queue: "asyncio.Queue[ButtonEvent]",
+        /,
+        idleWait: float = 0.0005,
+        maxIdleWait: float = 0.01,
+        busyPolls: int = 200,
+    ):
+        super().__init__(name="LaunchpadInputReader", daemon=True)
+        self.lp = lp
+        self.loop = loop
+        self.queue = queue
+        self.idleWait = idleWait  # pygame.midi has no blocking read, so poll with a short wait
+        # After busyPolls empty polls (100 ms by default) the wait doubles up to maxIdleWait,
+        # the first press after a pause is read up to maxIdleWait later, the rest at full rate
+        self.maxIdleWait = maxIdleWait
+        self.busyPolls = busyPolls
+        self.emptyPolls = 0
+        self.currentWait = idleWait
+        self.backpressure = 0  # Times the queue was full and events had to wait
+        self._stopEvent = threading.Event()
+
+    def run(self):
+        events: list[ButtonEvent] = []
+        while not self._stopEvent.is_set():
+            events += self.readPendingEvents()
+            if not events:
+                self._stopEvent.wait(self.nextIdleWait())
+                continue
+            self.emptyPolls = 0
+            self.currentWait = self.idleWait
+            try:
+                events = self.forwardEvents(events)
+            except RuntimeError:
+                break  # Event loop is closed
+            if events:
+                self.backpressure += 1
+                self._stopEvent.wait(self.idleWait)
+
+    def nextIdleWait(self) -> float:
+        self.emptyPolls += 1
+        if self.emptyPolls > self.busyPolls:
+            self.currentWait = min(self.currentWait * 2, self.maxIdleWait)
+        return self.currentWait
+
+    def forwardEvents(self, events: list[ButtonEvent]) -> list[ButtonEvent]:
+        """Hands events to the loop, returns the ones that didn't fit in the queue"""
+        done: Future[list[ButtonEvent]] = Future()
+        self.loop.call_soon_threadsafe(self._putEvents, events, done)
+        while not self._stopEvent.is_set():
+            try:
+                return done.result(self.idleWait * 20)
+            except TimeoutError:
+                continue
+        return []
+
+    def readPendingEvents(self) -> list[ButtonEvent]:
+        events: list[ButtonEvent] = []
+        while self.lp.ButtonChanged():
+            state = self.lp.ButtonStateXY()
+            if state:  # Skip messages that are not button changes
+                events.append(ButtonEvent(state[0], state[1], bool(state[2]), time.monotonic_ns()))
+        return events
+
+    def _putEvents(self, events: list[ButtonEvent], done: "Future[list[ButtonEvent]]"):
+        for index, event in enumerate(events):
+            try:
+                self.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                done.set_result(events[index:])
+                return
+        done.set_result([])
+
+    def stop(self, timeout: float | None = 1.0):
+        self._stopEvent.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout)
@@ -0,0 +1,242 @@
+import struct
+
+from enum import Enum, auto
+from PySide6.QtCore import QModelIndex, Qt, QPoint
+from PySide6.QtWidgets import (
+    QTableWidgetItem, QTableWidget, QAbstractScrollArea, QSizePolicy, QItemDelegate,
+)
+from PySide6.QtGui import (
+    QColor, QBrush, QDragEnterEvent, QDropEvent, 
+    QDragMoveEvent, QPixmap, QPainter, QPen,
+)
+
+from .templates import (
+    Template, TemplateItem, Button, LED,
+    sterilizeTemplateName,
+    ledsToVelocity,
+    loadedTemplates,
+    VELOCITY_QBRUSHES,
+)
+from .layouts import LayoutState
+
+class Sides(Enum):
+    LEFT = auto()
+    RIGHT = auto()
+    TOP = auto()
+    BOTTOM = auto()
+
+class LaunchpadTable(QTableWidget, LayoutState):
+    def __init__(self, parent=None):
+        super().__init__(9, 9, parent)  # 8x8 grid + 1 row and 1 column for autoMap
+        self.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.setSelectionMode(QTableWidget.SelectionMode.NoSelection)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.horizontalHeader().setVisible(False)
+        self.verticalHeader().setVisible(False)
+        self.setShowGrid(True)
+        sizePolicy = QSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Maximum)
+        sizePolicy.setHorizontalStretch(4)
+        self.setSizePolicy(sizePolicy)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setSizeAdjustPolicy(QAbstractScrollArea.SizeAdjustPolicy.AdjustToContents)
+        self.setDragEnabled(True)
+        self.setAcceptDrops(True)
+
+        self.setItemDelegate(QItemDelegate())
+
+        noButtonBrush = QBrush(QColor("#000000"))
+        noButtonBrush.setStyle(Qt.BrushStyle.DiagCrossPattern)
+        noButton = QTableWidgetItem()
+        noButton.setBackground(noButtonBrush)
+        noButton.setFlags(Qt.ItemFlag.NoItemFlags)
+        # top row and left column are for autoMap
+        self.setItem(0, 8, noButton)  # top-right corner cell
+
+        disabledButtonBrush = QBrush(QColor("#5F5F5F"))
+        disabledButtonBrush.setStyle(Qt.BrushStyle.FDiagPattern)
+        disabledButton = QTableWidgetItem()
+        disabledButton.setToolTip("Disabled for NOW")
+        disabledButton.setBackground(disabledButtonBrush)
+        disabledButton.setFlags(Qt.ItemFlag.NoItemFlags)
+
+        # REMOVE temporary disable to autoMap
+        for i in range(8):
+            self.setItem(0, i, disabledButton.clone())  # top row
+            self.setItem(i + 1, 8, disabledButton.clone())  # right column
+
+        self.setStyleSheet("""
+            QTableWidget {
+                gridline-color: darkgray;
+                border: 1px solid darkgray;
+            }
+        """)
+
+        for i in range(9):
+            self.setColumnWidth(i, 40) # IDEA size setting in settings
+            self.setRowHeight(i, 40)
+
+        # Initialize all cells with empty items
+        self.clear()
+
+        # Initialize variables
+        LayoutState.__init__(self)
+
+    def resetTemplates(self):
+        LayoutState.resetTemplates(self)
+        self.clear()
+
+    def clear(self):
+        for row in range(9):
+            for col in range(9):
+                if row == 0 and col == 8:
+                    continue  # Skip the top-right corner cell
+
+                # REMOVE temporary disable to autoMap
+                if (row == 0) or (col == 8):
+                    continue
+
+                item = QTableWidgetItem()
+                self.setItem(row, col, item)
+
+    def dragMoveEvent(self, event: QDragMoveEvent) -> None:
+        if event.mimeData().hasFormat("application/x-template"):
+            mimeData = event.mimeData().data("application/x-template")
+            occupiedRelativePositions: list[tuple[int, int]] = [tuple(struct.unpack('ii', mimeData.data()[i:i + 8])) for i in range(0, len(mimeData.data()), 8)]
+            pos = event.position().toPoint()
+            index: QModelIndex = self.indexAt(pos)
+            if occupiedRelativePositions and index.isValid():
+                tablePosition = (index.row(), index.column())
+                for relPos in occupiedRelativePositions:
+                    pos = (tablePosition[0] + relPos[0], tablePosition[1] + relPos[1])
+                    if self.isOnOccupiedCells(pos):
+                        event.ignore()
+                        return
+                    elif self.isOutOfBounds(pos):
+                        event.ignore()
+                        return
+                event.acceptProposedAction()
+                return
+        event.ignore()
+
+    def dragEnterEvent(self, event: QDragEnterEvent) -> None:
+        event.acceptProposedAction()
+
+    def dropEvent(self, event: QDropEvent) -> None:
+        if event.mimeData().hasFormat("application/x-template"):
+            # Extract the template name from the drag object name
+            templateName = event.mimeData().text()
+            templateFileName = sterilizeTemplateName(templateName) + ".json"
+            if templateFileName not in loadedTemplates:
+                raise ValueError(f"Template {templateFileName} not loaded")
+
+            pos = event.position().toPoint()
+            index: QModelIndex = self.indexAt(pos)
+            if index.isValid():
+                self.isValidLocation((index.row(), index.column()), loadedTemplates[templateFileName])
+                row = index.row()
+                col = index.column()
+                tablePosition = (row, col)
+                if (row == 0) or (col == 8): # REMOVE temporary disable to autoMap
+                    return  # Ignore drops on autoMap cells
+                templateData = loadedTemplates[templateFileName]
+                if not templateData:
+                    raise ValueError(f"Template {templateFileName} is empty")
+                self.loadDataFromTemplate(tablePosition, templateData)
+                event.acceptProposedAction()
+
+    def isOutOfBounds(self, itemPos: tuple[int, int]) -> bool:
+        item = self.item(*itemPos)
+        if not item:
+            return True
+        elif item.flags() == Qt.ItemFlag.NoItemFlags:
+            return True
+        return False
+
+    def loadDataFromTemplate(self, tablePosition: tuple[int, int], templateData: list[Template | TemplateItem]) -> list[tuple[int, int]]:
+        if self.item(*tablePosition) is None:
+            return []
+        templateLayout = LayoutState.loadDataFromTemplate(self, tablePosition, templateData)
+        self.drawTemplateItemsInTable([item for item in templateData if isinstance(item, TemplateItem)], templateLayout)
+        return templateLayout
+
+    def restoreTemplate(self, template: Template, templateLayout: list[tuple[int, int]], items: list[TemplateItem]):
+        LayoutState.restoreTemplate(self, template, templateLayout, items)
+        self.drawTemplateItemsInTable(items, templateLayout)
+
+    def drawTemplateItemsInTable(self, templateData: list[TemplateItem], templateLayout: list[tuple[int, int]]):
+        for i, templateItem in enumerate(templateData):
+            itemPos = templateLayout[i]
+            item = self.item(*itemPos)
+            if item is None:
+                continue
+
+            pixmap = QPixmap(38, 38)
+            painter = QPainter(pixmap)
+            painter.fillRect(0, 0, 38, 38, Qt.GlobalColor.black)
+
+            # TODO remember to add types of TemplateItem when more are added
+            if isinstance(templateItem, Button):
+                velocity = ledsToVelocity(templateItem.normalColor)
+                painter.setBrush(VELOCITY_QBRUSHES[velocity])
+                painter.drawRoundedRect(0, 0, 38, 38, 10, 10)
+                if velocity == 0:  # LED is off
+                    painter.setPen(QPen(Qt.GlobalColor.darkGray, 2, Qt.PenStyle.DotLine))
+                    painter.setBrush(Qt.BrushStyle.NoBrush)
+                    painter.drawRoundedRect(1, 1, 36, 36, 10, 10)
+
+
+            painter.setPen(QPen(Qt.GlobalColor.gray, 6, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap))
+            toDraw = self._getWhatToDraw(itemPos, templateLayout)
+            center = painter.viewport().center()
+            adjustedCenter = center + QPoint(1, 1) # slight adjustment
+            if Sides.LEFT in toDraw:
+                painter.drawLine(adjustedCenter.x(), adjustedCenter.y(), 0, adjustedCenter.y())
+            if Sides.RIGHT in toDraw:
+                painter.drawLine(adjustedCenter.x(), adjustedCenter.y(), 38, adjustedCenter.y())
+            if Sides.TOP in toDraw:
+                painter.drawLine(adjustedCenter.x(), adjustedCenter.y(), adjustedCenter.x(), 0)
+            if Sides.BOTTOM in toDraw:
+                painter.drawLine(adjustedCenter.x(), adjustedCenter.y(), adjustedCenter.x(), 38)
+
+
+            painter.end()
+            item.setBackground(pixmap)
+
+    def _getWhatToDraw(self, itemPos: tuple[int, int], templateLayout: list[tuple[int, int]]) -> list[str]:
+        sides = []
+        x, y = itemPos
+        if (x, y - 1) in templateLayout:
+            sides.append(Sides.LEFT)
+        if (x, y + 1) in templateLayout:
+            sides.append(Sides.RIGHT)
+        if (x - 1, y) in templateLayout:
+            sides.append(Sides.TOP)
+        if (x + 1, y) in templateLayout:
+            sides.append(Sides.BOTTOM)
+        return sides
+    
+    def drawFirstTableFrame(self):
+        for row in range(1, 9):
+            for col in range(8):
+                item = self.item(row, col)
+                if item is not None:
+                    launchpadPos = (row - 1, col)  # Adjust for autoMap row
+                    index = launchpadPos[0] * 8 + launchpadPos[1]
+                    if 0 <= index < 64:
+                        velocity = self.currentFrame[index]
+                        if velocity:
+                            item.setBackground(VELOCITY_QBRUSHES[velocity])
+                        else:
+                            newItem = QTableWidgetItem()
+                            self.setItem(row, col, newItem)
+
+    def changeButtonColorInTable(self, buttonPos: tuple[int, int], newColor: tuple[LED, LED]):
+        item = self.item(*buttonPos)
+        if item is not None:
+            velocity = ledsToVelocity(newColor)
+            if velocity:
+                item.setBackground(VELOCITY_QBRUSHES[velocity])
+            else:
+                newItem = QTableWidgetItem()
+                self.setItem(*buttonPos, newItem)
@@ -0,0 +1,285 @@
+import json
+
+from enum import Enum, auto, unique
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from PySide6.QtCore import QSettings, QStandardPaths
+
+from .led_frame import LedFrame
+from .templates import Template, TemplateItem, Button, checkTemplate, getTemplateFolderPath, objectFromJson, sterilizeTemplateName
+
+LAYOUT_VERSION = 2
+LAYOUT_VERSIONS = (1, 2)  # Version 1 files only reference the templates
+
+@unique
+class LaunchLayout(Enum):
+    empty = 0  # Start with an empty table
+    lastLayout = auto()  # Load the last saved or loaded layout
+    runLastLayout = auto()  # Load it and start Run when the launchpad is connected
+
+class TemplatePlacement(NamedTuple):
+    fileName: str  # Template file in the templates folder
+    position: tuple[int, int]  # Table position (row, col) the template is placed at
+
+class LayoutFile(NamedTuple):
+    placements: list[TemplatePlacement]
+    runtime: list[dict[str, Any]] | None  # Placed template items, None for version 1 files
+
+class LayoutState:
+    """Templates placed on the 9x9 table and the Run state of their buttons, without any widgets.
+
+    LaunchpadTable draws this state, the headless runner uses it on its own."""
+    def __init__(self):
+        self.occupiedCells: list[tuple[int, int]] = []  # To track occupied cells
+        self.loadedTemplates: dict[tuple[int, int], TemplateItem] = {}  # To track loaded templates items
+        self.loadedTempTypes: dict[tuple[tuple[int, int], ...], Template] = {}  # To track loaded template types
+        self.itemIndex: list[TemplateItem | None] = [None] * 81  # Loaded templates items indexed by row * 9 + col
+        self.pressedMask = 0  # Bit (row - 1) * 8 + col is set while the button is pressed
+
+        # Velocity byte for each LED on the launchpad: 64 grid LEDs, then 8 on the right and 8 on the top (autoMap)
+        self.currentFrame = LedFrame()
+
+    def resetTemplates(self):
+        self.occupiedCells.clear()
+        self.loadedTemplates.clear()
+        self.loadedTempTypes.clear()
+        self.itemIndex[:] = [None] * 81
+        self.pressedMask = 0
+
+    def loadDataFromTemplate(self, tablePosition: tuple[int, int], templateData: list[Template | TemplateItem]) -> list[tuple[int, int]]:
+        # Returns the table positions of the template items
+        templateLayout: list[tuple[int, int]] = []
+        for templateItem in templateData:
+            if isinstance(templateItem, Template):
+                pass
+            elif isinstance(templateItem, TemplateItem):
+                itemPos = (tablePosition[0] + templateItem.location[0], tablePosition[1] + templateItem.location[1])
+                if not (0 <= itemPos[0] < 9 and 0 <= itemPos[1] < 9):
+                    raise ValueError(f"Item position {itemPos} is invalid")
+                templateLayout.append(itemPos)
+                self.occupiedCells.append(itemPos)
+                self.loadedTemplates[itemPos] = templateItem
+                self.itemIndex[itemPos[0] * 9 + itemPos[1]] = templateItem
+            else:
+                raise ValueError(f"Unknown template item type: {templateItem}")
+        if templateData and isinstance(templateData[0], Template):
+            self.loadedTempTypes[tuple(templateLayout)] = templateData[0]
+        return templateLayout
+
+    def restoreTemplate(self, template: Template, templateLayout: list[tuple[int, int]], items: list[TemplateItem]):
+        # Positions come from a file, only the index checks run (not a template re-validation)
+        if len(templateLayout) != len(items):
+            raise ValueError(f"Template {template.name} has {len(items)} items for {len(templateLayout)} positions")
+        if len(set(templateLayout)) != len(templateLayout):
+            raise ValueError(f"Template {template.name} places two items on the same cell")
+        for itemPos in templateLayout:
+            if LayoutState.isOutOfBounds(self, itemPos) or self.isOnOccupiedCells(itemPos):
+                raise ValueError(f"Template {template.name} item at {itemPos} is outside the grid or on an occupied cell")
+        for itemPos, templateItem in zip(templateLayout, items):
+            self.occupiedCells.append(itemPos)
+            self.loadedTemplates[itemPos] = templateItem
+            self.itemIndex[itemPos[0] * 9 + itemPos[1]] = templateItem
+        self.loadedTempTypes[tuple(templateLayout)] = template
+
+    def isValidLocation(self, tablePosition: tuple[int, int], templateData: list[Template | TemplateItem]) -> bool:
+        for item in templateData:
+            if isinstance(item, TemplateItem):
+                itemPos = (tablePosition[0] + item.location[0], tablePosition[1] + item.location[1])
+                if self.isOutOfBounds(itemPos):
+                    return False
+                if self.isOnOccupiedCells(itemPos):
+                    return False
+        return True
+
+    def isOutOfBounds(self, itemPos: tuple[int, int]) -> bool:
+        # REMOVE temporary disable to autoMap, the top row and the right column are not usable yet
+        row, col = itemPos
+        return not (1 <= row < 9 and 0 <= col < 8)
+
+    def isOnOccupiedCells(self, itemPos: tuple[int, int]) -> bool:
+        row, col = itemPos
+        return 0 <= row < 9 and 0 <= col < 9 and self.itemIndex[row * 9 + col] is not None
+
+    def returnFirstFrame(self) -> LedFrame:
+        frame = LedFrame()
+
+        for tablePosition, itemData in self.loadedTemplates.items():
+            launchpadPos = (tablePosition[0] - 1, tablePosition[1])  # Adjust for autoMap row
+
+            if isinstance(itemData, Button):
+                index = launchpadPos[0] * 8 + launchpadPos[1]
+                if 0 <= index < 64:
+                    frame.setLeds(index, itemData.normalColor)
+            else:
+                raise ValueError(f"Unknown TemplateItem type: {itemData}")
+                # TODO handle other TemplateItem types when added
+        self.currentFrame = frame
+        return frame
+
+    def getTemplateItemAtButton(self, buttonPos: tuple[int, int]) -> TemplateItem | None: # buttonPos is launchpad position is flipped (y, x)
+        x, y = buttonPos
+        if not (0 <= x < 9 and 0 <= y < 9):
+            return None
+        return self.itemIndex[y * 9 + x]
+
+    def isFrameChangeNeeded(self, newFrame: LedFrame) -> bool:
+        if newFrame != self.currentFrame:
+            self.currentFrame.copyFrom(newFrame)
+            return True
+        return False
+
+    def isButtonPressed(self, tablePos: tuple[int, int]) -> bool:
+        index = (tablePos[0] - 1) * 8 + tablePos[1]  # Adjust for autoMap row
+        return 0 <= index < 64 and bool(self.pressedMask >> index & 1)
+
+    def releaseAllButtons(self) -> int:
+        # Returns the mask of buttons that were pressed
+        pressedMask = self.pressedMask
+        self.pressedMask = 0
+        return pressedMask
+
+    def buttonPressed(self, buttonPos: tuple[int, int], buttonItem: Button):
+        buttonPos = (buttonPos[1], buttonPos[0])  # flip to table position
+        index = (buttonPos[0] - 1) * 8 + buttonPos[1]  # Adjust for autoMap row
+        if 0 <= index < 64:
+            self.currentFrame.setLeds(index, buttonItem.pushedColor)
+            self.pressedMask |= 1 << index
+        self.changeButtonColorInTable(buttonPos, buttonItem.pushedColor)
+
+    def buttonUnpressed(self, buttonPos: tuple[int, int]):
+        buttonPos = (buttonPos[1], buttonPos[0])  # flip to table position
+        index = (buttonPos[0] - 1) * 8 + buttonPos[1]  # Adjust for autoMap row
+        if 0 <= index < 64 and self.pressedMask >> index & 1:
+            item = self.itemIndex[buttonPos[0] * 9 + buttonPos[1]]
+            if isinstance(item, Button):
+                self.currentFrame.setLeds(index, item.normalColor)
+                self.changeButtonColorInTable(buttonPos, item.normalColor)
+            else:
+                raise ValueError(f"Unknown TemplateItem type: {item}")
+            self.pressedMask &= ~(1 << index)
+
+    # Drawing hooks, LaunchpadTable shows the state in its cells
+    def changeButtonColorInTable(self, buttonPos: tuple[int, int], newColor: tuple):
+        pass
+
+    def drawFirstTableFrame(self):
+        pass
+
+    def drawTemplateItemsInTable(self, templateData: list[TemplateItem], templateLayout: list[tuple[int, int]]):
+        pass
+
+def loadTemplateFile(filePath: Path) -> list[Template | TemplateItem]:
+    """Template file without the GUI, errors are raised as ValueError"""
+    try:
+        with open(filePath, "r") as f:
+            templateJsonData: list[dict[str, Any]] = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Failed to load template file {filePath.name}: {e}") from e
+    templateData = [objectFromJson(obj) for obj in templateJsonData]
+    if not checkTemplate(templateData):
+        raise ValueError(f"Template file {filePath.name} is invalid or contains no Template object.")
+    from .key_combos import validateKeyCombos  # Imports the keyboard package
+    keyComboErrors = validateKeyCombos(templateData)
+    if keyComboErrors:
+        print(f"WARN: Template {filePath.name} has invalid keyboard combos: " + "; ".join(keyComboErrors))
+    return templateData
+
+def readLayoutFile(filePath: Path) -> LayoutFile:
+    """Layout file, a single JSON read:
+    {"version": 2, "templates": [{"file": "Template.json", "position": [row, col]}, ...],
+     "runtime": [{"template": {...}, "items": [[row, col, {...}], ...]}, ...]}
+    runtime[i] holds the items templates[i] placed, version 1 files have no runtime section."""
+    try:
+        with open(filePath, "r") as f:
+            layoutJson: dict[str, Any] = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Failed to load layout file {filePath.name}: {e}") from e
+    if not isinstance(layoutJson, dict) or layoutJson.get("version") not in LAYOUT_VERSIONS:
+        raise ValueError(f"Layout file {filePath.name} has an unsupported version")
+    try:
+        placements = [
+            TemplatePlacement(str(placement["file"]), (int(placement["position"][0]), int(placement["position"][1])))
+            for placement in layoutJson["templates"]
+        ]
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        raise ValueError(f"Layout file {filePath.name} is invalid: {e}") from e
+    return LayoutFile(placements, layoutJson.get("runtime") if layoutJson["version"] >= 2 else None)
+
+def loadLayout(filePath: Path, /, templateFolder: Path | None = None, layout: LayoutState | None = None) -> LayoutState:
+    """Reads a layout file into `layout` (a new LayoutState by default), replacing what it held.
+
+    The runtime section is restored as saved, templates are only loaded from `templateFolder`
+    (the templates folder by default) for version 1 files."""
+    layoutFile = readLayoutFile(filePath)
+    if layout is None:
+        layout = LayoutState()
+    else:
+        layout.resetTemplates()
+    if layoutFile.runtime is not None:
+        restoreRuntime(layout, layoutFile.runtime)
+    else:
+        placeTemplates(layout, layoutFile.placements, templateFolder or getTemplateFolderPath())
+    return layout
+
+def restoreRuntime(layout: LayoutState, runtime: list[dict[str, Any]]):
+    try:
+        for entry in runtime:
+            template = objectFromJson(entry["template"])
+            templateLayout = [(int(row), int(col)) for row, col, _ in entry["items"]]
+            items = [objectFromJson(itemJson) for _, _, itemJson in entry["items"]]
+            if not isinstance(template, Template) or not all(isinstance(item, TemplateItem) for item in items):
+                raise ValueError("Layout runtime section contains invalid objects")
+            layout.restoreTemplate(template, templateLayout, items)  # type: ignore[arg-type]
+    except (KeyError, IndexError, TypeError) as e:
+        raise ValueError(f"Layout runtime section is invalid: {e}") from e
+
+def placeTemplates(layout: LayoutState, placements: list[TemplatePlacement], templateFolder: Path):
+    templateFiles: dict[str, list[Template | TemplateItem]] = {}
+    for fileName, position in placements:
+        if fileName not in templateFiles:
+            templateFiles[fileName] = loadTemplateFile(templateFolder / fileName)
+        templateData = templateFiles[fileName]
+        if not layout.isValidLocation(position, templateData):
+            raise ValueError(f"Template {fileName} does not fit at {position}")
+        layout.loadDataFromTemplate(position, templateData)
+
+def layoutToJson(layout: LayoutState) -> dict[str, Any]:
+    placements: list[dict[str, Any]] = []
+    runtime: list[dict[str, Any]] = []
+    for templateLayout, template in layout.loadedTempTypes.items():
+        if not templateLayout:
+            continue
+        items = [layout.loadedTemplates[itemPos] for itemPos in templateLayout]
+        # The template origin, items are placed relative to it
+        position = (templateLayout[0][0] - items[0].location[0], templateLayout[0][1] - items[0].location[1])
+        placements.append({"file": sterilizeTemplateName(template.name) + ".json", "position": position})
+        runtime.append({
+            "template": template.toDict(),
+            "items": [[itemPos[0], itemPos[1], item.toDict()] for itemPos, item in zip(templateLayout, items)],
+        })
+    return {"version": LAYOUT_VERSION, "templates": placements, "runtime": runtime}
+
+def saveLayout(layout: LayoutState, filePath: Path):
+    with open(filePath, "w") as f:
+        json.dump(layoutToJson(layout), f, indent=4)
+
+def getLayoutFolderPath() -> Path:
+    pathOnSystem = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+    fullPath = Path(pathOnSystem) / "Launkey_Layouts"
+    fullPath.mkdir(parents=True, exist_ok=True)
+    return fullPath
+
+def getLastLayoutPath() -> Path | None:
+    settingLoader = QSettings("Ja-Tar", "Launkey")
+    lastLayout = settingLoader.value("Layouts/Last layout", "", str)
+    if lastLayout and Path(lastLayout).exists():
+        return Path(lastLayout)
+    return None
+
+def setLastLayoutPath(filePath: Path):
+    QSettings("Ja-Tar", "Launkey").setValue("Layouts/Last layout", str(filePath))
+
+def loadLaunchLayout() -> LaunchLayout:
+    settingLoader = QSettings("Ja-Tar", "Launkey")
+    return LaunchLayout(settingLoader.value("Launchpad/At launch", LaunchLayout.lastLayout.value, int))
@@ -0,0 +1,60 @@
+from typing import Optional
+
+from .templates import LED, LED_VELOCITY, VELOCITY_LEDS
+
+FRAME_SIZE = 80  # 64 grid LEDs, 8 right column LEDs and 8 top (autoMap) LEDs, in LedCtrlRawRapid order
+_EMPTY_FRAME = bytes(FRAME_SIZE)
+
+class LedFrame:
+    """Launchpad LED state as raw velocity bytes, ready to be sent with LedCtrlRawRapid"""
+    __slots__ = ("buffer",)
+
+    def __init__(self, buffer: Optional[bytes | bytearray] = None):
+        if buffer is None:
+            self.buffer = bytearray(FRAME_SIZE)
+            return
+        if len(buffer) != FRAME_SIZE:
+            raise ValueError(f"LED frame needs {FRAME_SIZE} bytes, got {len(buffer)}")
+        self.buffer = bytearray(buffer)
+
+    @classmethod
+    def fromLeds(cls, frame: list[tuple[LED, LED]], autoMap: Optional[list[tuple[LED, LED]]] = None) -> "LedFrame":
+        ledFrame = cls()
+        for slot, leds in enumerate(frame + (autoMap or [])):
+            ledFrame.buffer[slot] = LED_VELOCITY[leds]
+        return ledFrame
+
+    def __getitem__(self, slot: int) -> int:
+        return self.buffer[slot]
+
+    def __setitem__(self, slot: int, velocity: int):
+        self.buffer[slot] = velocity
+
+    def __len__(self) -> int:
+        return FRAME_SIZE
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LedFrame):
+            return NotImplemented
+        return self.buffer == other.buffer
+
+    def getLeds(self, slot: int) -> tuple[LED, LED]:
+        return VELOCITY_LEDS[self.buffer[slot]]
+
+    def setLeds(self, slot: int, leds: tuple[LED, LED]):
+        self.buffer[slot] = LED_VELOCITY[leds]
+
+    def copyFrom(self, other: "LedFrame"):
+        self.buffer[:] = other.buffer  # Same size, so the buffer is reused
+
+    def copy(self) -> "LedFrame":
+        return LedFrame(self.buffer)
+
+    def clear(self):
+        self.buffer[:] = _EMPTY_FRAME
+
+    def changedSlots(self, other: "LedFrame") -> list[int]:
+        if self.buffer == other.buffer:
+            return []
+        buffer, otherBuffer = self.buffer, other.buffer
+        return [slot for slot in range(FRAME_SIZE) if buffer[slot] != otherBuffer[slot]]
@@ -0,0 +1,73 @@
+import asyncio
+
+from enum import Enum, auto, unique
+from typing import Protocol
+
+from PySide6.QtCore import QSettings
+
+from .led_frame import LedFrame
+
+@unique
+class LedRefreshRate(Enum):
+    hz60 = 0
+    hz100 = auto()
+    hz125 = auto()
+    hz200 = auto()
+
+    @property
+    def hz(self) -> int:
+        return int(self.name[2:])
+
+def loadLedRefreshRate() -> LedRefreshRate:
+    settingLoader = QSettings("Ja-Tar", "Launkey")
+    return LedRefreshRate(settingLoader.value("Launchpad/LED refresh rate", LedRefreshRate.hz125.value, int))
+
+class LedWriter(Protocol):
+    def writeLeds(self, frame: LedFrame) -> int: ...
+    def writeLed(self, message: tuple[int, int, int], slot: int): ...
+
+class LedScheduler:
+    """Collects LED changes into a pending frame and sends it at most once per refresh period.
+
+    The first change after an idle period is sent right away, later changes wait for the
+    next tick, so several changes to one pad inside a tick only cost what the final state
+    differs from the device."""
+    def __init__(self, writer: LedWriter, /, refreshRate: LedRefreshRate = LedRefreshRate.hz125, fastPress: bool = True):
+        self.writer = writer
+        self.pendingFrame = LedFrame()
+        self.fastPress = fastPress  # Send press feedback at once instead of waiting for the tick
+        self.interval = 1 / refreshRate.hz
+        self._dirtyEvent = asyncio.Event()
+
+    def setRefreshRate(self, refreshRate: LedRefreshRate):
+        self.interval = 1 / refreshRate.hz
+
+    def setLed(self, slot: int, velocity: int):
+        if self.pendingFrame[slot] != velocity:
+            self.pendingFrame[slot] = velocity
+            self._dirtyEvent.set()
+
+    def setFrame(self, frame: LedFrame):
+        self.pendingFrame.copyFrom(frame)
+        self._dirtyEvent.set()
+
+    def pressFeedback(self, slot: int, message: tuple[int, int, int]):
+        if not self.fastPress:
+            self.setLed(slot, message[2])
+            return
+        self.pendingFrame[slot] = message[2]
+        self.writer.writeLed(message, slot)
+
+    def clear(self):
+        self.pendingFrame.clear()
+        self._dirtyEvent.clear()
+
+    def flush(self) -> int:
+        self._dirtyEvent.clear()
+        return self.writer.writeLeds(self.pendingFrame)
+
+    async def run(self):
+        while True:
+            await self._dirtyEvent.wait()
+            self.flush()
+            await asyncio.sleep(self.interval)
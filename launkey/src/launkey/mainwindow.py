@@ -1,30 +1,40 @@
 import asyncio
-import json
 from pathlib import Path
 
 from typing import TYPE_CHECKING
 
 from PySide6.QtCore import Qt
-from PySide6.QtWidgets import QInputDialog, QMessageBox, QErrorMessage
+from PySide6.QtWidgets import QFileDialog, QInputDialog, QMessageBox, QErrorMessage, QProgressBar
 
-from .ui_dialogtemplates import Ui_Dialog
-from .ui_settings import Ui_Settings
-from .custom_widgets import QDialogNoDefault, TemplateDisplay, QLabelInfo, ShortcutDisplay
-from .templates import Template, TemplateItem, getTemplateFolderPath, objectFromJson, checkTemplate, sterilizeTemplateName, loadedTemplates
-from .launchpad_control import LaunchpadWrapper, KeyboardTester
+from .custom_widgets import QDialogNoDefault, TemplateDisplay, QLabelInfo, LatencyLabel, ShortcutDisplay
+from .templates import Template, getTemplateFolderPath, sterilizeTemplateName, loadedTemplates
+from .layouts import LaunchLayout, getLastLayoutPath, getLayoutFolderPath, loadLaunchLayout, loadLayout, saveLayout, setLastLayoutPath
+from .template_index import templateIndex
 from .theme_loader import loadTheme
 from .updateinfo import checkForUpdates
 
+# The template editor, the settings dialog and the device stack (launchpad_py, pygame, keyboard)
+# are imported where they are first used, so they don't delay the first paint
 if TYPE_CHECKING:
     from .app import Launkey
+    from .launchpad_control import LaunchpadWrapper
+    from .template_loader import ParsedTemplate, TemplateLoader
 
 async def mainWindowScript(main_window: "Launkey"):
     main_window.ui.buttonAddTemplate.clicked.connect(lambda: newTemplatePopup(main_window))
     main_window.ui.actionSettings.triggered.connect(lambda: loadSettingsWindow(main_window))
+    main_window.ui.actionReplaySession.triggered.connect(lambda: asyncio.ensure_future(replaySessionPopup(main_window)))
+    main_window.ui.actionSave.triggered.connect(lambda: saveLayoutPopup(main_window))
+    main_window.ui.actionLoad.triggered.connect(lambda: loadLayoutPopup(main_window))
     main_window.ui.checkForUpdates.triggered.connect(lambda: asyncio.create_task(checkForUpdates(main_window, manual=True)))
     
     loadTheme(main_window)
+    await main_window.firstPaint.wait()  # Templates, layout and launchpad are loaded once the window is shown
     importTemplates(main_window)
+    watchTemplateFolder(main_window)
+    launchLayout = loadLaunchLayout()
+    layoutRestored = launchLayout != LaunchLayout.empty and restoreLastLayout(main_window)
+    from .launchpad_control import LaunchpadWrapper
     lpWrapper = LaunchpadWrapper(main_window.ui.tableLaunchpad)
 
     if lpWrapper.connect() and main_window.root:
@@ -33,78 +43,139 @@ async def mainWindowScript(main_window: "Launkey"):
         main_window.lpclose = lpWrapper.lp
         main_window.ui.buttonRun.clicked.connect(lambda: asyncio.ensure_future(buttonRun(main_window, lpWrapper)))
         main_window.ui.buttonRun.setEnabled(True)
+        main_window.ui.actionExportLatency.triggered.connect(lambda: exportLatency(main_window, lpWrapper))
+        main_window.ui.actionExportLatency.setEnabled(True)
+        main_window.ui.actionRecordSession.toggled.connect(lambda checked: selectSessionLog(main_window, lpWrapper, checked))
+        main_window.ui.actionRecordSession.setEnabled(True)
+        if layoutRestored and launchLayout == LaunchLayout.runLastLayout:
+            asyncio.ensure_future(buttonRun(main_window, lpWrapper))
     else:
         launchpadLoadingFallback(main_window, lpWrapper)
     
     asyncio.create_task(checkForUpdates(main_window))
 
-def importTemplates(main_window: "Launkey", currentTemplateDisplayName: str | None = None):
-    print("Importing templates...")
-    if currentTemplateDisplayName:
-        removeTemplateForRefresh(main_window, currentTemplateDisplayName)
+def importTemplates(main_window: "Launkey", fileNames: list[str] | None = None):
+    """Imports the template files that were added, changed or deleted since the last import.
 
-    template_files = getTemplateFileList()
-    for template_file in template_files:
-        try:
-            template_path = getTemplateFolderPath() / template_file
-            templateData = parseTemplateFile(main_window, template_path)
-            if not templateData:
-                continue
-
-            addTemplateToLayout(main_window, templateData, template_file)
-        except Exception as e:
-            message = f"Error loading template from {template_file}: {e}"
-            messagebox = QMessageBox(QMessageBox.Icon.Critical, "Template Load Error", message, parent=main_window)
-            messagebox.exec()
-
-def removeTemplateForRefresh(main_window, currentTemplateDisplayName):
-    for i in reversed(range(main_window.ui.gridLayoutTemplates.count())):
-        item = main_window.ui.gridLayoutTemplates.itemAt(i)
-        if item is None:
-            continue
-        widget = item.widget()
-        if isinstance(widget, TemplateDisplay) and widget.text == currentTemplateDisplayName:
-            main_window.ui.gridLayoutTemplates.removeWidget(widget)
-            widget.deleteLater()
-            if currentTemplateDisplayName in loadedTemplates:
-                del loadedTemplates[currentTemplateDisplayName]
-            break
-
-def parseTemplateFile(main_window: "Launkey", filePath: Path) -> list[Template | TemplateItem]:
-        errorMessageTitle = "Load Template Error"
-
-        templateJsonData: list[dict[str, object]] = []
-        templateData: list[Template | TemplateItem] = []
-        try:
-            with open(filePath, "r") as f:
-                templateJsonData: list[dict[str, object]] = json.load(f)
-        except Exception as e:
-            QMessageBox.warning(main_window, errorMessageTitle, f"Failed to load template file: {e}")
-            return []
-        for obj in templateJsonData:
-            try:
-                template = objectFromJson(obj)
-            except ValueError as e:
-                QMessageBox.warning(main_window, errorMessageTitle, f"Error parsing template data: {e}")
-                continue
-            if template:
-                templateData.append(template)
-        
-        if not checkTemplate(templateData):
-            QMessageBox.warning(main_window, errorMessageTitle, "Template file is invalid or contains no Template object.")
-            return []
-    
-        return templateData
-
-def addTemplateToLayout(main_window: "Launkey", templateData: list[Template | TemplateItem], templateFileName: str):
-    templateDisplay = TemplateDisplay(main_window, templateData, main_window)
-    if not checkForDuplicates(main_window, templateDisplay.text):
-        main_window.ui.gridLayoutTemplates.addWidget(templateDisplay)
-        loadedTemplates[templateFileName] = templateData
+    With `fileNames` only those files are checked, otherwise the whole folder (unchanged files are only stat'ed).
+    Files are parsed in the background, see addTemplatesToLayout and showTemplateErrors."""
+    from .template_store import TemplateStorage, loadTemplateStorage
+    if loadTemplateStorage() == TemplateStorage.database:
+        importStoredTemplates(main_window, fileNames)
+        return
 
-def getTemplateFileList() -> list[str]:
     folderPath = getTemplateFolderPath()
-    return [f.name for f in folderPath.iterdir() if f.is_file() and f.suffix == ".json"]
+    changes = templateIndex.scan(folderPath, fileNames)
+    if not changes:
+        return
+    print(f"Importing templates: {len(changes.added)} added, {len(changes.changed)} changed, {len(changes.removed)} removed")
+
+    for template_file in changes.removed:
+        removeTemplateDisplay(main_window, template_file)
+
+    toLoad = changes.changed + changes.added
+    getTemplateLoader(main_window).load(folderPath, toLoad, {name: templateIndex.files[name].hash for name in toLoad})
+
+def importStoredTemplates(main_window: "Launkey", fileNames: list[str] | None = None):
+    # Templates from the SQLite store, one query instead of a folder scan
+    from .template_store import openTemplateStore
+    store = openTemplateStore()
+    if fileNames is None and store.isEmpty():
+        count, _ = store.importFolder(getTemplateFolderPath())
+        print(f"Template store created with {count} templates from the templates folder")
+
+    stored = store.readTemplates(fileNames)
+    storedNames = {fileName for fileName, _ in stored}
+    for template_file in list(loadedTemplates if fileNames is None else fileNames):
+        if template_file not in storedNames:
+            removeTemplateDisplay(main_window, template_file)
+    # Parsed like template files, in the background and through the compiled cache
+    getTemplateLoader(main_window).loadData(stored)
+
+def getTemplateLoader(main_window: "Launkey") -> "TemplateLoader":
+    if main_window.templateLoader is None:
+        from .template_cache import TemplateCache, getTemplateCachePath
+        from .template_loader import TemplateLoader
+        cache = TemplateCache(getTemplateCachePath())
+        cache.open()
+        loader = TemplateLoader(main_window, cache=cache)
+        loader.batchReady.connect(lambda batch: addTemplatesToLayout(main_window, batch))
+        loader.progress.connect(lambda done, total: showTemplateProgress(main_window, done, total))
+        loader.finished.connect(lambda errors: showTemplateErrors(main_window, errors))
+        loader.finished.connect(lambda _: loader.saveCache(loader.sourceHashes[name] for name in loadedTemplates if name in loader.sourceHashes))
+        main_window.templateLoader = loader
+    return main_window.templateLoader
+
+def showTemplateProgress(main_window: "Launkey", done: int, total: int):
+    progressBar = main_window.templateProgress
+    if progressBar is None:
+        progressBar = QProgressBar()
+        progressBar.setFormat("Loading templates %v/%m")
+        progressBar.setMaximumWidth(220)
+        main_window.ui.statusbar.addPermanentWidget(progressBar)
+        main_window.templateProgress = progressBar
+    progressBar.setRange(0, total)
+    progressBar.setValue(done)
+    progressBar.setVisible(done < total)
+
+def showTemplateErrors(main_window: "Launkey", errors: list[str]):
+    # One report for the whole import, it doesn't block the window
+    if not errors:
+        return
+    if main_window.templateErrorReport is not None:
+        main_window.templateErrorReport.close()
+    messagebox = QMessageBox(QMessageBox.Icon.Warning, "Template Load Errors", f"{len(errors)} problems found while loading templates.", parent=main_window)
+    messagebox.setDetailedText("\n".join(errors))
+    messagebox.setWindowModality(Qt.WindowModality.NonModal)
+    messagebox.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+    messagebox.destroyed.connect(lambda: setattr(main_window, "templateErrorReport", None))
+    messagebox.show()
+    main_window.templateErrorReport = messagebox
+
+def watchTemplateFolder(main_window: "Launkey"):
+    # Templates added or changed by other programs are imported without a restart
+    from .template_store import TemplateStorage, loadTemplateStorage
+    if loadTemplateStorage() == TemplateStorage.database:
+        return
+    from .template_watcher import TemplateFolderWatcher
+    main_window.templateWatcher = TemplateFolderWatcher(getTemplateFolderPath(), main_window)
+    main_window.templateWatcher.changed.connect(lambda fileNames: importTemplates(main_window, fileNames))
+
+def findTemplateDisplay(main_window: "Launkey", templateFileName: str) -> TemplateDisplay | None:
+    for item in main_window.ui.gridLayoutTemplates.items:
+        widget = item[0]
+        if isinstance(widget, TemplateDisplay) and widget.sourceFileName == templateFileName:
+            return widget
+    return None
+
+def removeTemplateDisplay(main_window: "Launkey", templateFileName: str):
+    widget = findTemplateDisplay(main_window, templateFileName)
+    if widget is not None:
+        main_window.ui.gridLayoutTemplates.removeWidget(widget)
+        widget.deleteLater()
+    loadedTemplates.pop(templateFileName, None)
+
+def addTemplatesToLayout(main_window: "Launkey", batch: list["ParsedTemplate"]):
+    layout = main_window.ui.gridLayoutTemplates
+    newDisplays: list[TemplateDisplay] = []
+    for result in batch:
+        if not result.templateData:
+            removeTemplateDisplay(main_window, result.fileName)
+            continue
+
+        templateDisplay = TemplateDisplay(main_window, result.templateData, main_window, fileName=result.fileName)
+        oldDisplay = findTemplateDisplay(main_window, result.fileName)
+        if oldDisplay is not None:
+            # A changed template replaces its display in place
+            layout.swapWidget(oldDisplay, templateDisplay)
+            oldDisplay.deleteLater()
+        elif checkForDuplicates(main_window, templateDisplay.text) or any(display.text == templateDisplay.text for display in newDisplays):
+            templateDisplay.deleteLater()
+            continue
+        else:
+            newDisplays.append(templateDisplay)
+        loadedTemplates[result.fileName] = result.templateData
+    layout.addWidgets(newDisplays)
 
 def checkForDuplicates(main_window: "Launkey", templateName: str) -> bool:
     layoutItems = main_window.ui.gridLayoutTemplates.items
@@ -115,32 +186,130 @@ def checkForDuplicates(main_window: "Launkey", templateName: str) -> bool:
             loadedDisplaysName.append(item.text)
     return any(name == templateName for name in loadedDisplaysName)
 
-async def buttonRun(main_window: "Launkey", lpWrapper: LaunchpadWrapper):
+async def buttonRun(main_window: "Launkey", lpWrapper: "LaunchpadWrapper"):
     if main_window.ui.buttonRun.text() == "Run":
+        try:
+            lpWrapper.start()
+        except ValueError as e:
+            QMessageBox.warning(main_window, "Run Error", f"Can't start: {e}")
+            return
         main_window.ui.startRun()
-        lpWrapper.start()
-        asyncio.create_task(listenForButtonPress(lpWrapper), name="listenForButtonPress")
+        main_window.ui.statusbar.addWidget(LatencyLabel(lpWrapper.latency))
+        listenForButtonPress(lpWrapper)
         return
     main_window.ui.stopRun()
-    # Stop the async loop and reset the launchpad
-    for task in asyncio.all_tasks():
-        if task.get_name() in ["listenForButtonPress"]:
-            task.cancel()
+    for label in main_window.ui.statusbar.findChildren(LatencyLabel):
+        # removeWidget only hides it, the status bar would keep the label and its timer alive
+        label.timer.stop()
+        main_window.ui.statusbar.removeWidget(label)
+        label.deleteLater()
+    # Stop the pipeline and reset the launchpad
+    if lpWrapper.pipeline is not None:
+        lpWrapper.pipeline.stop()
+        lpWrapper.pipeline = None
     lpWrapper.stop()
 
-async def listenForButtonPress(lpWrapper: LaunchpadWrapper) -> str:
-    while True:
-        event = lpWrapper.lp.ButtonStateXY()  # type: ignore
-        if event:
-            if event[2] == 1:  # Button pressed
-                asyncio.create_task(lpWrapper.buttonPressed((event[0], event[1]), lpWrapper.table.getTemplateItemAtButton((event[0], event[1]))), name="buttonClicked")
-            if event[2] == 0:  # Button released
-                asyncio.create_task(lpWrapper.buttonUnpressed((event[0], event[1])), name="buttonUnpressed")
-        await asyncio.sleep(0.01)
-        
-def launchpadLoadingFallback(main_window: "Launkey", lpWrapper: LaunchpadWrapper):
+def listenForButtonPress(lpWrapper: "LaunchpadWrapper"):
+    from .run_pipeline import RunPipeline
+    lpWrapper.pipeline = RunPipeline(lpWrapper)
+    lpWrapper.pipeline.start()
+
+def exportLatency(main_window: "Launkey", lpWrapper: "LaunchpadWrapper"):
+    fileName, selectedFilter = QFileDialog.getSaveFileName(
+        main_window, "Export latency", "launkey-latency.json", "JSON (*.json);;CSV (*.csv)"
+    )
+    if not fileName:
+        return
+    filePath = Path(fileName)
+    if not filePath.suffix:
+        filePath = filePath.with_suffix(".csv" if selectedFilter.startswith("CSV") else ".json")
+    try:
+        if filePath.suffix.lower() == ".csv":
+            lpWrapper.latency.exportCsv(filePath)
+        else:
+            lpWrapper.latency.exportJson(filePath)
+    except OSError as e:
+        QMessageBox.warning(main_window, "Export Error", f"Failed to export latency: {e}")
+
+def selectSessionLog(main_window: "Launkey", lpWrapper: "LaunchpadWrapper", checked: bool):
+    # Recording starts with the next Run, every Run overwrites the file
+    lpWrapper.sessionLogPath = None
+    if not checked:
+        return
+    fileName, _ = QFileDialog.getSaveFileName(main_window, "Record sessions to", "launkey-session.lksl", "Launkey session (*.lksl)")
+    if not fileName:
+        main_window.ui.actionRecordSession.setChecked(False)
+        return
+    lpWrapper.sessionLogPath = Path(fileName)
+
+async def replaySessionPopup(main_window: "Launkey"):
+    # Replays on a virtual launchpad with the layout saved in the log, Run can keep going
+    fileName, _ = QFileDialog.getOpenFileName(main_window, "Replay session", "", "Launkey session (*.lksl)")
+    if not fileName:
+        return
+    realTime = QMessageBox.question(
+        main_window, "Replay session", "Replay at the recorded speed? (No replays as fast as possible)"
+    ) == QMessageBox.StandardButton.Yes
+    from .session_log import diffSessions, readSessionFile
+    from .session_replay import replaySession
+    try:
+        sessionLog = readSessionFile(Path(fileName))
+        replayed = await replaySession(sessionLog, realTime=realTime)
+    except (OSError, ValueError) as e:
+        QMessageBox.warning(main_window, "Replay Error", f"Failed to replay session: {e}")
+        return
+    differences = diffSessions(sessionLog.records, replayed)
+    if differences:
+        QMessageBox.warning(main_window, "Replay", "Replay differs from the recording:\n" + "\n".join(differences))
+    else:
+        QMessageBox.information(main_window, "Replay", "Replay matches the recording.")
+
+def saveLayoutPopup(main_window: "Launkey"):
+    fileName, _ = QFileDialog.getSaveFileName(
+        main_window, "Save layout", str(getLayoutFolderPath() / "layout.json"), "Launkey layout (*.json)"
+    )
+    if not fileName:
+        return
+    filePath = Path(fileName)
+    try:
+        saveLayout(main_window.ui.tableLaunchpad, filePath)
+    except OSError as e:
+        QMessageBox.warning(main_window, "Save Error", f"Failed to save layout: {e}")
+        return
+    setLastLayoutPath(filePath)
+
+def loadLayoutPopup(main_window: "Launkey"):
+    if main_window.ui.buttonRun.text() == "Stop":
+        QMessageBox.warning(main_window, "Load Error", "Stop Run before loading a layout.")
+        return
+    fileName, _ = QFileDialog.getOpenFileName(main_window, "Load layout", str(getLayoutFolderPath()), "Launkey layout (*.json)")
+    if not fileName:
+        return
+    filePath = Path(fileName)
+    try:
+        loadLayout(filePath, layout=main_window.ui.tableLaunchpad)
+    except ValueError as e:
+        main_window.ui.tableLaunchpad.resetTemplates()
+        QMessageBox.warning(main_window, "Load Error", f"Failed to load layout: {e}")
+        return
+    setLastLayoutPath(filePath)
+
+def restoreLastLayout(main_window: "Launkey") -> bool:
+    lastLayout = getLastLayoutPath()
+    if lastLayout is None:
+        return False
+    try:
+        loadLayout(lastLayout, layout=main_window.ui.tableLaunchpad)
+    except ValueError as e:
+        main_window.ui.tableLaunchpad.resetTemplates()
+        QMessageBox.warning(main_window, "Load Error", f"Failed to load the last layout: {e}")
+        return False
+    return True
+
+def launchpadLoadingFallback(main_window: "Launkey", lpWrapper: "LaunchpadWrapper"):
     main_window.ui.statusbar.addWidget(QLabelInfo("Launchpad not found", colour="red"))
     shortcutDisplay = ShortcutDisplay(main_window)
+    from .launchpad_control import KeyboardTester
     keyboardTester = KeyboardTester(main_window, lpWrapper, shortcutDisplay)
     main_window.ui.buttonRun.clicked.connect(lambda: asyncio.ensure_future(keyboardTester.testModeRun()))
     main_window.ui.actionTestMode.triggered.connect(keyboardTester.checkTestMode)
@@ -166,6 +335,7 @@ def newTemplatePopup(main_window: "Launkey"):
     if template_type is None:
         return
 
+    from .ui_dialogtemplates import Ui_Dialog
     dialog = QDialogNoDefault(main_window)
     ui = Ui_Dialog()
     ui.setupUi(dialog, template_type)
@@ -174,7 +344,7 @@ def newTemplatePopup(main_window: "Launkey"):
     dialog.show()
 
     if dialog.exec() == QDialogNoDefault.DialogCode.Accepted:
-        importTemplates(main_window, ui.templateNameForOverwrite)
+        importTemplates(main_window, ui.changedFileNames)
 
 def selectTemplateTypePopup(main_window: "Launkey"):
     popup = QInputDialog(main_window)
@@ -199,6 +369,7 @@ def editTemplatePopup(main_window: "Launkey", templateDisplayName: str):
         error_dialog.showMessage(f"Template '{templateFileName}' not found.")
         return
     
+    from .ui_dialogtemplates import Ui_Dialog
     dialog = QDialogNoDefault(main_window)
     ui = Ui_Dialog()
     ui.loadTemplate(dialog, loadedTemplates[templateFileName])
@@ -206,9 +377,10 @@ def editTemplatePopup(main_window: "Launkey", templateDisplayName: str):
     dialog.show()
 
     if dialog.exec() == QDialogNoDefault.DialogCode.Accepted:
-        importTemplates(main_window, templateDisplayName)
+        importTemplates(main_window, [templateFileName] + ui.changedFileNames)
         
 def loadSettingsWindow(main_window: "Launkey"):
+    from .ui_settings import Ui_Settings
     dialog = QDialogNoDefault(main_window)
     ui = Ui_Settings()
     ui.setupUi(dialog)
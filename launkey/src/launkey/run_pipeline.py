@@ -0,0 +1,101 @@
+import asyncio
+import time
+
+from typing import TYPE_CHECKING, NamedTuple
+
+from .key_output import KeyAction
+from .launchpad_input import ButtonEvent, LaunchpadInputReader
+
+if TYPE_CHECKING:
+    from .launchpad_control import LaunchpadWrapper
+
+class PipelineStats(NamedTuple):
+    inputBackpressure: int  # Times the input reader waited for room in the mapping queue
+    mappingQueueDepth: int
+    mappingBatches: int
+    mappingEvents: int
+    averageMappingTime: float  # ns
+    maxMappingTime: int  # ns
+    keyBackpressure: int  # Times the mapping stage waited for room in the key output queue
+    keyQueueDepth: int
+
+class RunPipeline:
+    """Run mode as a chain of stages, input -> mapping -> LED / keyboard output.
+
+    Every stage has one long-lived consumer with a bounded queue in front of it:
+        input     LaunchpadInputReader thread, fills the mapping queue
+        mapping   one task, plan lookup, table and LED state, sends key batches on
+        LED       LedScheduler task, changes are coalesced into one pending frame
+        keyboard  KeyInjectionWorker thread
+    A full queue makes its producer wait, which is counted as backpressure, events are never dropped."""
+    def __init__(self, lpWrapper: "LaunchpadWrapper", /, queueSize: int = 256, idleWait: float = 0.0005):
+        self.lpWrapper = lpWrapper
+        self.idleWait = idleWait
+        self.mappingQueue: asyncio.Queue[ButtonEvent] = asyncio.Queue(queueSize)
+        self.reader = LaunchpadInputReader(lpWrapper.lp, asyncio.get_running_loop(), self.mappingQueue, idleWait=idleWait)
+        self.tasks: list[asyncio.Task] = []
+        self.mappingBatches = 0
+        self.mappingEvents = 0
+        self.totalMappingTime = 0
+        self.maxMappingTime = 0
+        self.keyBackpressure = 0
+
+    def start(self):
+        self.reader.start()
+        self.tasks = [
+            asyncio.create_task(self.mapEvents(), name="RunPipeline.mapping"),
+            asyncio.create_task(self.lpWrapper.ledScheduler.run(), name="RunPipeline.leds"),
+        ]
+
+    def stop(self):
+        # Held keys and the key output worker are released by LaunchpadWrapper.stop()
+        self.reader.stop()
+        for task in self.tasks:
+            task.cancel()
+        self.tasks = []
+        stats = self.getStats()
+        print(f"Run pipeline: {stats.mappingEvents} events in {stats.mappingBatches} batches, "
+              f"backpressure input {stats.inputBackpressure}, keyboard {stats.keyBackpressure}")
+
+    async def mapEvents(self):
+        queue = self.mappingQueue
+        latency = self.lpWrapper.latency
+        while True:
+            events = [await queue.get()]
+            while not queue.empty():  # Drain everything that arrived since the last tick
+                events.append(queue.get_nowait())
+            start = time.monotonic_ns()
+            inputLatency = latency["input"]
+            for event in events:
+                inputLatency.record(start - event.timestamp)
+            keyActions = self.lpWrapper.mapButtonEvents(events)
+            mappingTime = time.monotonic_ns() - start
+            latency["lookup"].record(mappingTime)
+            self.mappingBatches += 1
+            self.mappingEvents += len(events)
+            self.totalMappingTime += mappingTime
+            self.maxMappingTime = max(self.maxMappingTime, mappingTime)
+            await self.submitKeyActions(keyActions, events[0].timestamp)
+
+    async def submitKeyActions(self, keyActions: list[KeyAction], eventTime: int = 0):
+        keyOutput = self.lpWrapper.keyOutput
+        if keyOutput is None:
+            self.lpWrapper.submitKeyActions(keyActions)
+            return
+        while not keyOutput.trySubmit(keyActions, eventTime):
+            self.keyBackpressure += 1
+            await asyncio.sleep(self.idleWait)
+
+    def getStats(self) -> PipelineStats:
+        keyOutput = self.lpWrapper.keyOutput
+        average = self.totalMappingTime / self.mappingBatches if self.mappingBatches else 0.0
+        return PipelineStats(
+            self.reader.backpressure,
+            self.mappingQueue.qsize(),
+            self.mappingBatches,
+            self.mappingEvents,
+            average,
+            self.maxMappingTime,
+            self.keyBackpressure,
+            keyOutput.queueDepth if keyOutput is not None else 0,
+        )
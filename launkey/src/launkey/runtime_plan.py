@@ -0,0 +1,78 @@
+from typing import NamedTuple
+
+from .key_combos import KeyCombo, parseKeyCombo
+from .led_frame import FRAME_SIZE
+from .templates import Button, TemplateItem, ledsToVelocity
+
+PAD_SLOTS = FRAME_SIZE  # One slot per LED frame byte
+
+def padSlot(x: int, y: int) -> int:
+    """Slot of the launchpad button at (x, y), -1 for positions without a button"""
+    if not (0 <= x <= 8 and 0 <= y <= 8):
+        return -1
+    if y == 0:
+        return 72 + x if x < 8 else -1  # top row, the top-right corner has no button
+    if x == 8:
+        return 64 + y - 1  # right column
+    return (y - 1) * 8 + x
+
+def slotMessage(slot: int) -> tuple[int, int]:
+    """MIDI status and data byte that control the LED in the given slot"""
+    if slot >= 72:
+        return 176, 104 + slot - 72  # top row uses control change messages
+    if slot >= 64:
+        return 144, ((slot - 64) << 4) | 8
+    return 144, ((slot // 8) << 4) | (slot % 8)
+
+SLOT_MESSAGES: tuple[tuple[int, int], ...] = tuple(slotMessage(slot) for slot in range(PAD_SLOTS))
+
+# Indexed with y * 9 + x
+XY_TO_SLOT: tuple[int, ...] = tuple(padSlot(x, y) for y in range(9) for x in range(9))
+
+class PadAction(NamedTuple):
+    slot: int
+    x: int
+    y: int
+    tablePos: tuple[int, int]
+    item: Button
+    normalMessage: tuple[int, int, int]  # (status, data, velocity) ready for Midi.RawWrite
+    pushedMessage: tuple[int, int, int]
+    keyCombo: KeyCombo
+
+class RuntimePlan:
+    """Immutable lookup table used by Run mode, compiled once when Run starts"""
+    def __init__(self, actions: tuple[PadAction | None, ...]):
+        if len(actions) != PAD_SLOTS:
+            raise ValueError(f"Runtime plan needs {PAD_SLOTS} slots, got {len(actions)}")
+        self.actions = actions
+        self.normalVelocities = bytes(action.normalMessage[2] if action else 0 for action in actions)
+
+    def actionAt(self, x: int, y: int) -> PadAction | None:
+        slot = XY_TO_SLOT[y * 9 + x]
+        if slot < 0:
+            return None
+        return self.actions[slot]
+
+def compileRuntimePlan(loadedTemplates: dict[tuple[int, int], TemplateItem]) -> RuntimePlan:
+    actions: list[PadAction | None] = [None] * PAD_SLOTS
+    for tablePos, item in loadedTemplates.items():
+        x, y = tablePos[1], tablePos[0]  # table position is (row, col)
+        slot = padSlot(x, y)
+        if slot < 0:
+            raise ValueError(f"Table position {tablePos} has no launchpad button")
+        if isinstance(item, Button):
+            status, data = slotMessage(slot)
+            actions[slot] = PadAction(
+                slot,
+                x,
+                y,
+                tablePos,
+                item,
+                (status, data, ledsToVelocity(item.normalColor)),
+                (status, data, ledsToVelocity(item.pushedColor)),
+                parseKeyCombo(item.keyboardCombo),
+            )
+        else:
+            raise ValueError(f"Unknown TemplateItem type: {item}")
+            # TODO handle other TemplateItem types when added
+    return RuntimePlan(tuple(actions))
@@ -0,0 +1,185 @@
+import io
+import json
+import struct
+import threading
+import time
+
+from enum import IntEnum
+from pathlib import Path
+from typing import Any, BinaryIO, NamedTuple
+
+from .key_combos import formatKeyCombo
+from .key_output import KeyAction, KeyOutputBackend
+from .virtual_launchpad import VirtualMidi
+
+# File: header, the layout (version 2), then records of RECORD_HEAD followed by a payload that depends on the kind
+SESSION_MAGIC = b"LKSL"
+SESSION_VERSION = 2
+SESSION_VERSIONS = (1, 2)  # Version 1 logs have no layout
+SESSION_HEADER = struct.Struct("<4sBxxxQ")  # magic, version, time.time_ns() when recording started
+LAYOUT_HEADER = struct.Struct("<I")  # length of the UTF-8 layout JSON that follows, 0 without a layout
+RECORD_HEAD = struct.Struct("<BQ")  # kind, ns since the recording started
+MIDI_PAYLOAD = struct.Struct("<BBB")
+KEY_PAYLOAD = struct.Struct("<H")  # length of the UTF-8 combo text that follows
+
+class SessionRecordKind(IntEnum):
+    buttonIn = 0  # Raw MIDI message read from the launchpad
+    ledOut = 1  # Raw MIDI message written to the launchpad
+    keyPress = 2
+    keyRelease = 3
+
+class SessionRecord(NamedTuple):
+    kind: SessionRecordKind
+    time: int  # ns since the recording started
+    data: tuple[int, int, int] | str  # MIDI message or key combo text
+
+class SessionLog(NamedTuple):
+    layout: dict[str, Any] | None  # Layout file JSON of the recorded Run, see layouts.layoutToJson
+    records: list[SessionRecord]
+
+class SessionRecorder:
+    """Writes a session log, safe to use from the input, event loop and key output threads"""
+    def __init__(self, target: Path | BinaryIO | None = None, /, layout: dict[str, Any] | None = None):
+        # No target records into memory, see getvalue()
+        self._ownsFile = isinstance(target, Path)
+        self.file: BinaryIO = open(target, "wb") if isinstance(target, Path) else target or io.BytesIO()
+        self._lock = threading.Lock()
+        self.startTime = time.monotonic_ns()
+        self.records = 0
+        layoutText = json.dumps(layout).encode() if layout is not None else b""
+        self.file.write(SESSION_HEADER.pack(SESSION_MAGIC, SESSION_VERSION, time.time_ns()))
+        self.file.write(LAYOUT_HEADER.pack(len(layoutText)) + layoutText)
+
+    def recordMidi(self, kind: SessionRecordKind, message: tuple[int, int, int] | list[int]):
+        data = RECORD_HEAD.pack(kind, time.monotonic_ns() - self.startTime) + MIDI_PAYLOAD.pack(*message[:3])
+        with self._lock:
+            self.file.write(data)
+            self.records += 1
+
+    def recordKeys(self, keyActions: list[KeyAction]):
+        recordTime = time.monotonic_ns() - self.startTime
+        chunks: list[bytes] = []
+        for press, keyCombo in keyActions:
+            text = formatKeyCombo(keyCombo).encode()
+            kind = SessionRecordKind.keyPress if press else SessionRecordKind.keyRelease
+            chunks.append(RECORD_HEAD.pack(kind, recordTime) + KEY_PAYLOAD.pack(len(text)) + text)
+        with self._lock:
+            self.file.write(b"".join(chunks))
+            self.records += len(chunks)
+
+    def getvalue(self) -> bytes:
+        if not isinstance(self.file, io.BytesIO):
+            raise ValueError("Only in-memory recordings can be read back")
+        return self.file.getvalue()
+
+    def close(self):
+        with self._lock:
+            if self._ownsFile:
+                self.file.close()
+            else:
+                self.file.flush()
+
+class RecordingMidi:
+    """Wraps a launchpad_py Midi object and logs everything read from and written to the device"""
+    def __init__(self, midi: Any, recorder: SessionRecorder):
+        self.midi = midi
+        self.recorder = recorder
+
+    def RawWrite(self, status: int, data1: int, data2: int):
+        self.midi.RawWrite(status, data1, data2)
+        self.recorder.recordMidi(SessionRecordKind.ledOut, (status, data1, data2))
+
+    def ReadRaw(self):
+        messages = self.midi.ReadRaw()
+        for message in messages or ():
+            self.recorder.recordMidi(SessionRecordKind.buttonIn, message[0])
+        return messages
+
+    def __getattr__(self, name: str):
+        return getattr(self.midi, name)
+
+class RecordingKeyOutput:
+    """Key output backend that logs every batch after passing it on"""
+    def __init__(self, backend: KeyOutputBackend, recorder: SessionRecorder):
+        self.backend = backend
+        self.recorder = recorder
+        self.name = backend.name
+
+    def sendBatch(self, keyActions: list[KeyAction]):
+        self.backend.sendBatch(keyActions)
+        self.recorder.recordKeys(keyActions)
+
+    def close(self):
+        self.backend.close()
+
+def readSessionLog(source: Path | bytes) -> list[SessionRecord]:
+    return readSessionFile(source).records
+
+def readSessionFile(source: Path | bytes) -> SessionLog:
+    data = source.read_bytes() if isinstance(source, Path) else source
+    magic, version, _ = SESSION_HEADER.unpack_from(data)
+    if magic != SESSION_MAGIC:
+        raise ValueError("Not a Launkey session log")
+    if version not in SESSION_VERSIONS:
+        raise ValueError(f"Unsupported session log version {version}")
+    layout: dict[str, Any] | None = None
+    offset = SESSION_HEADER.size
+    if version >= 2:
+        (length,) = LAYOUT_HEADER.unpack_from(data, offset)
+        offset += LAYOUT_HEADER.size
+        if length:
+            try:
+                layout = json.loads(data[offset:offset + length])
+            except ValueError as e:
+                raise ValueError(f"Session log layout is invalid: {e}") from e
+        offset += length
+    records: list[SessionRecord] = []
+    while offset < len(data):
+        kind, recordTime = RECORD_HEAD.unpack_from(data, offset)
+        offset += RECORD_HEAD.size
+        kind = SessionRecordKind(kind)
+        if kind in (SessionRecordKind.buttonIn, SessionRecordKind.ledOut):
+            records.append(SessionRecord(kind, recordTime, MIDI_PAYLOAD.unpack_from(data, offset)))
+            offset += MIDI_PAYLOAD.size
+        else:
+            (length,) = KEY_PAYLOAD.unpack_from(data, offset)
+            offset += KEY_PAYLOAD.size
+            records.append(SessionRecord(kind, recordTime, data[offset:offset + length].decode()))
+            offset += length
+    return SessionLog(layout, records)
+
+def diffSessions(expected: list[SessionRecord], actual: list[SessionRecord], /, ledStream: bool = False) -> list[str]:
+    """Differences in key output and the final LED state, with `ledStream` every LED message is compared.
+
+    LED messages are coalesced by the refresh rate, so the exact stream only matches for real speed replays."""
+    differences: list[str] = []
+    keyKinds = (SessionRecordKind.keyPress, SessionRecordKind.keyRelease)
+    expectedKeys = [(record.kind.name, record.data) for record in expected if record.kind in keyKinds]
+    actualKeys = [(record.kind.name, record.data) for record in actual if record.kind in keyKinds]
+    differences += _diffStreams("key", expectedKeys, actualKeys)
+
+    expectedLeds = [record.data for record in expected if record.kind == SessionRecordKind.ledOut]
+    actualLeds = [record.data for record in actual if record.kind == SessionRecordKind.ledOut]
+    if ledStream:
+        differences += _diffStreams("LED", expectedLeds, actualLeds)
+    # The final state is taken before the reset sent when Run stops
+    expectedState, actualState = VirtualMidi(), VirtualMidi()
+    for midi, messages in ((expectedState, expectedLeds), (actualState, actualLeds)):
+        for message in _withoutFinalReset(messages):
+            midi.RawWrite(*message)
+    for slot in expectedState.leds.changedSlots(actualState.leds):
+        differences.append(f"LED slot {slot}: expected {expectedState.leds[slot]}, got {actualState.leds[slot]}")
+    return differences
+
+def _diffStreams(name: str, expected: list, actual: list) -> list[str]:
+    for index, (expectedItem, actualItem) in enumerate(zip(expected, actual)):
+        if expectedItem != actualItem:
+            return [f"First {name} difference at #{index}: expected {expectedItem}, got {actualItem}"]
+    if len(expected) != len(actual):
+        return [f"{name} count differs: expected {len(expected)}, got {len(actual)}"]
+    return []
+
+def _withoutFinalReset(messages: list) -> list:
+    if messages and tuple(messages[-1]) == (176, 0, 0):
+        return messages[:-1]
+    return messages
@@ -0,0 +1,59 @@
+import asyncio
+
+from .key_output import CapturingKeyOutput
+from .launchpad_control import LaunchpadWrapper
+from .layouts import LayoutState, restoreRuntime
+from .run_pipeline import RunPipeline
+from .session_log import SessionLog, SessionRecord, SessionRecorder, SessionRecordKind, readSessionLog
+from .virtual_launchpad import VirtualLaunchpad
+
+def sessionLayout(sessionLog: SessionLog) -> LayoutState:
+    """The layout the session was recorded with, in a new LayoutState"""
+    layoutJson = sessionLog.layout
+    if not isinstance(layoutJson, dict) or not isinstance(layoutJson.get("runtime"), list):
+        raise ValueError("Session log has no layout, it was recorded by an older version")
+    layout = LayoutState()
+    restoreRuntime(layout, layoutJson["runtime"])
+    return layout
+
+async def replaySession(sessionLog: SessionLog, /, realTime: bool = True) -> list[SessionRecord]:
+    """Feeds the recorded button input through the Run path on a virtual launchpad and returns
+    what that run recorded. Keys are captured, not injected. The layout comes from the log,
+    so the table in the GUI is neither used nor changed.
+
+    With realTime the recorded gaps between buttons are kept, otherwise everything is due at once."""
+    lp = VirtualLaunchpad()
+    lpWrapper = LaunchpadWrapper(sessionLayout(sessionLog), device=lp)
+    recorder = SessionRecorder()
+    lpWrapper.recorder = recorder
+    lpWrapper.keyOutputBackend = CapturingKeyOutput()
+    lpWrapper.start()
+    pipeline = RunPipeline(lpWrapper)
+    pipeline.start()
+    try:
+        buttons = [record for record in sessionLog.records if record.kind == SessionRecordKind.buttonIn]
+        firstTime = buttons[0].time if buttons else 0
+        lp.midi.feedMessages(((record.time - firstTime) if realTime else 0, record.data) for record in buttons)  # type: ignore[misc]
+        await waitUntilIdle(lpWrapper, pipeline)
+    finally:
+        pipeline.stop()
+        lpWrapper.stop()
+    return readSessionLog(recorder.getvalue())
+
+async def waitUntilIdle(lpWrapper: LaunchpadWrapper, pipeline: RunPipeline):
+    """Waits until every queued button went through mapping, key output and the LED scheduler"""
+    settle = lpWrapper.ledScheduler.interval * 2
+    while True:
+        while isBusy(lpWrapper, pipeline):
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(settle)
+        if not isBusy(lpWrapper, pipeline):
+            return
+
+def isBusy(lpWrapper: LaunchpadWrapper, pipeline: RunPipeline) -> bool:
+    keyOutput = lpWrapper.keyOutput
+    return bool(
+        lpWrapper.lp.midi.pendingInput
+        or not pipeline.mappingQueue.empty()
+        or (keyOutput is not None and keyOutput.queueDepth)
+    )
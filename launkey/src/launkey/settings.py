@@ -167,8 +167,9 @@ class AutoFormLayout(QFormLayout):
             raise NotImplementedError(f"Unsupported property type: {setting.itemType}")
         
     def setChangedSetting(self, settingLoc: str, item: Any):
-        if item in [AppTheme.magic.value, AppTheme.default.value]: # REMOVE after theme update
-            self.changedSettings[settingLoc] = item
+        if settingLoc == "Appearance/Theme" and item not in [AppTheme.magic.value, AppTheme.default.value]: # REMOVE after theme update
+            return
+        self.changedSettings[settingLoc] = item
         
     def addRow(self, setting: Setting, groupName: str):
         super().addRow(CustomQLabel(setting.name + ": "), self.getWidgetForType(setting, groupName))
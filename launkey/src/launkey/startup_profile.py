@@ -0,0 +1,126 @@
+"""
+Startup profiler: python -m launkey --profile-startup
+
+Starts the GUI in a child process with -X importtime, stops it at the first paint of the
+main window and prints the time to first paint with an import-time breakdown.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from collections import defaultdict
+from pathlib import Path
+from typing import NamedTuple
+
+FIRST_PAINT_MARKER = "launkey: first paint"
+PROBE_TIMEOUT = 30.0  # s
+PROBE_ARGS = ["-X", "importtime", "-m", "launkey", "--startup-probe"]
+
+class ImportTime(NamedTuple):
+    name: str
+    selfTime: int  # µs
+    cumulative: int  # µs
+
+class StartupProfile(NamedTuple):
+    firstPaint: float  # ms from starting the process to the first paint
+    imports: list[ImportTime]
+
+    @property
+    def importTime(self) -> float:
+        # ms, sum of the self times of every module
+        return sum(module.selfTime for module in self.imports) / 1000
+
+    @property
+    def modules(self) -> set[str]:
+        return {module.name for module in self.imports}
+
+def probeFirstPaint() -> int:
+    """Child side, the start of app.main() without the root check, quits after the first paint"""
+    from PySide6.QtWidgets import QApplication
+    from .app import Launkey, checkForLinux, loadAppIcon
+    from .theme_loader import loadTheme
+    from .updateinfo import OS
+
+    app = QApplication(sys.argv[:1])
+    main_window = Launkey(True, OS.linux if checkForLinux() else OS.windows)
+    loadAppIcon(main_window)
+    loadTheme(main_window)
+
+    def onPainted():
+        print(FIRST_PAINT_MARKER, flush=True)
+        app.quit()
+
+    main_window.firstPaint.painted.connect(onPainted)
+    main_window.show()
+    return app.exec()
+
+def parseImportTimes(stderr: str) -> list[ImportTime]:
+    imports: list[ImportTime] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        selfTime, cumulative, name = line[len("import time:"):].split("|")
+        imports.append(ImportTime(name.strip(), int(selfTime), int(cumulative)))
+    return imports
+
+def measureStartup(env: dict[str, str] | None = None) -> StartupProfile:
+    """Cold start of a new interpreter up to the first paint, the child is stopped right after"""
+    env = dict(os.environ if env is None else env)
+    packageRoot = str(Path(__file__).resolve().parents[1])
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [packageRoot, env.get("PYTHONPATH")]))
+    firstPaint = None
+    # -X importtime writes far more than a pipe holds, stderr goes to a file so the child never blocks on it
+    with tempfile.TemporaryFile("w+") as stderrFile:
+        startTime = time.perf_counter()
+        child = subprocess.Popen([sys.executable, *PROBE_ARGS], stdout=subprocess.PIPE, stderr=stderrFile, text=True, env=env)
+        # A child that hangs is killed at the deadline, which ends the marker loop and communicate()
+        watchdog = threading.Timer(PROBE_TIMEOUT, child.kill)
+        watchdog.start()
+        try:
+            assert child.stdout is not None
+            for line in child.stdout:
+                if line.strip() == FIRST_PAINT_MARKER:
+                    firstPaint = (time.perf_counter() - startTime) * 1000
+                    break
+            child.communicate()
+        finally:
+            watchdog.cancel()
+            if child.poll() is None:
+                child.kill()
+                child.wait()
+        stderrFile.seek(0)
+        stderr = stderrFile.read()
+    if firstPaint is None:
+        if time.perf_counter() - startTime >= PROBE_TIMEOUT:
+            raise RuntimeError(f"Startup probe did not paint the window within {PROBE_TIMEOUT:.0f} s")
+        raise RuntimeError(f"Startup probe exited without painting the window:\n{stderr[-2000:]}")
+    return StartupProfile(firstPaint, parseImportTimes(stderr))
+
+def printProfile(profile: StartupProfile, /, top: int = 15):
+    print(f"Cold start to first paint: {profile.firstPaint:.0f} ms, imports {profile.importTime:.0f} ms ({len(profile.imports)} modules)")
+
+    packages: dict[str, int] = defaultdict(int)
+    for module in profile.imports:
+        packages[module.name.split(".")[0]] += module.selfTime
+    print("\nImport time by package (self):")
+    for name, selfTime in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {name:32} {selfTime / 1000:8.1f} ms")
+
+    print("\nLaunkey modules (cumulative, includes what they import):")
+    for module in sorted(profile.imports, key=lambda module: -module.cumulative):
+        if module.name.startswith("launkey"):
+            print(f"  {module.name:32} {module.cumulative / 1000:8.1f} ms")
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="launkey --profile-startup", description="Import-time breakdown of the GUI startup")
+    parser.add_argument("--runs", type=int, default=3, help="cold starts to measure, the fastest one is shown")
+    parser.add_argument("--top", type=int, default=15, help="packages to list")
+    args = parser.parse_args(argv)
+
+    profiles = [measureStartup() for _ in range(args.runs)]
+    printProfile(min(profiles, key=lambda profile: profile.firstPaint), top=args.top)
+    return 0
@@ -0,0 +1,187 @@
+"""
+Compiled cache of validated templates, so unchanged template files skip JSON decoding.
+
+File layout (little endian):
+  header   magic "LKTC", format version (u16), entry count (u32)
+  entries  source hash (16 bytes, blake2b of the JSON file), offset (u32), length (u32)
+  records  item and error count (u16), string block length (u32), fixed size items,
+           string lengths (u16), every string of the record as one UTF-8 block
+"""
+import mmap
+import os
+import struct
+import threading
+
+from pathlib import Path
+from typing import Iterable
+
+from PySide6.QtCore import QStandardPaths
+
+from .templates import LED, Button, Template, TemplateItem
+
+CACHE_MAGIC = b"LKTC"
+CACHE_VERSION = 1  # Bump when the record format or the validation changes
+
+HEADER = struct.Struct("<4sHI")
+ENTRY = struct.Struct("<16sII")
+RECORD = struct.Struct("<HHI")  # Items, errors, characters of the string block
+ITEM = struct.Struct("<BbbBB")  # Type, location, normal and pushed color (red | green << 2)
+
+ITEM_TEMPLATE = 0
+ITEM_BUTTON = 1
+
+LEDS = tuple(LED)  # LED(value) is a slow call, indexing isn't
+TEMPLATE_TYPES = tuple(Template.Type)
+
+def getTemplateCachePath() -> Path:
+    pathOnSystem = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+    return Path(pathOnSystem) / "Launkey_Cache" / "templates.bin"
+
+def packTemplate(templateData: list[Template | TemplateItem], errors: list[str]) -> bytes:
+    items: list[bytes] = []
+    strings: list[str] = []
+    for item in templateData:
+        if isinstance(item, Template):
+            items.append(ITEM.pack(ITEM_TEMPLATE, TEMPLATE_TYPES.index(item.type), 0, 0, 0))
+            strings.append(item.name)
+        elif isinstance(item, Button):
+            items.append(ITEM.pack(
+                ITEM_BUTTON, item.location[0], item.location[1],
+                item.normalColor[0].value | item.normalColor[1].value << 2,
+                item.pushedColor[0].value | item.pushedColor[1].value << 2,
+            ))
+            strings += [item.name, item.buttonID, item.keyboardCombo]
+        else:
+            raise ValueError(f"Can't cache {type(item).__name__}")
+    strings += errors
+    if any(len(string) > 0xFFFF for string in strings):
+        raise ValueError("String too long to cache")
+    block = "".join(strings)
+    return b"".join([
+        RECORD.pack(len(templateData), len(errors), len(block)),
+        *items,
+        struct.pack(f"<{len(strings)}H", *map(len, strings)),
+        block.encode("utf-8"),
+    ])
+
+def unpackTemplate(data: memoryview) -> tuple[list[Template | TemplateItem], list[str]]:
+    """Strings are stored as one UTF-8 block with their lengths in characters, so a record is decoded once"""
+    itemCount, errorCount, _ = RECORD.unpack_from(data, 0)
+    offset = RECORD.size + itemCount * ITEM.size
+    items = list(ITEM.iter_unpack(data[RECORD.size:offset]))
+    stringCount = sum(3 if item[0] == ITEM_BUTTON else 1 for item in items) + errorCount
+    lengths = struct.unpack_from(f"<{stringCount}H", data, offset)
+    block = str(data[offset + 2 * stringCount:], "utf-8")
+
+    strings: list[str] = []
+    start = 0
+    for length in lengths:
+        strings.append(block[start:start + length])
+        start += length
+
+    templateData: list[Template | TemplateItem] = []
+    nextString = iter(strings).__next__
+    for itemType, first, second, normal, pushed in items:
+        if itemType == ITEM_BUTTON:
+            templateData.append(Button(
+                nextString(), nextString(), (first, second),
+                normalColor=(LEDS[normal & 3], LEDS[normal >> 2]),
+                pushedColor=(LEDS[pushed & 3], LEDS[pushed >> 2]),
+                keyboardCombo=nextString(),
+            ))
+        elif itemType == ITEM_TEMPLATE:
+            templateData.append(Template(nextString(), TEMPLATE_TYPES[first]))
+        else:
+            raise ValueError(f"Unknown cached item type {itemType}")
+    return templateData, strings[len(strings) - errorCount:]
+
+class TemplateCache:
+    """Validated templates keyed by the hash of their source file.
+
+    The cache file is memory-mapped by open() and records are only decoded when asked for.
+    Templates parsed from JSON are added with put() (from any thread) and written by save()."""
+    def __init__(self, path: Path):
+        self.path = path
+        self.mapped: mmap.mmap | None = None
+        self.entries: dict[bytes, tuple[int, int]] = {}
+        self.added: dict[bytes, bytes] = {}
+        self.lock = threading.Lock()
+
+    def open(self):
+        self.close()
+        try:
+            with open(self.path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return  # No cache yet, or an empty file
+        try:
+            magic, version, entryCount = HEADER.unpack_from(mapped, 0)
+            if magic != CACHE_MAGIC or version != CACHE_VERSION:
+                raise ValueError(f"format version {version}")
+            table = memoryview(mapped)[HEADER.size:HEADER.size + entryCount * ENTRY.size]
+            self.entries = {sourceHash: (offset, length) for sourceHash, offset, length in ENTRY.iter_unpack(table)}
+            table.release()
+        except (struct.error, ValueError) as e:
+            print(f"WARN: Ignoring template cache {self.path.name}: {e}")
+            mapped.close()
+            self.entries = {}
+            return
+        self.mapped = mapped
+
+    def close(self):
+        if self.mapped is not None:
+            self.mapped.close()
+            self.mapped = None
+        self.entries = {}
+
+    def get(self, sourceHash: str) -> tuple[list[Template | TemplateItem], list[str]] | None:
+        key = bytes.fromhex(sourceHash)
+        with self.lock:
+            record = self.added.get(key)
+            if record is None and self.mapped is not None and key in self.entries:
+                offset, length = self.entries[key]
+                record = self.mapped[offset:offset + length]
+        if record is None:
+            return None
+        try:
+            return unpackTemplate(memoryview(record))
+        except (struct.error, ValueError, IndexError, StopIteration):
+            return None  # Damaged record, parsed from JSON again
+
+    def put(self, sourceHash: str, templateData: list[Template | TemplateItem], errors: list[str]):
+        record = packTemplate(templateData, errors)
+        with self.lock:
+            self.added[bytes.fromhex(sourceHash)] = record
+
+    def save(self, sourceHashes: Iterable[str]):
+        """Writes the records of the given hashes, everything else is dropped. The file is replaced atomically."""
+        keep = {bytes.fromhex(sourceHash) for sourceHash in sourceHashes}
+        with self.lock:
+            if not self.added and keep.issuperset(self.entries):
+                return
+            records: dict[bytes, bytes] = {}
+            for key in keep:
+                if key in self.added:
+                    records[key] = self.added[key]
+                elif self.mapped is not None and key in self.entries:
+                    offset, length = self.entries[key]
+                    records[key] = self.mapped[offset:offset + length]
+            self.added.clear()
+
+            offset = HEADER.size + len(records) * ENTRY.size
+            table = []
+            for key, record in records.items():
+                table.append(ENTRY.pack(key, offset, len(record)))
+                offset += len(record)
+            self.close()  # Windows can't replace a mapped file
+            tmpPath = self.path.with_name(self.path.name + ".tmp")
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmpPath, "wb") as f:
+                    f.write(HEADER.pack(CACHE_MAGIC, CACHE_VERSION, len(records)))
+                    f.writelines(table)
+                    f.writelines(records.values())
+                os.replace(tmpPath, self.path)
+            except OSError as e:
+                print(f"WARN: Failed to write template cache: {e}")
+            self.open()
@@ -0,0 +1,71 @@
+import hashlib
+
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+class TemplateFileState(NamedTuple):
+    size: int
+    mtime: int  # st_mtime_ns
+    hash: str  # blake2b of the content
+
+class TemplateChanges(NamedTuple):
+    added: list[str]
+    changed: list[str]
+    removed: list[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+def hashBytes(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def hashFile(filePath: Path) -> str:
+    return hashBytes(filePath.read_bytes())
+
+class TemplateIndex:
+    """Size, mtime and content hash of every template file seen by the last import.
+
+    A file is only read again when its size or mtime changed, and only reported as changed
+    when its content did."""
+    def __init__(self):
+        self.files: dict[str, TemplateFileState] = {}
+
+    def scan(self, folder: Path, /, fileNames: Iterable[str] | None = None) -> TemplateChanges:
+        """Compares the folder with the index and updates it. With `fileNames` only those files
+        are checked, e.g. the one the editor saved, otherwise every .json file in the folder."""
+        if fileNames is None:
+            present = {entry.name: entry for entry in folder.iterdir() if entry.suffix == ".json" and entry.is_file()}
+            checked: Iterable[str] = set(present) | set(self.files)
+        else:
+            present = {name: folder / name for name in fileNames if (folder / name).is_file()}
+            checked = fileNames
+
+        changes = TemplateChanges([], [], [])
+        for fileName in sorted(set(checked)):
+            known = self.files.get(fileName)
+            filePath = present.get(fileName)
+            if filePath is None:
+                if known is not None:
+                    del self.files[fileName]
+                    changes.removed.append(fileName)
+                continue
+            try:
+                stat = filePath.stat()
+                if known is not None and (known.size, known.mtime) == (stat.st_size, stat.st_mtime_ns):
+                    continue
+                state = TemplateFileState(stat.st_size, stat.st_mtime_ns, hashFile(filePath))
+            except OSError:
+                continue  # Removed or unreadable right now, the next scan picks it up
+            self.files[fileName] = state
+            if known is None:
+                changes.added.append(fileName)
+            elif known.hash != state.hash:
+                changes.changed.append(fileName)
+        return changes
+
+    def forget(self, fileName: str):
+        # The next scan reports the file as added again
+        self.files.pop(fileName, None)
+
+# Index of the templates folder, used by mainwindow.importTemplates
+templateIndex = TemplateIndex()
@@ -0,0 +1,168 @@
+import json
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Iterable, NamedTuple
+
+from PySide6.QtCore import QObject, Signal, Slot
+
+from .template_cache import TemplateCache
+from .template_index import hashBytes
+from .templates import Template, TemplateItem, objectFromJson, checkTemplate
+
+BATCH_SIZE = 16  # Files parsed by one task and handed to the GUI thread together
+MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+class ParsedTemplate(NamedTuple):
+    fileName: str
+    templateData: list[Template | TemplateItem]  # Empty when the file can't be used
+    errors: list[str]
+    sourceHash: str | None = None  # Hash of the JSON the template came from, the cache key
+
+def parseTemplate(filePath: Path) -> ParsedTemplate:
+    """Template file without the GUI, every problem is returned instead of shown.
+    Objects that fail to parse are skipped like the editor does."""
+    try:
+        data = filePath.read_bytes()
+    except OSError as e:
+        return ParsedTemplate(filePath.name, [], [f"{filePath.name}: failed to load template file: {e}"])
+    return parseTemplateData(filePath.name, data)
+
+def parseTemplateData(fileName: str, data: bytes) -> ParsedTemplate:
+    errors: list[str] = []
+    try:
+        templateJsonData: list[dict[str, Any]] = json.loads(data)
+    except Exception as e:
+        return ParsedTemplate(fileName, [], [f"{fileName}: failed to load template file: {e}"])
+
+    templateData: list[Template | TemplateItem] = []
+    for obj in templateJsonData:
+        try:
+            template = objectFromJson(obj)
+        except (ValueError, KeyError, TypeError) as e:
+            errors.append(f"{fileName}: error parsing template data: {e}")
+            continue
+        if template:
+            templateData.append(template)
+
+    try:
+        valid = checkTemplate(templateData)
+    except ValueError as e:
+        valid = False
+        errors.append(f"{fileName}: {e}")
+    if not valid:
+        if not errors:
+            errors.append(f"{fileName}: template file is invalid or contains no Template object.")
+        return ParsedTemplate(fileName, [], errors)
+
+    from .key_combos import validateKeyCombos
+    errors += [f"{fileName}: invalid keyboard combo, {error}" for error in validateKeyCombos(templateData)]
+    return ParsedTemplate(fileName, templateData, errors)
+
+class TemplateLoader(QObject):
+    """Parses template files in a thread pool.
+
+    Results come back to the GUI thread in batches through `batchReady`. Loads started while
+    another one runs are counted in the same `progress` and reported in the same `finished`."""
+    batchReady = Signal(list)  # list[ParsedTemplate]
+    progress = Signal(int, int)  # Parsed files, files to parse
+    finished = Signal(list)  # Errors of every file, list[str]
+    parsed = Signal(list)  # Emitted from the workers, list[tuple[int, ParsedTemplate]]
+
+    def __init__(self, parent: QObject | None = None, /, workers: int = MAX_WORKERS, cache: TemplateCache | None = None):
+        super().__init__(parent)
+        self.cache = cache
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="template-loader")
+        self.loadIds: dict[str, int] = {}  # Newest load of every file, older results are dropped
+        self.lastLoadId = 0
+        self.total = 0
+        self.done = 0
+        self.errors: list[str] = []
+        self.sourceHashes: dict[str, str] = {}  # Latest source hash of every file loaded
+        self.parsed.connect(self.onParsed)
+
+    def load(self, folder: Path, fileNames: list[str], sourceHashes: dict[str, str] | None = None):
+        """With the source hashes from the template index, templates found in the cache aren't read"""
+        sourceHashes = sourceHashes or {}
+        self.submit([(fileName, partial(self.loadTemplate, folder, fileName, sourceHashes.get(fileName))) for fileName in fileNames])
+
+    def loadData(self, templates: list[tuple[str, bytes]]):
+        """Template JSON that was already read, e.g. the rows of the template store"""
+        self.submit([(fileName, partial(self.loadTemplateData, fileName, data)) for fileName, data in templates])
+
+    def submit(self, jobs: list[tuple[str, Callable[[], ParsedTemplate]]]):
+        if not jobs:
+            return
+        self.lastLoadId += 1
+        for fileName, _ in jobs:
+            self.loadIds[fileName] = self.lastLoadId
+        self.total += len(jobs)
+        self.progress.emit(self.done, self.total)
+        for start in range(0, len(jobs), BATCH_SIZE):
+            self.pool.submit(self.parseBatch, self.lastLoadId, jobs[start:start + BATCH_SIZE])
+
+    def parseBatch(self, loadId: int, jobs: list[tuple[str, Callable[[], ParsedTemplate]]]):
+        # Runs in a worker thread, nothing here touches widgets
+        results = []
+        for fileName, job in jobs:
+            try:
+                result = job()
+            except Exception as e:
+                result = ParsedTemplate(fileName, [], [f"{fileName}: {e}"])
+            results.append((loadId, result))
+        self.parsed.emit(results)
+
+    def loadTemplate(self, folder: Path, fileName: str, sourceHash: str | None) -> ParsedTemplate:
+        if self.cache is not None and sourceHash:
+            cached = self.cache.get(sourceHash)
+            if cached is not None:
+                return ParsedTemplate(fileName, *cached, sourceHash)
+        try:
+            data = (folder / fileName).read_bytes()
+        except OSError as e:
+            return ParsedTemplate(fileName, [], [f"{fileName}: failed to load template file: {e}"])
+        return self.loadTemplateData(fileName, data)
+
+    def loadTemplateData(self, fileName: str, data: bytes) -> ParsedTemplate:
+        sourceHash = hashBytes(data)
+        if self.cache is not None:
+            cached = self.cache.get(sourceHash)
+            if cached is not None:
+                return ParsedTemplate(fileName, *cached, sourceHash)
+        result = parseTemplateData(fileName, data)._replace(sourceHash=sourceHash)
+        if self.cache is not None and result.templateData:
+            try:
+                self.cache.put(sourceHash, result.templateData, result.errors)
+            except ValueError as e:
+                print(f"WARN: {fileName} not cached: {e}")
+        return result
+
+    @Slot(list)
+    def onParsed(self, results: list[tuple[int, ParsedTemplate]]):
+        self.done += len(results)
+        batch = [result for loadId, result in results if self.loadIds.get(result.fileName) == loadId]
+        for result in batch:
+            del self.loadIds[result.fileName]
+            self.errors += result.errors
+            if result.sourceHash is not None:
+                self.sourceHashes[result.fileName] = result.sourceHash
+        if batch:
+            self.batchReady.emit(batch)
+        self.progress.emit(self.done, self.total)
+        if self.done == self.total:
+            errors = self.errors
+            self.total = self.done = 0
+            self.errors = []
+            self.finished.emit(errors)
+
+    def isLoading(self) -> bool:
+        return self.total > 0
+
+    def saveCache(self, sourceHashes: Iterable[str]):
+        if self.cache is not None and not self.isLoading():
+            self.cache.save(sourceHashes)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -4,9 +4,9 @@ from typing import Any
 import regex as re
 from PySide6.QtWidgets import QWidget, QSizePolicy, QTreeWidget, QTreeWidgetItem, QComboBox, QLineEdit
 from PySide6.QtCore import Qt, QRegularExpression
-from PySide6.QtGui import QPixmap, QColor, QIcon, QFocusEvent, QRegularExpressionValidator
+from PySide6.QtGui import QPixmap, QIcon, QFocusEvent, QRegularExpressionValidator
 
-from .templates import Template, LED, TemplateItem, LEDColorCodes
+from .templates import Template, LED, TemplateItem, LEDColorCodes, ledsToQColor
 
 if TYPE_CHECKING:
     from .custom_layouts import TemplateGridLayout
@@ -124,9 +124,9 @@ class ButtonColorSelector(QComboBox):
         self.setIconSize(QPixmap(20, 20).size())
         self.setFixedWidth(50)
 
-        for value, color in LEDColorCodes:
+        for value, _ in LEDColorCodes:
             pixmap = QPixmap(20, 20)
-            pixmap.fill(QColor(color))
+            pixmap.fill(ledsToQColor((value[0], value[1])))
             icon = QIcon(pixmap)
             self.addItem(icon, "", value)
         index = self.findData(list(currentValue))
@@ -0,0 +1,206 @@
+"""
+Optional SQLite template store: python -m launkey templates {list,search,import,export}
+
+One row per template, indexed by name, type and footprint. Saves are transactions in WAL mode,
+so a crash never leaves a half written template behind.
+"""
+import argparse
+import json
+import sqlite3
+import time
+
+from enum import Enum, unique
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+from PySide6.QtCore import QSettings, QStandardPaths
+
+from .template_loader import ParsedTemplate, parseTemplate, parseTemplateData
+from .templates import Template, TemplateItem, getTemplateFolderPath, writeTemplateFile
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS templates (
+    fileName TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    cols INTEGER NOT NULL,
+    buttons INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS templatesName ON templates (name);
+CREATE INDEX IF NOT EXISTS templatesType ON templates (type);
+CREATE INDEX IF NOT EXISTS templatesFootprint ON templates (rows, cols);
+"""
+
+@unique
+class TemplateStorage(Enum):
+    folder = 0
+    database = 1
+
+def loadTemplateStorage() -> TemplateStorage:
+    settingLoader = QSettings("Ja-Tar", "Launkey")
+    return TemplateStorage(settingLoader.value("Templates/Storage", TemplateStorage.folder.value, int))
+
+def getTemplateStorePath() -> Path:
+    pathOnSystem = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+    fullPath = Path(pathOnSystem)
+    fullPath.mkdir(parents=True, exist_ok=True)
+    return fullPath / "Launkey_Templates.sqlite3"
+
+class TemplateSummary(NamedTuple):
+    fileName: str
+    name: str
+    type: str
+    rows: int  # Footprint, rows and columns the items span
+    cols: int
+    buttons: int
+
+def summarizeTemplate(fileName: str, templateData: list[Template | TemplateItem]) -> TemplateSummary:
+    template = next((item for item in templateData if isinstance(item, Template)), None)
+    if template is None:
+        raise ValueError(f"{fileName} contains no Template object")
+    items = [item for item in templateData if isinstance(item, TemplateItem)]
+    rows = max((item.location[0] + 1 for item in items), default=0)
+    cols = max((item.location[1] + 1 for item in items), default=0)
+    return TemplateSummary(fileName, template.name, template.type.name, rows, cols, len(items))
+
+class TemplateStore:
+    """Templates in one SQLite database, the JSON of a template file is kept as it is in `data`"""
+    def __init__(self, path: Path | str):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints, never corrupt
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def isEmpty(self) -> bool:
+        return self.connection.execute("SELECT 1 FROM templates LIMIT 1").fetchone() is None
+
+    def hasTemplate(self, fileName: str) -> bool:
+        return self.connection.execute("SELECT 1 FROM templates WHERE fileName = ?", (fileName,)).fetchone() is not None
+
+    def saveTemplate(self, fileName: str, templateData: list[Template | TemplateItem]):
+        self.saveTemplates([(fileName, templateData)])
+
+    def saveTemplates(self, templates: Iterable[tuple[str, list[Template | TemplateItem]]]):
+        """All templates are written in one transaction, either all of them are saved or none"""
+        now = time.time()
+        rows = []
+        for fileName, templateData in templates:
+            summary = summarizeTemplate(fileName, templateData)
+            rows.append((*summary, json.dumps([item.toDict() for item in templateData]), now))  # type: ignore
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO templates (fileName, name, type, rows, cols, buttons, data, updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def deleteTemplate(self, fileName: str) -> bool:
+        with self.connection:
+            return self.connection.execute("DELETE FROM templates WHERE fileName = ?", (fileName,)).rowcount > 0
+
+    def listTemplates(self) -> list[TemplateSummary]:
+        return self.searchTemplates()
+
+    def searchTemplates(self, /, name: str | None = None, templateType: str | None = None, maxRows: int | None = None, maxCols: int | None = None) -> list[TemplateSummary]:
+        """Templates whose name contains `name` and that fit in maxRows x maxCols"""
+        conditions: list[str] = []
+        parameters: list[object] = []
+        if name:
+            conditions.append("name LIKE ? ESCAPE '\\'")
+            parameters.append("%" + name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        if templateType:
+            conditions.append("type = ?")
+            parameters.append(templateType)
+        if maxRows is not None:
+            conditions.append("rows <= ?")
+            parameters.append(maxRows)
+        if maxCols is not None:
+            conditions.append("cols <= ?")
+            parameters.append(maxCols)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = f"SELECT fileName, name, type, rows, cols, buttons FROM templates {where} ORDER BY name"
+        return [TemplateSummary(*row) for row in self.connection.execute(query, parameters)]
+
+    def loadTemplates(self, fileNames: Iterable[str] | None = None) -> list[ParsedTemplate]:
+        return [parseTemplateData(fileName, data) for fileName, data in self.readTemplates(fileNames)]
+
+    def readTemplates(self, fileNames: Iterable[str] | None = None) -> list[tuple[str, bytes]]:
+        """The stored JSON, to be parsed by a TemplateLoader (or loadTemplates)"""
+        if fileNames is None:
+            rows = self.connection.execute("SELECT fileName, data FROM templates ORDER BY name")
+        else:
+            fileNames = list(fileNames)
+            rows = self.connection.execute(
+                f"SELECT fileName, data FROM templates WHERE fileName IN ({', '.join('?' * len(fileNames))}) ORDER BY name",
+                fileNames,
+            )
+        return [(fileName, data.encode("utf-8")) for fileName, data in rows]
+
+    def importFolder(self, folder: Path) -> tuple[int, list[str]]:
+        """Imports every valid .json template of the folder, returns the count and the problems found"""
+        errors: list[str] = []
+        templates: list[tuple[str, list[Template | TemplateItem]]] = []
+        for filePath in sorted(folder.glob("*.json")):
+            result = parseTemplate(filePath)
+            errors += result.errors
+            if result.templateData:
+                templates.append((result.fileName, result.templateData))
+        self.saveTemplates(templates)
+        return len(templates), errors
+
+    def exportFolder(self, folder: Path) -> int:
+        folder.mkdir(parents=True, exist_ok=True)
+        count = 0
+        for fileName, data in self.connection.execute("SELECT fileName, data FROM templates"):
+            writeTemplateFile(folder / fileName, json.loads(data))
+            count += 1
+        return count
+
+# Opened on first use, see openTemplateStore
+templateStore: TemplateStore | None = None
+
+def openTemplateStore() -> TemplateStore:
+    global templateStore
+    if templateStore is None:
+        templateStore = TemplateStore(getTemplateStorePath())
+    return templateStore
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="launkey templates", description="Manage the SQLite template store")
+    parser.add_argument("--database", type=Path, help="store file, the one used by the GUI by default")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="list stored templates")
+    search = commands.add_parser("search", help="search stored templates")
+    search.add_argument("name", nargs="?", help="part of the template name")
+    search.add_argument("--type", help="template type, e.g. BUTTONS")
+    search.add_argument("--rows", type=int, help="fits in this many rows")
+    search.add_argument("--cols", type=int, help="fits in this many columns")
+    for command, helpText in (("import", "import the templates of a JSON folder"), ("export", "export every template to a JSON folder")):
+        subparser = commands.add_parser(command, help=helpText)
+        subparser.add_argument("folder", type=Path, nargs="?", help="templates folder, the one used by the GUI by default")
+    args = parser.parse_args(argv)
+
+    store = TemplateStore(args.database or getTemplateStorePath())
+    try:
+        if args.command in ("list", "search"):
+            if args.command == "list":
+                summaries = store.listTemplates()
+            else:
+                summaries = store.searchTemplates(args.name, args.type, args.rows, args.cols)
+            for summary in summaries:
+                print(f"{summary.name:32} {summary.type:10} {summary.rows}x{summary.cols} {summary.buttons:3} buttons  {summary.fileName}")
+        elif args.command == "import":
+            count, errors = store.importFolder(args.folder or getTemplateFolderPath())
+            for error in errors:
+                print(f"WARN: {error}")
+            print(f"Imported {count} templates")
+        elif args.command == "export":
+            print(f"Exported {store.exportFolder(args.folder or getTemplateFolderPath())} templates")
+    finally:
+        store.close()
+    return 0
@@ -0,0 +1,61 @@
+from pathlib import Path
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QTimer, Signal
+
+DEBOUNCE_INTERVAL = 150  # ms
+
+class TemplateFolderWatcher(QObject):
+    """Watches the template folder and its .json files.
+
+    Bursts of events (a sync tool copying many files, an editor writing a file in several steps)
+    are collected and `changed` is emitted once with the names of the affected files."""
+    changed = Signal(list)
+
+    def __init__(self, folder: Path, parent: QObject | None = None, /, interval: int = DEBOUNCE_INTERVAL):
+        super().__init__(parent)
+        self.folder = folder
+        self.pending: set[str] = set()
+        self.knownFiles = self.listTemplateFiles()
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.flush)
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.addPath(str(folder))
+        self.watchFiles()
+        self.watcher.directoryChanged.connect(self.onDirectoryChanged)
+        self.watcher.fileChanged.connect(self.onFileChanged)
+
+    def listTemplateFiles(self) -> set[str]:
+        # Only the names, the files themselves are checked by the template index
+        try:
+            return {entry.name for entry in self.folder.iterdir() if entry.suffix == ".json"}
+        except OSError:
+            return set()
+
+    def watchFiles(self):
+        # Files replaced or deleted drop out of the watcher, watch the current ones again
+        watched = set(self.watcher.files())
+        missing = [str(self.folder / name) for name in self.knownFiles if str(self.folder / name) not in watched]
+        if missing:
+            self.watcher.addPaths(missing)
+
+    def onDirectoryChanged(self, _path: str):
+        files = self.listTemplateFiles()
+        self.pending.update(files ^ self.knownFiles)
+        self.knownFiles = files
+        self.timer.start()
+
+    def onFileChanged(self, path: str):
+        self.pending.add(Path(path).name)
+        self.timer.start()
+
+    def flush(self):
+        self.watchFiles()
+        if not self.pending:
+            return
+        changedFiles = sorted(self.pending)
+        self.pending.clear()
+        self.changed.emit(changedFiles)
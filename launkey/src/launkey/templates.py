@@ -1,7 +1,11 @@
+import json
+import os
+
 from typing import Any, Tuple, List
 from enum import Enum, unique
 from pathlib import Path
 from PySide6.QtCore import QStandardPaths
+from PySide6.QtGui import QBrush, QColor
 
 def ensureTemplatesFolderExists(systemPath: str) -> Path:
     folderName = "Launkey_Templates"
@@ -15,6 +19,18 @@ def getTemplateFolderPath() -> Path:
     fullPath = ensureTemplatesFolderExists(pathOnSystem)
     return fullPath
 
+def writeTemplateFile(filePath: Path, templateJsonData: list[dict[str, Any]]):
+    """Writes a temporary file and swaps it in, a crash mid-write leaves the old template intact"""
+    tmpPath = filePath.with_name(filePath.name + ".tmp")
+    try:
+        with open(tmpPath, "w") as f:
+            json.dump(templateJsonData, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmpPath, filePath)
+    finally:
+        tmpPath.unlink(missing_ok=True)
+
 def sterilizeTemplateName(name: str) -> str:
     # Replace spaces to underscores and remove invalid characters
     name = name.strip().replace(" ", "_")
@@ -51,11 +67,28 @@ LEDColorCodes = [
     ([LED.MEDIUM, LED.FULL], "#66ff33"),
 ]
 
+# Launchpad velocity byte (00gg00rr, same as Launchpad.LedGetColor) for every (red, green) pair
+LED_VELOCITY: dict[Tuple[LED, LED], int] = {(red, green): red.value | (green.value << 4) for red in LED for green in LED}
+VELOCITY_LEDS: dict[int, Tuple[LED, LED]] = {velocity: leds for leds, velocity in LED_VELOCITY.items()}
+
+# Colors indexed by velocity byte, shared by the table, previews and editor
+VELOCITY_COLOR_CODES: list[str] = ["#000000"] * (max(LED_VELOCITY.values()) + 1)  # Default to black if not found
+for _leds, _colorCode in LEDColorCodes:
+    VELOCITY_COLOR_CODES[LED_VELOCITY[(_leds[0], _leds[1])]] = _colorCode
+VELOCITY_QCOLORS: list[QColor] = [QColor(colorCode) for colorCode in VELOCITY_COLOR_CODES]
+VELOCITY_QBRUSHES: list[QBrush] = [QBrush(color) for color in VELOCITY_QCOLORS]
+
+def ledsToVelocity(leds: Tuple[LED, LED]) -> int:
+    return LED_VELOCITY[leds]
+
 def ledsToColorCode(leds: Tuple[LED, LED]) -> str:
-    for led_pair, color in LEDColorCodes:
-        if leds == tuple(led_pair):
-            return color
-    return "#000000"  # Default to black if not found
+    try:
+        return VELOCITY_COLOR_CODES[LED_VELOCITY[leds]]
+    except (KeyError, TypeError):
+        return "#000000"  # Default to black if not found
+
+def ledsToQColor(leds: Tuple[LED, LED]) -> QColor:
+    return VELOCITY_QCOLORS[LED_VELOCITY[leds]]
 
 class TemplateItem:
     """Base class for items in a template"""
@@ -23,14 +23,16 @@ class Theme:
 
 class Magic(Theme):
     themeID = AppTheme.magic
-        
-    palette = QPalette()
-    
-    palette.setColor(QPalette.ColorRole.Window, QColor("#472542"))
-    palette.setColor(QPalette.ColorRole.Base, QColor("#30202E"))
-    palette.setColor(QPalette.ColorRole.Button, QColor("#350F2F"))
-    palette.setColor(QPalette.ColorRole.Highlight, QColor("#44003B"))
-    palette.setColor(QPalette.ColorRole.Accent, QColor("#BD24A8"))
+
+    def getPalette(self) -> QPalette:
+        # Built on use, not at import
+        palette = QPalette()
+        palette.setColor(QPalette.ColorRole.Window, QColor("#472542"))
+        palette.setColor(QPalette.ColorRole.Base, QColor("#30202E"))
+        palette.setColor(QPalette.ColorRole.Button, QColor("#350F2F"))
+        palette.setColor(QPalette.ColorRole.Highlight, QColor("#44003B"))
+        palette.setColor(QPalette.ColorRole.Accent, QColor("#BD24A8"))
+        return palette
     
 def loadTheme(main_window: "Launkey"):
     #print("Change to: " + themeID.name)
@@ -54,4 +56,4 @@ def loadTheme(main_window: "Launkey"):
         case AppTheme.dark: 
             pass
         case AppTheme.magic:
-            QGuiApplication.setPalette(Magic.palette)
+            QGuiApplication.setPalette(Magic().getPalette())
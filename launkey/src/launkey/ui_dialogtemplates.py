@@ -3,7 +3,6 @@
 # This file is no longer auto-generated. You can safely edit it.
 ################################################################################
 
-import json
 from pathlib import Path
 from typing import List
 
@@ -16,7 +15,8 @@ from PySide6.QtWidgets import (
 from .custom_layouts import TemplateGridLayout
 from .custom_widgets import ToggleButton, AreYouSureDialog, QSplitterNoHandle
 from .template_options_widgets import TemplateOptionsList
-from .templates import Template, TemplateItem, getTemplateFolderPath, sterilizeTemplateName, getTemplateType
+from .template_store import TemplateStorage, TemplateStore, loadTemplateStorage, openTemplateStore
+from .templates import Template, TemplateItem, getTemplateFolderPath, sterilizeTemplateName, getTemplateType, writeTemplateFile
 
 class Ui_Dialog:
     """
@@ -34,6 +34,7 @@ class Ui_Dialog:
         self.editorFrame: QFrame
         self.gridLayout: TemplateGridLayout
         self.templateNameForOverwrite: str | None = None
+        self.changedFileNames: list[str] = []  # Template files written or deleted by this dialog
 
     def loadTemplate(self, dialog: QDialog, template: List[Template | TemplateItem]):
         self.loadedTemplate = template
@@ -169,7 +170,9 @@ class Ui_Dialog:
         templateName = self.optionsList.getTemplateName().strip()
         templateFileName = sterilizeTemplateName(templateName)
         filePath = fullPath / f"{templateFileName}.json"
-        if filePath.exists():
+        store = openTemplateStore() if loadTemplateStorage() == TemplateStorage.database else None
+        exists = store.hasTemplate(filePath.name) if store is not None else filePath.exists()
+        if exists:
             if not self.askForFileOverwrite(templateName):
                 self.enableUIAfterSaving()
                 return
@@ -180,7 +183,8 @@ class Ui_Dialog:
         progress.setCancelButton(None)
 
         pathOnSystem = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
-        self.saveTemplateData(filePath, pathOnSystem, progress)
+        self.saveTemplateData(filePath, pathOnSystem, progress, store)
+        self.changedFileNames.append(filePath.name)
 
         progress.setValue(100)
         
@@ -208,7 +212,7 @@ class Ui_Dialog:
         self.editorFrame.setDisabled(True)
         self.optionsList.setDisabled(True)
 
-    def saveTemplateData(self, filePath: Path, pathOnSystem: str, progress: QProgressDialog):
+    def saveTemplateData(self, filePath: Path, pathOnSystem: str, progress: QProgressDialog, store: TemplateStore | None = None):
         progress.setValue(20)
         progress.setLabelText("Preparing template...")
 
@@ -223,8 +227,10 @@ class Ui_Dialog:
 
         progress.setValue(70)
         progress.setLabelText("Saving template...")
-        with open(filePath, 'w') as file:
-            json.dump(template_data, file)
+        if store is not None:
+            store.saveTemplate(filePath.name, template)  # type: ignore
+        else:
+            writeTemplateFile(filePath, template_data)
         progress.setLabelText("Finalizing...")
         
     def onXButtonClick(self, event: QEvent, dialog: QDialog):
@@ -254,8 +260,15 @@ class Ui_Dialog:
         templateFileName = sterilizeTemplateName(templateName)
         filePath = fullPath / f"{templateFileName}.json"
         try:
-            if filePath.exists():
+            if loadTemplateStorage() == TemplateStorage.database:
+                if openTemplateStore().deleteTemplate(filePath.name):
+                    self.changedFileNames.append(filePath.name)
+                    print(f"Template '{templateName}' deleted successfully.")
+                else:
+                    self.errorMessageBox(f"Template '{templateName}' is not in the template store.", "Delete Template Error", dialog)
+            elif filePath.exists():
                 filePath.unlink()
+                self.changedFileNames.append(filePath.name)
                 print(f"Template '{templateName}' deleted successfully.")
             else:
                 self.errorMessageBox(f"Template file '{templateFileName}.json' does not exist.", "Delete Template Error", dialog)
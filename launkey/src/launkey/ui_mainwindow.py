@@ -13,7 +13,7 @@ from PySide6.QtWidgets import (
 )
 from .custom_layouts import DynamicGridLayout  # Import the custom layout class
 from .custom_widgets import QAutoStatusBar, QLabelInfo, QSplitterNoHandle
-from .launchpad_control import LaunchpadTable
+from .launchpad_table import LaunchpadTable
 
 class Ui_MainWindow:
     def setupUi(self, MainWindow: QMainWindow):
@@ -33,6 +33,15 @@ class Ui_MainWindow:
         self.actionTestMode.setCheckable(True)
         self.actionSettings = QAction(MainWindow)
         self.actionSettings.setObjectName("actionSettings")
+        self.actionExportLatency = QAction(MainWindow)
+        self.actionExportLatency.setObjectName("actionExportLatency")
+        self.actionExportLatency.setEnabled(False)  # Enabled when a launchpad is connected
+        self.actionRecordSession = QAction(MainWindow)
+        self.actionRecordSession.setObjectName("actionRecordSession")
+        self.actionRecordSession.setCheckable(True)
+        self.actionRecordSession.setEnabled(False)  # Enabled when a launchpad is connected
+        self.actionReplaySession = QAction(MainWindow)
+        self.actionReplaySession.setObjectName("actionReplaySession")
 
         # Help menu actions
         self.checkForUpdates = QAction(MainWindow)
@@ -41,8 +50,6 @@ class Ui_MainWindow:
         self.actionAbout.setObjectName("actionAbout")
 
         # REMOVE after implementetion
-        self.actionSave.setEnabled(False)
-        self.actionLoad.setEnabled(False)
         #self.actionSettings.setEnabled(False)
         self.actionAbout.setEnabled(False)
         # END REMOVE
@@ -183,6 +190,9 @@ class Ui_MainWindow:
         self.menuConfig.addAction(self.actionSave)
         self.menuConfig.addAction(self.actionLoad)
         self.menuConfig.addAction(self.actionTestMode)
+        self.menuConfig.addAction(self.actionExportLatency)
+        self.menuConfig.addAction(self.actionRecordSession)
+        self.menuConfig.addAction(self.actionReplaySession)
         self.menuConfig.addSeparator()
         self.menuConfig.addAction(self.actionSettings)
         self.menuHelp.addAction(self.checkForUpdates)
@@ -197,10 +207,13 @@ class Ui_MainWindow:
     def retranslateUi(self, MainWindow):
         # Window and menu texts
         MainWindow.setWindowTitle(QCoreApplication.translate("MainWindow", "Launkey"))
-        self.actionSave.setText(QCoreApplication.translate("MainWindow", "Save"))
-        self.actionLoad.setText(QCoreApplication.translate("MainWindow", "Load"))
+        self.actionSave.setText(QCoreApplication.translate("MainWindow", "Save layout..."))
+        self.actionLoad.setText(QCoreApplication.translate("MainWindow", "Load layout..."))
         self.actionTestMode.setText(QCoreApplication.translate("MainWindow", "Test Mode"))
         self.actionSettings.setText(QCoreApplication.translate("MainWindow", "Settings"))
+        self.actionExportLatency.setText(QCoreApplication.translate("MainWindow", "Export latency..."))
+        self.actionRecordSession.setText(QCoreApplication.translate("MainWindow", "Record sessions..."))
+        self.actionReplaySession.setText(QCoreApplication.translate("MainWindow", "Replay session..."))
         self.checkForUpdates.setText(QCoreApplication.translate("MainWindow", "Check for updates"))
         self.actionAbout.setText(QCoreApplication.translate("MainWindow", "About"))
 
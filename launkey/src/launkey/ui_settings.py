@@ -8,6 +8,10 @@ from PySide6.QtWidgets import (
 
 from .custom_widgets import QSplitterNoHandle
 from .theme_loader import AppTheme
+from .key_output import KeyOutput
+from .led_scheduler import LedRefreshRate
+from .layouts import LaunchLayout
+from .template_store import TemplateStorage
 from .settings import AutoFormLayout, SettingsWrapper, SettingsAll, SettingsGroup, Setting
 
 class Ui_Settings:
@@ -33,6 +37,14 @@ class Ui_Settings:
                 SettingsGroup("Appearance", [
                     Setting("Theme", AppTheme.default)
                 ]),
+                SettingsGroup("Launchpad", [
+                    Setting("LED refresh rate", LedRefreshRate.hz125),
+                    Setting("Key output", KeyOutput.keyboard),
+                    Setting("At launch", LaunchLayout.lastLayout)
+                ]),
+                SettingsGroup("Templates", [
+                    Setting("Storage", TemplateStorage.folder)
+                ]),
                 # SettingsGroup("Test setting group", [
                 #     Setting("STRING", 'TAK')
                 # ]),
@@ -0,0 +1,84 @@
+import fcntl
+import os
+import struct
+
+from .key_combos import pressKeyCombo, releaseKeyCombo
+from .key_output import KeyAction
+
+# linux/uinput.h and linux/input-event-codes.h
+UI_SET_EVBIT = 0x40045564
+UI_SET_KEYBIT = 0x40045565
+UI_DEV_CREATE = 0x5501
+UI_DEV_DESTROY = 0x5502
+EV_SYN = 0x00
+EV_KEY = 0x01
+SYN_REPORT = 0
+BUS_USB = 0x03
+KEY_CODES = range(1, 256)  # Same numbers as the scan codes keyboard.parse_hotkey() returns on Linux
+
+INPUT_EVENT = struct.Struct("llHHi")  # struct input_event, the kernel fills in the time
+UINPUT_USER_DEV = struct.Struct("80sHHHHi" + "64i" * 4)
+
+# Pre-encoded events, indexed by key code
+PRESS_EVENTS: tuple[bytes, ...] = tuple(INPUT_EVENT.pack(0, 0, EV_KEY, code, 1) for code in range(256))
+RELEASE_EVENTS: tuple[bytes, ...] = tuple(INPUT_EVENT.pack(0, 0, EV_KEY, code, 0) for code in range(256))
+SYN_EVENT = INPUT_EVENT.pack(0, 0, EV_SYN, SYN_REPORT, 0)
+
+def encodeKeyActions(keyActions: list[KeyAction]) -> bytes:
+    """Encode a batch of key actions as input events ending in a single SYN report.
+
+    A key that already changed since the last report gets its own report first,
+    otherwise a press and release of it would be merged into one input frame."""
+    events: list[bytes] = []
+    changedKeys: set[int] = set()
+    for press, keyCombo in keyActions:
+        steps = keyCombo if press else tuple(tuple(reversed(step)) for step in keyCombo)
+        keyEvents = PRESS_EVENTS if press else RELEASE_EVENTS
+        for step in steps:
+            for code in step:
+                if code in changedKeys:
+                    events.append(SYN_EVENT)
+                    changedKeys.clear()
+                changedKeys.add(code)
+                events.append(keyEvents[code])
+    if events:
+        events.append(SYN_EVENT)
+    return b"".join(events)
+
+class UinputKeyboard:
+    """Key output through one persistent /dev/uinput virtual keyboard (Linux only).
+
+    Every batch is written with a single write() call."""
+    name = "uinput"
+
+    def __init__(self, devicePath: str = "/dev/uinput"):
+        self.fd = os.open(devicePath, os.O_WRONLY | os.O_NONBLOCK)
+        try:
+            fcntl.ioctl(self.fd, UI_SET_EVBIT, EV_KEY)
+            for code in KEY_CODES:
+                fcntl.ioctl(self.fd, UI_SET_KEYBIT, code)
+            os.write(self.fd, UINPUT_USER_DEV.pack(b"Launkey Virtual Keyboard", BUS_USB, 1, 1, 1, 0, *([0] * 256)))
+            fcntl.ioctl(self.fd, UI_DEV_CREATE)
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def sendBatch(self, keyActions: list[KeyAction]):
+        # Key names the system couldn't map to scan codes still go through the keyboard module
+        if any(isinstance(keyCombo, str) for _, keyCombo in keyActions):
+            for press, keyCombo in keyActions:
+                if isinstance(keyCombo, str):
+                    (pressKeyCombo if press else releaseKeyCombo)(keyCombo)
+                else:
+                    os.write(self.fd, encodeKeyActions([(press, keyCombo)]))
+            return
+        os.write(self.fd, encodeKeyActions(keyActions))
+
+    def close(self):
+        if self.fd < 0:
+            return
+        try:
+            fcntl.ioctl(self.fd, UI_DEV_DESTROY)
+        finally:
+            os.close(self.fd)
+            self.fd = -1
@@ -1,7 +1,6 @@
 from typing import TYPE_CHECKING, Any
 
 import sys
-import requests
 
 from datetime import date, timedelta
 from importlib import metadata as importlibMetadata
@@ -56,6 +55,7 @@ class UpdateManager:
 
         print("Checking for updates")
 
+        import requests  # Slow to import, only needed here
         req = requests.get('https://api.github.com/repos/Ja-Tar/Launkey/releases/latest')
         if req.status_code != 200:
             self.errors.append(f"Failed to get info from github, code: {req.status_code}")
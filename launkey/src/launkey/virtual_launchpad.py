@@ -0,0 +1,151 @@
+import random
+import threading
+import time
+
+from collections import deque
+from typing import Iterable, Iterator
+
+import launchpad_py as launchpad
+
+from .led_frame import LedFrame
+from .runtime_plan import PAD_SLOTS, padSlot
+
+ButtonInput = tuple[int, int, bool]  # (x, y, pressed) like Launchpad.ButtonStateXY()
+
+def buttonMessage(x: int, y: int, pressed: bool) -> tuple[int, int, int]:
+    """MIDI message a Launchpad Mini MK1 sends for a button change"""
+    velocity = 127 if pressed else 0
+    if y == 0:
+        return 176, 104 + x, velocity
+    return 144, ((y - 1) << 4) | x, velocity
+
+class VirtualMidi:
+    """In-process stand-in for launchpad_py's Midi, button input is scheduled and LED output is recorded"""
+    def __init__(self):
+        self.messages: list[tuple[int, int, int]] = []  # Every message written, in order
+        self.messageTimes: list[int] = []  # time.monotonic_ns() of every message
+        self.leds = LedFrame()  # What the pads would show, in runtime plan slot order
+        self._rapidSlot = 0
+        self._input: deque[tuple[int, tuple[int, int, int]]] = deque()  # (due time, message)
+        self._inputLock = threading.Lock()
+
+    def RawWrite(self, status: int, data1: int, data2: int):
+        self.messages.append((status, data1, data2))
+        self.messageTimes.append(time.monotonic_ns())
+        self._applyMessage(status, data1, data2)
+
+    def ReadCheck(self) -> bool:
+        pending = self._input
+        return bool(pending) and pending[0][0] <= time.monotonic_ns()
+
+    def ReadRaw(self) -> list[list]:
+        if not self.ReadCheck():
+            return []
+        _, message = self._input.popleft()
+        return [[[*message, 0], time.monotonic_ns() // 1_000_000]]
+
+    def OpenInput(self, midi_id: int) -> bool:
+        return True
+
+    def OpenOutput(self, midi_id: int) -> bool:
+        return True
+
+    def CloseInput(self):
+        pass
+
+    def CloseOutput(self):
+        pass
+
+    def feedButtons(self, buttons: Iterable[ButtonInput], /, rate: float = 0.0) -> list[int]:
+        """Queue button changes, `rate` spaces them in events per second, 0 makes them all due at once.
+        Returns the time.monotonic_ns() each change is due."""
+        interval = round(1_000_000_000 / rate) if rate > 0 else 0
+        return self.feedMessages((index * interval, buttonMessage(*button)) for index, button in enumerate(buttons))
+
+    def feedMessages(self, messages: Iterable[tuple[int, tuple[int, int, int]]]) -> list[int]:
+        """Queue raw MIDI input as (offset ns, message), offsets count from now or the last queued message and must not decrease"""
+        with self._inputLock:
+            start = max(time.monotonic_ns(), self._input[-1][0] if self._input else 0)
+            scheduled = [(start + offset, message) for offset, message in messages]
+            self._input.extend(scheduled)
+        return [dueTime for dueTime, _ in scheduled]
+
+    @property
+    def pendingInput(self) -> int:
+        return len(self._input)
+
+    def clearInput(self):
+        self._input.clear()
+
+    def clearOutput(self):
+        self.messages.clear()
+        self.messageTimes.clear()
+
+    def _applyMessage(self, status: int, data1: int, data2: int):
+        if status == 146:  # Rapid update, two LEDs per message
+            for velocity in (data1, data2):
+                if self._rapidSlot < PAD_SLOTS:
+                    self.leds[self._rapidSlot] = velocity
+                    self._rapidSlot += 1
+            return
+        self._rapidSlot = 0  # Any other message restarts rapid update at the first pad
+        if status == 176:
+            if data1 == 0:
+                self.leds.clear()  # Reset
+            elif 104 <= data1 < 112:
+                self.leds[padSlot(data1 - 104, 0)] = data2
+        elif status == 144:
+            slot = padSlot(data1 & 0x0f, (data1 >> 4) + 1)
+            if slot >= 0:
+                self.leds[slot] = data2
+
+class VirtualLaunchpad(launchpad.Launchpad):
+    """Launchpad Mini MK1 without hardware, for tests and benchmarks.
+
+    Only the MIDI port is replaced, the launchpad_py code for LEDs and buttons still runs."""
+    def __init__(self, buttons: Iterable[ButtonInput] = (), /, rate: float = 0.0):
+        # LaunchpadBase.__init__ would initialise pygame.midi
+        self.midi = VirtualMidi()
+        self.idOut = None
+        self.idIn = None
+        self.midi.feedButtons(buttons, rate)
+
+    def Check(self, number: int = 0, name: str = "Launchpad") -> bool:
+        return True
+
+    def Open(self, number: int = 0, name: str = "Launchpad") -> bool:
+        return True
+
+    def ButtonFlush(self):
+        self.midi.clearInput()
+
+    def feedButtons(self, buttons: Iterable[ButtonInput], /, rate: float = 0.0) -> list[int]:
+        return self.midi.feedButtons(buttons, rate)
+
+    @property
+    def ledMessages(self) -> list[tuple[int, int, int]]:
+        return self.midi.messages
+
+def scriptedButtons(positions: Iterable[tuple[int, int]]) -> Iterator[ButtonInput]:
+    """A press and release for every (x, y) in order"""
+    for x, y in positions:
+        yield x, y, True
+        yield x, y, False
+
+def randomButtons(count: int, /, seed: int | None = None, positions: list[tuple[int, int]] | None = None, maxHeld: int = 4) -> Iterator[ButtonInput]:
+    """`count` random presses with overlapping holds, every press gets its release"""
+    rng = random.Random(seed)
+    if positions is None:
+        positions = [(x, y) for y in range(9) for x in range(9) if padSlot(x, y) >= 0]
+    held: list[tuple[int, int]] = []
+    presses = 0
+    while presses < count or held:
+        if presses < count and len(held) < maxHeld and (not held or rng.random() < 0.5):
+            free = [position for position in positions if position not in held]
+            position = rng.choice(free)
+            held.append(position)
+            presses += 1
+            yield position[0], position[1], True
+        else:
+            position = held.pop(rng.randrange(len(held)))
+            yield position[0], position[1], False
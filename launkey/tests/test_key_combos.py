@@ -0,0 +1,80 @@
+import sys
+from collections import defaultdict
+
+import keyboard
+import pytest
+
+from launkey import key_combos
+from launkey.templates import Button, Template
+
+REAL_PARSE_HOTKEY = keyboard.parse_hotkey
+SCAN_CODES = {"ctrl": (29, 97), "a": (30,), "b": (48,)}
+
+
+def fakeParseHotkey(hotkey):
+    steps = []
+    for step in hotkey.split(", "):
+        keys = []
+        for key in step.split("+"):
+            if key not in SCAN_CODES:
+                raise ValueError(f"Key {key!r} is not mapped to any known key.")
+            keys.append(SCAN_CODES[key])
+        steps.append(tuple(keys))
+    return tuple(steps)
+
+
+@pytest.fixture(autouse=True)
+def fakeKeyboard(monkeypatch):
+    sent = []
+    monkeypatch.setattr(keyboard, "parse_hotkey", fakeParseHotkey)
+    monkeypatch.setattr(keyboard, "press", lambda key: sent.append(("press", key)))
+    monkeypatch.setattr(keyboard, "release", lambda key: sent.append(("release", key)))
+    monkeypatch.setattr(key_combos, "parsedKeyCombos", {})
+    monkeypatch.setattr(key_combos, "keyNamesUnmapped", False)
+    return sent
+
+
+def test_combo_is_parsed_once():
+    keyCombo = key_combos.parseKeyCombo("ctrl+a, b")
+    assert keyCombo == ((29, 30), (48,))
+    assert key_combos.parseKeyCombo("ctrl+a, b") is keyCombo
+
+
+def test_invalid_combos_are_reported():
+    templateData = [
+        Template("T", Template.Type.BUTTONS),
+        Button("Good", "0", (0, 0), keyboardCombo="ctrl+a"),
+        Button("Bad", "1", (0, 1), keyboardCombo="ctrl+nope"),
+    ]
+    errors = key_combos.validateKeyCombos(templateData)
+    assert len(errors) == 1 and errors[0].startswith("Bad:")
+    with pytest.raises(ValueError):
+        key_combos.parseKeyCombo(" ")
+
+
+def test_single_step_combo_presses_every_key(fakeKeyboard):
+    keyCombo = key_combos.parseKeyCombo("ctrl+a")
+    key_combos.pressKeyCombo(keyCombo)
+    key_combos.releaseKeyCombo(keyCombo)
+    assert fakeKeyboard == [("press", 29), ("press", 30), ("release", 30), ("release", 29)]
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="the keyboard package only checks for root on Linux")
+def test_non_root_keeps_combo_strings(monkeypatch, capsys):
+    from keyboard import _nixkeyboard
+
+    def ensureRoot():
+        raise ImportError("You must be root to use this library on linux.")
+
+    monkeypatch.setattr(keyboard, "parse_hotkey", REAL_PARSE_HOTKEY)
+    monkeypatch.setattr(_nixkeyboard, "ensure_root", ensureRoot)
+    monkeypatch.setattr(_nixkeyboard, "to_name", defaultdict(list))
+    monkeypatch.setattr(_nixkeyboard, "from_name", defaultdict(list))
+    templateData = [
+        Template("T", Template.Type.BUTTONS),
+        Button("A", "0", (0, 0), keyboardCombo="ctrl+a"),
+        Button("B", "1", (0, 1), keyboardCombo="alt+b"),
+    ]
+    assert key_combos.validateKeyCombos(templateData) == []
+    assert key_combos.parseKeyCombo("ctrl+a") == "ctrl+a"
+    assert capsys.readouterr().out.count("can't be mapped") == 1
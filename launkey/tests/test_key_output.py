@@ -0,0 +1,66 @@
+import threading
+import time
+
+from launkey import key_output
+
+
+def test_worker_keeps_order_and_counts_batches(monkeypatch):
+    sent = []
+    monkeypatch.setattr(key_output, "pressKeyCombo", lambda keyCombo: sent.append(("press", keyCombo)))
+    monkeypatch.setattr(key_output, "releaseKeyCombo", lambda keyCombo: sent.append(("release", keyCombo)))
+
+    worker = key_output.KeyInjectionWorker()
+    worker.start()
+    worker.submit([(True, ((30,),)), (True, ((48,),))])
+    worker.submit([])
+    worker.submit([(False, ((30,),)), (False, ((48,),))])
+    worker.stop()
+
+    assert sent == [("press", ((30,),)), ("press", ((48,),)), ("release", ((30,),)), ("release", ((48,),))]
+    stats = worker.getStats()
+    assert stats.batches == 2 and stats.queueDepth == 0
+    assert stats.maxInjectionTime >= stats.lastInjectionTime > 0
+
+
+def test_full_queue_and_slow_backend_do_not_block_stop():
+    release = threading.Event()
+
+    class StuckOutput:
+        name = "stuck"
+
+        def sendBatch(self, keyActions):
+            release.wait(5)
+
+        def close(self):
+            pass
+
+    worker = key_output.KeyInjectionWorker(StuckOutput(), maxBatches=2)
+    worker.start()
+    assert worker.trySubmit([(True, "a")])
+    while worker.queueDepth:  # The worker took the first batch and is stuck sending it
+        time.sleep(0.001)
+    assert worker.trySubmit([(True, "b")]) and worker.trySubmit([(True, "c")])
+    assert not worker.trySubmit([(True, "d")])
+
+    start = time.perf_counter()
+    worker.stop(timeout=0.05)
+    assert time.perf_counter() - start < 1
+    release.set()
+
+
+def test_unavailable_uinput_falls_back_to_keyboard_module(monkeypatch):
+    monkeypatch.setattr(key_output.sys, "platform", "win32")
+    assert key_output.createKeyOutputBackend(key_output.KeyOutput.uinput).name == "keyboard"
+
+
+def test_uinput_batch_ends_with_one_syn_report():
+    from launkey.uinput_backend import EV_KEY, EV_SYN, INPUT_EVENT, encodeKeyActions
+
+    data = encodeKeyActions([(True, ((29, 46),)), (True, ((48,),))])
+    events = [event[2:] for event in INPUT_EVENT.iter_unpack(data)]
+    assert events == [(EV_KEY, 29, 1), (EV_KEY, 46, 1), (EV_KEY, 48, 1), (EV_SYN, 0, 0)]
+
+    # Releases go in reverse, and a key that changes twice gets its own report
+    data = encodeKeyActions([(False, ((29, 46),)), (True, ((46,),))])
+    events = [event[2:] for event in INPUT_EVENT.iter_unpack(data)]
+    assert events == [(EV_KEY, 46, 0), (EV_KEY, 29, 0), (EV_SYN, 0, 0), (EV_KEY, 46, 1), (EV_SYN, 0, 0)]
@@ -0,0 +1,37 @@
+import csv
+import json
+
+from launkey.latency import LATENCY_BUCKETS, LatencyHistogram, RunLatency
+
+
+def test_percentiles_use_bucket_upper_bounds():
+    histogram = LatencyHistogram()
+    for _ in range(98):
+        histogram.record(50_000)
+    histogram.record(2_000_000)
+    histogram.record(2_000_000)
+    p50 = histogram.percentile(50)
+    p99 = histogram.percentile(99)
+    assert 50_000 <= p50 < 50_000 * 1.25
+    assert 2_000_000 <= p99 < 2_000_000 * 1.25
+    histogram.record(LATENCY_BUCKETS[-1] * 2)  # Overflow bucket reports the max
+    assert histogram.percentile(100) == LATENCY_BUCKETS[-1] * 2
+
+
+def test_export_json_and_csv(tmp_path):
+    latency = RunLatency()
+    assert latency.statusText() == "Latency: no presses yet"
+    latency["total"].record(1500)
+    latency["keyboard"].record(800)
+    assert latency.statusText().startswith("Latency p50 ")
+
+    latency.exportJson(tmp_path / "latency.json")
+    data = json.loads((tmp_path / "latency.json").read_text())
+    assert data["stages"]["total"]["count"] == 1
+    assert len(data["stages"]["led"]["counts"]) == len(LATENCY_BUCKETS) + 1
+
+    latency.exportCsv(tmp_path / "latency.csv")
+    with open(tmp_path / "latency.csv", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["stage", "bucket_le_ns", "count"]
+    assert sum(int(row[2]) for row in rows[1:] if row[0] == "total") == 1
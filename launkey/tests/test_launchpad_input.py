@@ -0,0 +1,75 @@
+import asyncio
+
+from launkey.launchpad_input import LaunchpadInputReader
+
+
+class FakeLaunchpad:
+    def __init__(self, states):
+        self.states = list(states)
+
+    def ButtonChanged(self):
+        return bool(self.states)
+
+    def ButtonStateXY(self):
+        return self.states.pop(0)
+
+
+def test_reader_forwards_events_in_order():
+    async def collect():
+        queue = asyncio.Queue()
+        lp = FakeLaunchpad([[1, 2, True], [], [1, 2, False]])
+        reader = LaunchpadInputReader(lp, asyncio.get_running_loop(), queue)
+        reader.start()
+        try:
+            return [await asyncio.wait_for(queue.get(), 1) for _ in range(2)]
+        finally:
+            reader.stop()
+
+    pressed, released = asyncio.run(collect())
+    assert (pressed.x, pressed.y, pressed.pressed) == (1, 2, True)
+    assert (released.x, released.y, released.pressed) == (1, 2, False)
+    assert pressed.timestamp <= released.timestamp
+
+
+def test_reader_drains_all_pending_events():
+    lp = FakeLaunchpad([[0, 1, True], [1, 1, True], [], [0, 1, False]])
+    reader = LaunchpadInputReader(lp, None, None)
+    events = reader.readPendingEvents()
+    assert [(e.x, e.y, e.pressed) for e in events] == [(0, 1, True), (1, 1, True), (0, 1, False)]
+    assert reader.readPendingEvents() == []
+
+
+def test_reader_waits_for_room_in_a_full_queue():
+    async def collect():
+        queue = asyncio.Queue(1)
+        lp = FakeLaunchpad([[x, 1, True] for x in range(3)])
+        reader = LaunchpadInputReader(lp, asyncio.get_running_loop(), queue)
+        reader.start()
+        try:
+            await asyncio.sleep(0.01)
+            return [(await asyncio.wait_for(queue.get(), 1)).x for _ in range(3)], reader.backpressure
+        finally:
+            reader.stop()
+
+    received, backpressure = asyncio.run(collect())
+    assert received == [0, 1, 2]
+    assert backpressure > 0
+
+
+def test_idle_wait_widens_and_resets():
+    async def watch():
+        lp = FakeLaunchpad([])
+        reader = LaunchpadInputReader(lp, asyncio.get_running_loop(), asyncio.Queue(), busyPolls=10)
+        reader.start()
+        try:
+            await asyncio.sleep(0.2)
+            idleWait = reader.currentWait
+            lp.states.append([0, 0, True])
+            await asyncio.wait_for(reader.queue.get(), 1)
+            return idleWait, reader.currentWait
+        finally:
+            reader.stop()
+
+    idleWait, activeWait = asyncio.run(watch())
+    assert idleWait == 0.01
+    assert activeWait == 0.0005
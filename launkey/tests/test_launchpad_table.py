@@ -0,0 +1,38 @@
+from launkey.launchpad_table import LaunchpadTable
+from launkey.templates import Button, Template
+
+
+def makeTemplate():
+    return [
+        Template("Pair", Template.Type.BUTTONS),
+        Button("A", "0", (0, 0), keyboardCombo="a"),
+        Button("B", "1", (0, 1), keyboardCombo="b"),
+    ]
+
+
+def test_index_follows_loaded_templates(qapp):
+    table = LaunchpadTable()
+    templateData = makeTemplate()
+    table.loadDataFromTemplate((2, 3), templateData)
+    assert table.getTemplateItemAtButton((3, 2)) is templateData[1]
+    assert table.getTemplateItemAtButton((4, 2)) is templateData[2]
+    assert table.getTemplateItemAtButton((5, 2)) is None
+    assert table.isOnOccupiedCells((2, 4))
+
+    table.resetTemplates()
+    assert table.getTemplateItemAtButton((3, 2)) is None
+    assert not table.isOnOccupiedCells((2, 4))
+
+
+def test_pressed_mask(qapp):
+    table = LaunchpadTable()
+    templateData = makeTemplate()
+    table.loadDataFromTemplate((2, 3), templateData)
+    table.buttonPressed((3, 2), templateData[1])
+    table.buttonPressed((4, 2), templateData[2])
+    assert table.isButtonPressed((2, 3)) and table.isButtonPressed((2, 4))
+
+    table.buttonUnpressed((3, 2))
+    assert not table.isButtonPressed((2, 3))
+    assert table.releaseAllButtons() == 1 << 12
+    assert table.pressedMask == 0
@@ -0,0 +1,115 @@
+import asyncio
+import json
+
+import pytest
+
+from launkey.headless import runLayout
+from launkey.launchpad_table import LaunchpadTable
+from launkey.layouts import LayoutState, loadLayout, saveLayout
+from launkey.templates import LED, Button, Template
+from launkey.virtual_launchpad import VirtualLaunchpad
+
+
+def writeTemplates(folder):
+    templateData = [Template("Pair", Template.Type.BUTTONS).toDict()]
+    templateData += [
+        Button("Left", "0", (0, 0), normalColor=(LED.LOW, LED.OFF), keyboardCombo="a").toDict(),
+        Button("Right", "1", (0, 1), normalColor=(LED.OFF, LED.FULL), keyboardCombo="b").toDict(),
+    ]
+    (folder / "Pair.json").write_text(json.dumps(templateData))
+
+
+def writeLayout(path, placements):
+    path.write_text(json.dumps({"version": 1, "templates": [{"file": name, "position": list(pos)} for name, pos in placements]}))
+
+
+def test_layout_places_templates_without_widgets(tmp_path):
+    writeTemplates(tmp_path)
+    writeLayout(tmp_path / "layout.json", [("Pair.json", (1, 0)), ("Pair.json", (8, 6))])
+    layout = loadLayout(tmp_path / "layout.json", templateFolder=tmp_path)
+    assert sorted(layout.loadedTemplates) == [(1, 0), (1, 1), (8, 6), (8, 7)]
+    assert len(layout.loadedTempTypes) == 2
+    frame = layout.returnFirstFrame()
+    assert frame[0] == 0x01 and frame[1] == 0x30 and frame[63] == 0x30
+
+
+@pytest.mark.parametrize("placements", [
+    [("Pair.json", (1, 7))],  # Right button on the autoMap column
+    [("Pair.json", (2, 0)), ("Pair.json", (2, 1))],  # Overlap
+    [("Missing.json", (1, 0))],
+])
+def test_invalid_layouts_are_rejected(tmp_path, placements):
+    writeTemplates(tmp_path)
+    writeLayout(tmp_path / "layout.json", placements)
+    with pytest.raises(ValueError):
+        loadLayout(tmp_path / "layout.json", templateFolder=tmp_path)
+
+
+def test_unsupported_layout_version(tmp_path):
+    (tmp_path / "layout.json").write_text(json.dumps({"version": 99, "templates": []}))
+    with pytest.raises(ValueError):
+        loadLayout(tmp_path / "layout.json", templateFolder=tmp_path)
+
+
+def test_headless_run_drives_the_launchpad():
+    layout = LayoutState()
+    layout.loadDataFromTemplate((1, 0), [Template("One", Template.Type.BUTTONS), Button("One", "0", (0, 0), normalColor=(LED.FULL, LED.OFF), keyboardCombo="a")])
+    lp = VirtualLaunchpad()
+    asyncio.run(runLayout(layout, lp, duration=0.05))
+    leds = [message for message in lp.ledMessages if message[0] == 144]
+    assert (144, 0x00, 0x03) in leds
+    assert lp.ledMessages[-1] == (176, 0, 0)  # Reset when the run stops
+
+
+def test_headless_run_closes_the_launchpad_when_start_fails():
+    layout = LayoutState()
+    layout.loadDataFromTemplate((1, 0), [Template("One", Template.Type.BUTTONS), Button("One", "0", (0, 0), keyboardCombo=" ")])
+    lp = VirtualLaunchpad()
+    closed = []
+    lp.Close = lambda: closed.append(True)
+    with pytest.raises(ValueError):
+        asyncio.run(runLayout(layout, lp, duration=0.05))
+    assert closed == [True]
+
+
+def test_saved_layout_restores_without_template_files(tmp_path, qapp):
+    writeTemplates(tmp_path)
+    writeLayout(tmp_path / "v1.json", [("Pair.json", (1, 0)), ("Pair.json", (3, 4))])
+    table = LaunchpadTable()
+    loadLayout(tmp_path / "v1.json", templateFolder=tmp_path, layout=table)
+    saveLayout(table, tmp_path / "v2.json")
+    (tmp_path / "Pair.json").unlink()
+
+    restored = loadLayout(tmp_path / "v2.json", templateFolder=tmp_path)
+    assert sorted(restored.loadedTemplates) == sorted(table.loadedTemplates)
+    assert list(restored.loadedTempTypes) == list(table.loadedTempTypes)
+    assert restored.returnFirstFrame() == table.returnFirstFrame()
+    saved = json.loads((tmp_path / "v2.json").read_text())
+    assert saved["templates"] == [{"file": "Pair.json", "position": [1, 0]}, {"file": "Pair.json", "position": [3, 4]}]
+
+    loadLayout(tmp_path / "v2.json", layout=table)  # Replaces what the table held
+    assert len(table.loadedTemplates) == 4
+
+
+@pytest.mark.parametrize("positions", [
+    [[-1, 0]],  # Would wrap around the item index
+    [[0, 0]],  # autoMap row
+    [[1, 8]],  # autoMap column
+    [[2, 2], [2, 2]],  # Two items on one cell
+])
+def test_runtime_positions_are_checked(tmp_path, positions):
+    template = Template("Pair", Template.Type.BUTTONS).toDict()
+    items = [[row, col, Button(f"B{i}", str(i), (0, i), keyboardCombo="a").toDict()] for i, (row, col) in enumerate(positions)]
+    layoutJson = {"version": 2, "templates": [{"file": "Pair.json", "position": positions[0]}], "runtime": [{"template": template, "items": items}]}
+    (tmp_path / "layout.json").write_text(json.dumps(layoutJson))
+    with pytest.raises(ValueError):
+        loadLayout(tmp_path / "layout.json")
+
+
+def test_runtime_templates_must_not_overlap(tmp_path):
+    template = Template("One", Template.Type.BUTTONS).toDict()
+    entry = {"template": template, "items": [[2, 2, Button("B", "0", (0, 0), keyboardCombo="a").toDict()]]}
+    layoutJson = {"version": 2, "templates": [{"file": "One.json", "position": [2, 2]}] * 2, "runtime": [entry, entry]}
+    (tmp_path / "layout.json").write_text(json.dumps(layoutJson))
+    with pytest.raises(ValueError):
+        loadLayout(tmp_path / "layout.json")
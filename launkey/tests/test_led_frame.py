@@ -0,0 +1,40 @@
+import pytest
+
+from launkey.led_frame import FRAME_SIZE, LedFrame
+from launkey.templates import LED
+
+
+def test_leds_are_stored_as_velocity_bytes():
+    frame = LedFrame()
+    frame.setLeds(3, (LED.MEDIUM, LED.FULL))
+    assert frame[3] == 0x32
+    assert frame.getLeds(3) == (LED.MEDIUM, LED.FULL)
+
+
+def test_copy_and_compare():
+    frame = LedFrame.fromLeds([(LED.FULL, LED.OFF)] * 64, [(LED.OFF, LED.LOW)] * 16)
+    other = LedFrame()
+    buffer = other.buffer
+    other.copyFrom(frame)
+    assert other == frame and other.buffer is buffer
+    other[70] = 0
+    assert other.changedSlots(frame) == [70]
+    other.clear()
+    assert other.buffer == bytes(FRAME_SIZE)
+
+
+def test_wrong_size_is_rejected():
+    with pytest.raises(ValueError):
+        LedFrame(bytes(64))
+
+
+def test_color_tables_match_color_codes():
+    from launkey.templates import LED_VELOCITY, LEDColorCodes, VELOCITY_QCOLORS, ledsToColorCode, ledsToVelocity
+
+    for leds, colorCode in LEDColorCodes:
+        leds = (leds[0], leds[1])
+        assert ledsToColorCode(leds) == colorCode
+        assert VELOCITY_QCOLORS[ledsToVelocity(leds)].name() == colorCode
+    # Pairs that are no LED colors fall back to black
+    assert (LED.FULL, None) not in LED_VELOCITY
+    assert ledsToColorCode((LED.FULL, None)) == "#000000"  # type: ignore[arg-type]
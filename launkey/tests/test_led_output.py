@@ -0,0 +1,51 @@
+from launkey.launchpad_control import LaunchpadWrapper, RAPID_UPDATE_COST
+from launkey.launchpad_table import LaunchpadTable
+from launkey.led_frame import FRAME_SIZE, LedFrame
+from launkey.templates import LED
+
+
+class RecordingMidi:
+    def __init__(self):
+        self.messages = []
+
+    def RawWrite(self, status, data1, data2):
+        self.messages.append((status, data1, data2))
+
+
+class RecordingLaunchpad:
+    def __init__(self):
+        self.midi = RecordingMidi()
+        self.rapidWrites = 0
+
+    def LedCtrlRawRapid(self, allLeds):
+        self.rapidWrites += 1
+
+    def LedCtrlRawRapidHome(self):
+        pass
+
+
+def makeWrapper():
+    wrapper = LaunchpadWrapper(LaunchpadTable())
+    wrapper.lp = RecordingLaunchpad()
+    return wrapper
+
+
+def test_single_change_uses_one_message(qapp):
+    wrapper = makeWrapper()
+    frame = LedFrame()
+    frame.setLeds(9, (LED.FULL, LED.OFF))
+    wrapper.changeLeds(frame)
+    assert wrapper.lp.midi.messages == [(144, 0x11, 0x03)]
+    assert wrapper.lp.rapidWrites == 0
+
+    wrapper.changeLeds(frame)  # Nothing changed, nothing sent
+    assert len(wrapper.lp.midi.messages) == 1
+
+
+def test_large_change_uses_rapid_update(qapp):
+    wrapper = makeWrapper()
+    frame = LedFrame(bytes([0x30] * RAPID_UPDATE_COST + [0] * (FRAME_SIZE - RAPID_UPDATE_COST)))
+    assert wrapper.writeLeds(frame) == RAPID_UPDATE_COST
+    assert wrapper.lp.rapidWrites == 1
+    assert wrapper.lp.midi.messages == []
+    assert wrapper.sentFrame == frame
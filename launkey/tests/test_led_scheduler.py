@@ -0,0 +1,62 @@
+import asyncio
+
+from launkey.led_frame import LedFrame
+from launkey.led_scheduler import LedRefreshRate, LedScheduler
+
+
+class RecordingWriter:
+    def __init__(self):
+        self.sentFrame = LedFrame()
+        self.frames = []
+        self.messages = []
+
+    def writeLeds(self, frame):
+        changed = len(frame.changedSlots(self.sentFrame))
+        if changed:
+            self.frames.append(bytes(frame.buffer))
+            self.sentFrame.copyFrom(frame)
+        return changed
+
+    def writeLed(self, message, slot):
+        if self.sentFrame[slot] == message[2]:
+            return
+        self.messages.append(message)
+        self.sentFrame[slot] = message[2]
+
+
+def test_refresh_rate_names():
+    assert LedRefreshRate.hz125.hz == 125
+
+
+def test_press_is_sent_at_once_and_release_is_coalesced():
+    async def scenario():
+        writer = RecordingWriter()
+        scheduler = LedScheduler(writer, refreshRate=LedRefreshRate.hz60)
+        task = asyncio.create_task(scheduler.run())
+        scheduler.pressFeedback(5, (144, 5, 0x30))
+        assert writer.messages == [(144, 5, 0x30)]
+        scheduler.setLed(5, 0)  # release ...
+        scheduler.pressFeedback(5, (144, 5, 0x30))  # ... and press again inside one tick
+        await asyncio.sleep(0.05)
+        task.cancel()
+        return writer
+
+    writer = asyncio.run(scenario())
+    assert writer.frames == []  # The release never reached the device
+    assert writer.messages == [(144, 5, 0x30)]
+
+
+def test_changes_inside_a_tick_are_sent_as_one_frame():
+    async def scenario():
+        writer = RecordingWriter()
+        scheduler = LedScheduler(writer, refreshRate=LedRefreshRate.hz60, fastPress=False)
+        task = asyncio.create_task(scheduler.run())
+        for slot in range(8):
+            scheduler.pressFeedback(slot, (144, slot, 0x30))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        return writer
+
+    writer = asyncio.run(scenario())
+    assert writer.messages == []
+    assert writer.frames == [bytes([0x30] * 8 + [0] * 72)]
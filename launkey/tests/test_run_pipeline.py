@@ -0,0 +1,81 @@
+import asyncio
+import threading
+
+from launkey.key_output import KeyInjectionWorker
+from launkey.latency import RunLatency
+from launkey.run_pipeline import RunPipeline
+
+
+class FakeLaunchpad:
+    def __init__(self, states):
+        self.states = list(states)
+        self.lock = threading.Lock()
+
+    def ButtonChanged(self):
+        with self.lock:
+            return bool(self.states)
+
+    def ButtonStateXY(self):
+        with self.lock:
+            return self.states.pop(0)
+
+
+class SlowBackend:
+    name = "slow"
+
+    def __init__(self):
+        self.sent = []
+        self.gate = threading.Event()
+
+    def sendBatch(self, keyActions):
+        self.gate.wait(1)
+        self.sent.extend(keyActions)
+
+    def close(self):
+        pass
+
+
+class FakeScheduler:
+    async def run(self):
+        await asyncio.Event().wait()
+
+
+class FakeWrapper:
+    def __init__(self, lp, keyOutput):
+        self.lp = lp
+        self.keyOutput = keyOutput
+        self.ledScheduler = FakeScheduler()
+        self.latency = RunLatency()
+
+    def mapButtonEvents(self, events):
+        return [(event.pressed, ((event.x,),)) for event in events]
+
+
+def test_pipeline_applies_backpressure_without_dropping_events():
+    presses = [[x, 1, True] for x in range(8)]
+    backend = SlowBackend()
+
+    async def run():
+        latency = RunLatency()
+        worker = KeyInjectionWorker(backend, maxBatches=1, latency=latency)
+        worker.start()
+        wrapper = FakeWrapper(FakeLaunchpad(presses), worker)
+        wrapper.latency = latency
+        pipeline = RunPipeline(wrapper, queueSize=1)
+        pipeline.start()
+        try:
+            while len(backend.sent) < len(presses):
+                if pipeline.getStats().keyBackpressure:
+                    backend.gate.set()  # Let the keyboard stage catch up
+                await asyncio.sleep(0.001)
+        finally:
+            pipeline.stop()
+        worker.stop()
+        return pipeline.getStats(), latency
+
+    stats, latency = asyncio.run(asyncio.wait_for(run(), 5))
+    assert backend.sent == [(True, ((x,),)) for x in range(8)]
+    assert stats.keyBackpressure > 0
+    assert stats.mappingQueueDepth == 0
+    assert latency["input"].count == len(presses)
+    assert latency["total"].count == latency["keyboard"].count == stats.mappingBatches
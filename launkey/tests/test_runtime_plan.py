@@ -0,0 +1,28 @@
+from launkey.runtime_plan import PAD_SLOTS, XY_TO_SLOT, compileRuntimePlan, padSlot, slotMessage
+from launkey.templates import Button, LED
+
+
+def test_slots_follow_rapid_update_order():
+    assert padSlot(0, 1) == 0
+    assert padSlot(7, 8) == 63
+    assert padSlot(8, 1) == 64
+    assert padSlot(0, 0) == 72
+    assert padSlot(8, 0) == -1
+    assert sorted(slot for slot in XY_TO_SLOT if slot >= 0) == list(range(PAD_SLOTS))
+
+
+def test_slot_messages_match_launchpad_notes():
+    assert slotMessage(padSlot(3, 2)) == (144, 0x13)
+    assert slotMessage(padSlot(8, 3)) == (144, 0x28)
+    assert slotMessage(padSlot(5, 0)) == (176, 109)
+
+
+def test_compiled_plan_resolves_led_bytes():
+    button = Button("A", "0", (0, 0), normalColor=(LED.FULL, LED.OFF), pushedColor=(LED.LOW, LED.MEDIUM), keyboardCombo="a")
+    plan = compileRuntimePlan({(2, 3): button})
+    action = plan.actionAt(3, 2)
+    assert action is not None and action.item is button
+    assert action.normalMessage == (144, 0x13, 0x03)
+    assert action.pushedMessage == (144, 0x13, 0x21)
+    assert plan.actionAt(0, 1) is None
+    assert plan.normalVelocities[action.slot] == 0x03
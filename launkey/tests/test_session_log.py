@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from launkey.key_output import CapturingKeyOutput
+from launkey.launchpad_control import LaunchpadWrapper
+from launkey.launchpad_table import LaunchpadTable
+from launkey.led_scheduler import LedRefreshRate
+from launkey.run_pipeline import RunPipeline
+from launkey.session_log import MIDI_PAYLOAD, RECORD_HEAD, SESSION_HEADER, SessionRecorder, SessionRecordKind, diffSessions, readSessionFile, readSessionLog
+from launkey.session_replay import replaySession, waitUntilIdle
+from launkey.templates import LED, Button, Template
+from launkey.virtual_launchpad import VirtualLaunchpad, randomButtons
+
+
+def test_log_round_trip():
+    recorder = SessionRecorder()
+    recorder.recordMidi(SessionRecordKind.buttonIn, [144, 0x13, 127, 0])
+    recorder.recordMidi(SessionRecordKind.ledOut, (144, 0x13, 0x30))
+    recorder.recordKeys([(True, ((29, 46),)), (False, "ctrl+c")])
+    records = readSessionLog(recorder.getvalue())
+    assert [(record.kind, record.data) for record in records] == [
+        (SessionRecordKind.buttonIn, (144, 0x13, 127)),
+        (SessionRecordKind.ledOut, (144, 0x13, 0x30)),
+        (SessionRecordKind.keyPress, "29+46"),
+        (SessionRecordKind.keyRelease, "ctrl+c"),
+    ]
+    assert records[0].time <= records[1].time <= records[2].time
+
+
+def test_log_keeps_the_layout():
+    layoutJson = {"version": 2, "templates": [], "runtime": []}
+    recorder = SessionRecorder(layout=layoutJson)
+    recorder.recordMidi(SessionRecordKind.ledOut, (144, 0x13, 0x30))
+    sessionLog = readSessionFile(recorder.getvalue())
+    assert sessionLog.layout == layoutJson and [record.data for record in sessionLog.records] == [(144, 0x13, 0x30)]
+
+
+def test_version_1_logs_have_no_layout():
+    data = SESSION_HEADER.pack(b"LKSL", 1, 0) + RECORD_HEAD.pack(SessionRecordKind.ledOut, 5) + MIDI_PAYLOAD.pack(144, 0x13, 0x30)
+    sessionLog = readSessionFile(data)
+    assert sessionLog.layout is None and [record.data for record in sessionLog.records] == [(144, 0x13, 0x30)]
+    with pytest.raises(ValueError, match="no layout"):
+        asyncio.run(replaySession(sessionLog))
+
+
+def makeTable():
+    table = LaunchpadTable()
+    template = [Template("Pads", Template.Type.BUTTONS)] + [
+        Button(f"B{x}", str(x), (0, x), normalColor=(LED.LOW, LED.OFF), pushedColor=(LED.OFF, LED.FULL), keyboardCombo=chr(ord("a") + x))
+        for x in range(4)
+    ]
+    table.loadDataFromTemplate((1, 0), template)
+    return table
+
+
+def test_replay_matches_recording(qapp, tmp_path, monkeypatch):
+    monkeypatch.setattr("launkey.launchpad_control.loadLedRefreshRate", lambda: LedRefreshRate.hz200)
+    table = makeTable()
+    lp = VirtualLaunchpad()
+    lpWrapper = LaunchpadWrapper(table, device=lp)
+    lpWrapper.sessionLogPath = tmp_path / "session.lksl"
+
+    async def record():
+        lpWrapper.keyOutputBackend = CapturingKeyOutput()
+        lpWrapper.start()
+        pipeline = RunPipeline(lpWrapper)
+        pipeline.start()
+        lp.feedButtons(randomButtons(30, seed=3, positions=[(x, 1) for x in range(4)]), rate=2000)
+        await waitUntilIdle(lpWrapper, pipeline)
+        pipeline.stop()
+        lpWrapper.stop()
+
+    asyncio.run(asyncio.wait_for(record(), 5))
+    sessionLog = readSessionFile(tmp_path / "session.lksl")
+    recorded = sessionLog.records
+    kinds = {record.kind for record in recorded}
+    assert kinds == set(SessionRecordKind)
+
+    # The layout comes from the log, whatever the table holds now is left alone
+    table.resetTemplates()
+    for realTime in (False, True):
+        replayed = asyncio.run(asyncio.wait_for(replaySession(sessionLog, realTime=realTime), 5))
+        assert diffSessions(recorded, replayed) == []
+    assert table.loadedTemplates == {}
+
+    # A missing release, like a stuck key, shows up in the diff
+    lastRelease = max(index for index, record in enumerate(replayed) if record.kind == SessionRecordKind.keyRelease)
+    stuckKey = replayed[:lastRelease] + replayed[lastRelease + 1:]
+    assert diffSessions(recorded, stuckKey)[0].startswith("key count differs")
@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+from launkey import startup_profile
+from launkey.startup_profile import FIRST_PAINT_MARKER, measureStartup, parseImportTimes
+
+# About 300 ms on a desktop, the budget leaves room for slower machines
+STARTUP_BUDGET_MS = float(os.environ.get("LAUNKEY_STARTUP_BUDGET_MS", 1000))
+DEFERRED_MODULES = ("requests", "regex", "keyboard", "launchpad_py", "pygame", "launkey.ui_dialogtemplates", "launkey.ui_settings")
+
+
+def test_cold_start_to_first_paint_within_budget():
+    profile = measureStartup()
+    assert profile.firstPaint < STARTUP_BUDGET_MS, f"first paint after {profile.firstPaint:.0f} ms, budget {STARTUP_BUDGET_MS:.0f} ms"
+    assert not profile.modules.intersection(DEFERRED_MODULES)
+
+
+def test_parse_import_times():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   _io\n"
+        "import time:      2500 |       3100 | launkey.layouts\n"
+    )
+    imports = parseImportTimes(stderr)
+    assert [(module.name, module.selfTime, module.cumulative) for module in imports] == [("_io", 120, 120), ("launkey.layouts", 2500, 3100)]
+
+
+def test_probe_stderr_does_not_block_the_child(monkeypatch):
+    # Several times a pipe buffer on stderr before the marker
+    script = f"import sys; sys.stderr.write('import time: 1 | 1 | x\\n' * 50000); print({FIRST_PAINT_MARKER!r}, flush=True)"
+    monkeypatch.setattr(startup_profile, "PROBE_ARGS", ["-c", script])
+    monkeypatch.setattr(startup_profile, "PROBE_TIMEOUT", 10.0)
+    profile = measureStartup()
+    assert len(profile.imports) == 50000
+
+
+def test_probe_that_never_paints_is_stopped(monkeypatch):
+    monkeypatch.setattr(startup_profile, "PROBE_ARGS", ["-c", "import time; time.sleep(30)"])
+    monkeypatch.setattr(startup_profile, "PROBE_TIMEOUT", 0.5)
+    with pytest.raises(RuntimeError, match="within"):
+        measureStartup()
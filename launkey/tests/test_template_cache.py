@@ -0,0 +1,89 @@
+import json
+import struct
+import time
+
+from PySide6.QtCore import QCoreApplication
+
+from launkey.template_cache import CACHE_VERSION, TemplateCache, packTemplate, unpackTemplate
+from launkey.template_index import hashFile
+from launkey.template_loader import TemplateLoader
+from launkey.templates import LED, Button, Template
+
+
+def sampleTemplate(name="Keys"):
+    return [
+        Template(name, Template.Type.BUTTONS),
+        Button("Left", "0", (0, 0), normalColor=(LED.LOW, LED.OFF), pushedColor=(LED.FULL, LED.FULL), keyboardCombo="ctrl+ą"),
+        Button("Right", "1", (7, 1), keyboardCombo=""),
+    ]
+
+
+def describe(templateData):
+    return [item.toDict() for item in templateData]
+
+
+def test_pack_round_trip():
+    templateData, errors = unpackTemplate(memoryview(packTemplate(sampleTemplate(), ["Keys.json: warning"])))
+    assert describe(templateData) == describe(sampleTemplate())
+    assert errors == ["Keys.json: warning"]
+
+
+def test_save_keeps_only_live_entries(tmp_path):
+    cachePath = tmp_path / "cache" / "templates.bin"
+    cache = TemplateCache(cachePath)
+    cache.open()
+    cache.put("00" * 16, sampleTemplate("A"), [])
+    cache.put("11" * 16, sampleTemplate("B"), [])
+    cache.save(["11" * 16, "22" * 16])
+
+    reopened = TemplateCache(cachePath)
+    reopened.open()
+    assert reopened.mapped is not None
+    assert reopened.get("00" * 16) is None
+    templateData, _ = reopened.get("11" * 16)
+    assert templateData[0].name == "B"
+    reopened.close()
+    cache.close()
+
+
+def test_other_format_version_is_ignored(tmp_path):
+    cachePath = tmp_path / "templates.bin"
+    cache = TemplateCache(cachePath)
+    cache.put("00" * 16, sampleTemplate(), [])
+    cache.save(["00" * 16])
+    cache.close()
+    data = bytearray(cachePath.read_bytes())
+    struct.pack_into("<H", data, 4, CACHE_VERSION + 1)
+    cachePath.write_bytes(bytes(data))
+
+    cache.open()
+    assert cache.mapped is None and cache.get("00" * 16) is None
+    cachePath.write_bytes(b"")
+    cache.open()
+    assert cache.mapped is None
+
+
+def test_loader_uses_cache_for_unchanged_files(qapp, tmp_path):
+    filePath = tmp_path / "Keys.json"
+    filePath.write_text(json.dumps(describe(sampleTemplate())))
+    sourceHash = hashFile(filePath)
+    cache = TemplateCache(tmp_path / "templates.bin")
+    loader = TemplateLoader(workers=1, cache=cache)
+
+    def load():
+        batches = []
+        loader.batchReady.connect(batches.extend)
+        loader.load(tmp_path, ["Keys.json"], {"Keys.json": sourceHash})
+        deadline = time.perf_counter() + 5
+        while loader.isLoading() and time.perf_counter() < deadline:
+            QCoreApplication.processEvents()
+            time.sleep(0.001)
+        loader.batchReady.disconnect()
+        return batches
+
+    assert describe(load()[0].templateData) == describe(sampleTemplate())
+    loader.saveCache([sourceHash])
+    filePath.write_text("not json")  # Only read when the cache misses
+    assert describe(load()[0].templateData) == describe(sampleTemplate())
+    loader.shutdown()
+    cache.close()
@@ -0,0 +1,57 @@
+import os
+
+from launkey import template_index
+from launkey.template_index import TemplateIndex
+
+
+def test_scan_reports_added_changed_removed(tmp_path):
+    (tmp_path / "A.json").write_text("[1]")
+    (tmp_path / "B.json").write_text("[2]")
+    (tmp_path / "notes.txt").write_text("not a template")
+    index = TemplateIndex()
+    assert index.scan(tmp_path) == (["A.json", "B.json"], [], [])
+    assert not index.scan(tmp_path)
+
+    (tmp_path / "A.json").write_text("[10]")
+    (tmp_path / "B.json").unlink()
+    (tmp_path / "C.json").write_text("[3]")
+    assert index.scan(tmp_path) == (["C.json"], ["A.json"], ["B.json"])
+    assert sorted(index.files) == ["A.json", "C.json"]
+
+
+def test_scan_skips_files_with_same_stat(tmp_path, monkeypatch):
+    (tmp_path / "A.json").write_text("[1]")
+    index = TemplateIndex()
+    index.scan(tmp_path)
+
+    hashed = []
+    monkeypatch.setattr(template_index, "hashFile", lambda path: hashed.append(path.name) or "")
+    assert not index.scan(tmp_path)
+    assert hashed == []
+
+
+def test_touched_file_with_same_content_is_not_changed(tmp_path):
+    filePath = tmp_path / "A.json"
+    filePath.write_text("[1]")
+    index = TemplateIndex()
+    index.scan(tmp_path)
+
+    stat = filePath.stat()
+    os.utime(filePath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert not index.scan(tmp_path)
+    assert index.files["A.json"].mtime == stat.st_mtime_ns + 10**9
+
+
+def test_scan_only_given_files(tmp_path):
+    (tmp_path / "A.json").write_text("[1]")
+    (tmp_path / "B.json").write_text("[2]")
+    index = TemplateIndex()
+    index.scan(tmp_path)
+
+    (tmp_path / "A.json").write_text("[10]")
+    (tmp_path / "B.json").write_text("[20]")
+    (tmp_path / "New.json").write_text("[3]")
+    assert index.scan(tmp_path, ["B.json", "New.json", "Gone.json"]) == (["New.json"], ["B.json"], [])
+    (tmp_path / "B.json").unlink()
+    assert index.scan(tmp_path, ["B.json"]) == ([], [], ["B.json"])
+    assert index.scan(tmp_path) == ([], ["A.json"], [])
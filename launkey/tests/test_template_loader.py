@@ -0,0 +1,96 @@
+import json
+import time
+
+from PySide6.QtCore import QCoreApplication
+
+from launkey.template_loader import TemplateLoader, parseTemplate
+from launkey.templates import LED, Button, Template
+
+
+def writeTemplate(path, name):
+    templateData = [Template(name, Template.Type.BUTTONS).toDict()]
+    templateData.append(Button("Key", "0", (0, 0), normalColor=(LED.LOW, LED.OFF), keyboardCombo="a").toDict())
+    path.write_text(json.dumps(templateData))
+
+
+def runLoader(loader, folder, fileNames, timeout=5.0):
+    batches, progress, reports = [], [], []
+    loader.batchReady.connect(batches.append)
+    loader.progress.connect(lambda done, total: progress.append((done, total)))
+    loader.finished.connect(reports.append)
+    loader.load(folder, fileNames)
+    deadline = time.perf_counter() + timeout
+    while not reports and time.perf_counter() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.001)
+    return batches, progress, reports
+
+
+def test_parse_template_collects_errors(tmp_path):
+    writeTemplate(tmp_path / "Good.json", "Good")
+    (tmp_path / "Broken.json").write_text("[{")
+    (tmp_path / "Empty.json").write_text("[]")
+
+    good = parseTemplate(tmp_path / "Good.json")
+    assert good.errors == [] and isinstance(good.templateData[0], Template)
+    for name in ("Broken.json", "Empty.json"):
+        result = parseTemplate(tmp_path / name)
+        assert result.templateData == [] and len(result.errors) == 1 and result.errors[0].startswith(name)
+
+
+def test_loader_batches_and_one_report(qapp, tmp_path):
+    names = []
+    for i in range(40):
+        writeTemplate(tmp_path / f"T{i}.json", f"T{i}")
+        names.append(f"T{i}.json")
+    for i in range(3):
+        (tmp_path / f"Bad{i}.json").write_text("not json")
+        names.append(f"Bad{i}.json")
+
+    loader = TemplateLoader(workers=4)
+    batches, progress, reports = runLoader(loader, tmp_path, names)
+    loader.shutdown()
+
+    results = [result for batch in batches for result in batch]
+    assert sorted(result.fileName for result in results) == sorted(names)
+    assert 1 < len(batches) < len(names)
+    assert sum(1 for result in results if result.templateData) == 40
+    assert progress[0] == (0, 43) and progress[-1] == (43, 43)
+    assert len(reports) == 1 and len(reports[0]) == 3
+    assert not loader.isLoading()
+
+
+def test_newer_load_wins(qapp, tmp_path):
+    writeTemplate(tmp_path / "A.json", "A")
+    loader = TemplateLoader(workers=1)
+    loader.load(tmp_path, ["A.json"])
+    batches, progress, _ = runLoader(loader, tmp_path, ["A.json"])
+    loader.shutdown()
+    assert [result.fileName for batch in batches for result in batch] == ["A.json"]
+    assert progress[-1] == (2, 2)
+
+
+def test_stored_templates_load_through_the_cache(qapp, tmp_path, monkeypatch):
+    import launkey.template_loader
+    from launkey.template_cache import TemplateCache
+    writeTemplate(tmp_path / "A.json", "A")
+    rows = [("A.json", (tmp_path / "A.json").read_bytes())]
+    cache = TemplateCache(tmp_path / "cache.bin")
+
+    for attempt in range(2):
+        loader = TemplateLoader(workers=1, cache=cache)
+        reports = []
+        loader.batchReady.connect(lambda batch: reports.append(batch))
+        loader.loadData(rows)
+        deadline = time.perf_counter() + 5.0
+        while not reports and time.perf_counter() < deadline:
+            QCoreApplication.processEvents()
+            time.sleep(0.001)
+        loader.shutdown()
+        [[result]] = reports
+        assert result.templateData[0].name == "A" and result.sourceHash == loader.sourceHashes["A.json"]
+        if attempt == 0:
+            loader.saveCache(loader.sourceHashes.values())
+            cache.open()
+            assert cache.get(result.sourceHash) is not None and not cache.added
+            monkeypatch.setattr(launkey.template_loader, "parseTemplateData", None)  # Second load must not parse
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from launkey.template_store import TemplateStore, TemplateSummary
+from launkey.templates import LED, Button, Template, writeTemplateFile
+
+
+def makeTemplate(name, locations):
+    templateData = [Template(name, Template.Type.BUTTONS)]
+    templateData += [Button(f"B{i}", str(i), location, normalColor=(LED.LOW, LED.OFF), keyboardCombo="a") for i, location in enumerate(locations)]
+    return templateData
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TemplateStore(tmp_path / "templates.sqlite3")
+    yield store
+    store.close()
+
+
+def test_save_list_search_load(store):
+    assert store.isEmpty()
+    store.saveTemplates([
+        ("Arrows.json", makeTemplate("Arrows", [(0, 1), (1, 0), (1, 1), (1, 2)])),
+        ("Pair.json", makeTemplate("Pair", [(0, 0), (0, 1)])),
+        ("Big_50%.json", makeTemplate("Big 50%", [(0, 0), (7, 7)])),
+    ])
+    assert store.connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert store.listTemplates()[0] == TemplateSummary("Arrows.json", "Arrows", "BUTTONS", 2, 3, 4)
+    assert [summary.name for summary in store.searchTemplates(maxRows=2, maxCols=3)] == ["Arrows", "Pair"]
+    assert [summary.name for summary in store.searchTemplates("50%")] == ["Big 50%"]
+    assert [summary.name for summary in store.searchTemplates("a", templateType="BUTTONS", maxCols=2)] == ["Pair"]
+
+    (pair,) = store.loadTemplates(["Pair.json"])
+    assert pair.errors == [] and [item.toDict() for item in pair.templateData] == [item.toDict() for item in makeTemplate("Pair", [(0, 0), (0, 1)])]
+    assert store.hasTemplate("Pair.json") and store.deleteTemplate("Pair.json") and not store.hasTemplate("Pair.json")
+    assert len(store.loadTemplates()) == 2
+
+
+def test_failed_bulk_save_changes_nothing(store):
+    store.saveTemplate("Pair.json", makeTemplate("Pair", [(0, 0), (0, 1)]))
+    with pytest.raises(ValueError):
+        store.saveTemplates([("Pair.json", makeTemplate("Changed", [])), ("Broken.json", [])])
+    assert [summary.name for summary in store.listTemplates()] == ["Pair"]
+
+
+def test_folder_import_and_export(store, tmp_path):
+    folder = tmp_path / "json"
+    folder.mkdir()
+    writeTemplateFile(folder / "Pair.json", [item.toDict() for item in makeTemplate("Pair", [(0, 0), (0, 1)])])
+    (folder / "Broken.json").write_text("{")
+    count, errors = store.importFolder(folder)
+    assert count == 1 and len(errors) == 1 and errors[0].startswith("Broken.json")
+
+    exported = tmp_path / "exported"
+    assert store.exportFolder(exported) == 1
+    assert json.loads((exported / "Pair.json").read_text()) == json.loads((folder / "Pair.json").read_text())
+
+
+def test_template_file_write_is_atomic(tmp_path):
+    filePath = tmp_path / "Pair.json"
+    writeTemplateFile(filePath, [{"name": "old"}])
+    with pytest.raises(TypeError):
+        writeTemplateFile(filePath, [{"name": object()}])  # Fails halfway through json.dump
+    assert json.loads(filePath.read_text()) == [{"name": "old"}]
+    assert [path.name for path in tmp_path.iterdir()] == ["Pair.json"]
@@ -0,0 +1,40 @@
+import time
+
+from PySide6.QtCore import QCoreApplication
+
+from launkey.template_watcher import TemplateFolderWatcher
+
+
+def waitForChanges(watcher, timeout=2.0):
+    received = []
+    watcher.changed.connect(received.append)
+    deadline = time.perf_counter() + timeout
+    while not received and time.perf_counter() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.005)
+    watcher.changed.disconnect()
+    return received
+
+
+def test_burst_of_changes_is_reported_once(qapp, tmp_path):
+    (tmp_path / "Old.json").write_text("[]")
+    (tmp_path / "Gone.json").write_text("[]")
+    watcher = TemplateFolderWatcher(tmp_path, interval=50)
+
+    for i in range(5):
+        (tmp_path / f"New{i}.json").write_text("[]")
+    (tmp_path / "Old.json").write_text("[1]")
+    (tmp_path / "Gone.json").unlink()
+    (tmp_path / "notes.txt").write_text("")
+    assert waitForChanges(watcher) == [["Gone.json", "New0.json", "New1.json", "New2.json", "New3.json", "New4.json", "Old.json"]]
+
+
+def test_replaced_file_is_watched_again(qapp, tmp_path):
+    (tmp_path / "A.json").write_text("[]")
+    watcher = TemplateFolderWatcher(tmp_path, interval=20)
+
+    (tmp_path / "A.json.tmp").write_text("[1]")
+    (tmp_path / "A.json.tmp").replace(tmp_path / "A.json")
+    assert waitForChanges(watcher) == [["A.json"]]
+    (tmp_path / "A.json").write_text("[2]")
+    assert waitForChanges(watcher) == [["A.json"]]
@@ -0,0 +1,79 @@
+import asyncio
+
+from launkey.key_output import KeyOutput
+from launkey.launchpad_control import LaunchpadWrapper
+from launkey.launchpad_table import LaunchpadTable
+from launkey.run_pipeline import RunPipeline
+from launkey.runtime_plan import padSlot
+from launkey.templates import LED, Button, Template
+from launkey.virtual_launchpad import VirtualLaunchpad, randomButtons, scriptedButtons
+
+
+def test_buttons_decode_like_hardware():
+    lp = VirtualLaunchpad(scriptedButtons([(3, 2), (5, 0), (8, 4)]))
+    states = []
+    while lp.ButtonChanged():
+        states.append(lp.ButtonStateXY())
+    assert states == [
+        [3, 2, True], [3, 2, False], [5, 0, True], [5, 0, False], [8, 4, True], [8, 4, False],
+    ]
+
+
+def test_led_messages_update_virtual_pads():
+    lp = VirtualLaunchpad()
+    lp.LedCtrlRawRapid(bytes(range(1, 81)))
+    lp.LedCtrlRawRapidHome()
+    assert lp.midi.leds[0] == 1 and lp.midi.leds[padSlot(7, 0)] == 80
+    lp.midi.RawWrite(144, 0x13, 0x30)
+    assert lp.midi.leds[padSlot(3, 2)] == 0x30
+    lp.Reset()
+    assert not any(lp.midi.leds.buffer)
+    assert len(lp.ledMessages) == 40 + 3
+
+
+def test_random_buttons_release_every_press():
+    buttons = list(randomButtons(200, seed=1))
+    assert sum(pressed for _, _, pressed in buttons) == 200
+    held = set()
+    for x, y, pressed in buttons:
+        if pressed:
+            assert (x, y) not in held
+            held.add((x, y))
+        else:
+            held.remove((x, y))
+    assert not held
+
+
+def test_run_path_without_hardware(qapp, monkeypatch):
+    monkeypatch.setattr("launkey.launchpad_control.loadKeyOutput", lambda: KeyOutput.keyboard)
+    sent = []
+    monkeypatch.setattr("launkey.key_output.sendKeyActions", sent.extend)
+
+    table = LaunchpadTable()
+    button = Button("A", "0", (0, 0), normalColor=(LED.FULL, LED.OFF), pushedColor=(LED.OFF, LED.FULL), keyboardCombo="a")
+    table.loadDataFromTemplate((2, 3), [Template("Pad", Template.Type.BUTTONS), button])
+    lp = VirtualLaunchpad()
+    wrapper = LaunchpadWrapper(table, device=lp)
+
+    async def run():
+        wrapper.start()
+        pipeline = RunPipeline(wrapper)
+        pipeline.start()
+        lp.feedButtons(scriptedButtons([(3, 2)] * 50 + [(0, 1)]), rate=20000)
+        while len(sent) < 100:
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0.05)  # Let the LED scheduler send the last release
+        leds = lp.midi.leds.copy()
+        pipeline.stop()
+        batches = wrapper.keyOutput.getStats().batches
+        wrapper.stop()
+        return batches, leds
+
+    batches, leds = asyncio.run(asyncio.wait_for(run(), 5))
+
+    assert [press for press, _ in sent] == [True, False] * 50
+    # Press feedback is sent at once, releases are coalesced by the LED scheduler
+    assert (144, 0x13, 0x30) in lp.ledMessages
+    assert leds[padSlot(3, 2)] == 0x03
+    assert wrapper.latency["input"].count == 102
+    assert wrapper.latency["total"].count == batches